@@ -0,0 +1 @@
+# Benchmark suite (runs against recorded fixtures)
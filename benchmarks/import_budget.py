@@ -0,0 +1,114 @@
+"""Import-time budget for the dashboard's first paint.
+
+Imports the dashboard's top-level modules in a fresh interpreter (python -X importtime),
+fails if the total exceeds the budget or if a heavy library that only individual plans
+need was pulled in, and reports each plan's incremental import cost:
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 1500
+"""
+import os
+import re
+import ast
+import sys
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_PATH = os.path.join(ROOT_DIR, "market_signals_dashboard.py")
+STARTUP_BUDGET_MS = 1500
+# Libraries only some plans (or no page at all) need; none may load before a plan is chosen
+DEFERRED_MODULES = ("yfinance", "fredapi", "altair")
+REPEATS = 3  # Best-of, to damp disk-cache and scheduler noise
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def startup_imports(path=DASHBOARD_PATH):
+    """Modules the dashboard imports at module level, in order."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules += [f"{node.module}.{alias.name}" for alias in node.names if node.module != "__future__"]
+    return modules
+
+
+def import_code(modules):
+    # `from a import b` targets may be attributes rather than submodules; fall back to the parent
+    return "\n".join(
+        f"try:\n    __import__({m!r})\nexcept ImportError:\n    __import__({m.rsplit('.', 1)[0]!r})" for m in modules
+    )
+
+
+def profile(code, repeats=REPEATS):
+    """(ms, {top-level module: cumulative ms}, modules imported) for `code` in fresh processes, best of `repeats`.
+
+    Interpreter startup imports (site, encodings, ...) are excluded.
+    """
+    baseline = _profile_once("pass")[1]
+    best = min((_profile_once(code) for _ in range(repeats)), key=lambda run: run[0])
+    top = {name: ms for name, ms in best[1].items() if name not in baseline}
+    return sum(top.values()), top, best[2]
+
+
+def _profile_once(code):
+    probe = code + "\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    top = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and not match.group(3).strip(" ") and len(match.group(3)) == 1:
+            top[match.group(4)] = int(match.group(2)) / 1000
+    return sum(top.values()), top, set(result.stdout.split())
+
+
+def plan_costs(startup_code):
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    import strategies
+
+    base, _, _ = profile(startup_code)
+    for label, entry_point in strategies.PLANS.items():
+        module = entry_point.partition(":")[0]
+        total, _, loaded = profile(startup_code + f"\nimport {module}")
+        yield label, max(total - base, 0.0), [m for m in DEFERRED_MODULES if m in loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    parser.add_argument("--skip-plans", action="store_true", help="Don't measure per-plan import cost")
+    args = parser.parse_args()
+
+    code = import_code(startup_imports())
+    total, top, loaded = profile(code)
+    print(f"Dashboard startup imports: {total:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, ms in sorted(top.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    failures = []
+    if total > args.budget_ms:
+        failures.append(f"startup imports take {total:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    eager = [m for m in DEFERRED_MODULES if m in loaded]
+    if eager:
+        failures.append(f"deferred libraries imported at startup: {', '.join(eager)}")
+
+    if not args.skip_plans:
+        print("\nIncremental import cost per plan:")
+        for label, ms, heavy in plan_costs(code):
+            print(f"  {ms:8.1f} ms  {label}" + (f"  ({', '.join(heavy)})" if heavy else ""))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
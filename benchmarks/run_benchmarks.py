@@ -0,0 +1,169 @@
+"""End-to-end latency benchmarks for the monitors, every plan page and the full dashboard.
+
+Record fixtures once (needs network and FRED_API_KEY), then benchmark offline:
+
+    python -m benchmarks.run_benchmarks --record
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<earlier>.json
+
+Recordings land in fixtures/ (or MARKET_DATA_FIXTURES) and are gitignored: they are raw vendor data,
+so each machine records its own, and results are only comparable against runs on the same recording.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import datetime
+import subprocess
+import tracemalloc
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+DASHBOARD_PATH = os.path.join(ROOT_DIR, "market_signals_dashboard.py")
+RENDER_SCRIPT = """
+import strategies
+from market_data import snapshot
+strategies.render({label!r}, snapshot.load())
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="Capture live responses into the fixtures directory")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per replayed upstream call")
+    parser.add_argument("--compare", help="Earlier results JSON to diff against")
+    return parser.parse_args()
+
+
+args = parse_args()
+
+# The data layer reads these at import time, so they are set before any project import
+os.environ["MARKET_DATA_MODE"] = "record" if args.record else "replay"
+os.environ["MARKET_DATA_LATENCY"] = str(args.latency)
+os.environ.setdefault("MARKET_DATA_DIR", tempfile.mkdtemp(prefix="market_bench_"))
+# Dashboards read the snapshot main() publishes instead of starting a background refresher, whose
+# fetches would otherwise land inside the timed window and the upstream call counts
+os.environ["MARKET_SNAPSHOT_WORKER"] = "1"
+
+from market_data import cache, metrics, providers, snapshot  # noqa: E402
+from market_data.providers import FIXTURES_DIR  # noqa: E402
+
+
+# --- Measurement ---
+def measure(name, fn, iterations, reset=None):
+    provider = providers.get_provider()
+    timings, calls = [], []
+    for _ in range(iterations):
+        if reset:
+            reset()
+        before = sum(provider.calls.values())
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+        calls.append(sum(provider.calls.values()) - before)
+
+    # Memory is sampled in a separate run so tracing overhead doesn't skew the timings
+    if reset:
+        reset()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings_ms = np.array(timings) * 1000
+    result = {
+        "p50_ms": float(np.percentile(timings_ms, 50)),
+        "p95_ms": float(np.percentile(timings_ms, 95)),
+        "peak_memory_kb": peak / 1024,
+        "upstream_calls": float(np.mean(calls)),
+        "iterations": iterations,
+    }
+    print(f"{name:<48} p50 {result['p50_ms']:9.2f} ms  p95 {result['p95_ms']:9.2f} ms  "
+          f"peak {result['peak_memory_kb']:9.0f} KB  calls {result['upstream_calls']:.1f}")
+    return result
+
+
+def run_app(script=None, path=None, select=None):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_string(script, default_timeout=120) if script else AppTest.from_file(path, default_timeout=120)
+    at.secrets["FRED_API_KEY"] = os.getenv("FRED_API_KEY", "replay")
+    at.run()
+    if select is not None:
+        at.selectbox[0].set_value(select).run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def scenarios():
+    import market_signal_monitor
+    import reentry_monitor
+    import strategies
+
+    cold = cache.clear  # Monitors run once per process, so each iteration starts without the in-memory cache
+    yield "monitor.evaluate_conditions", market_signal_monitor.evaluate_conditions, cold
+    yield "reentry_monitor.evaluate_reentry_conditions", reentry_monitor.evaluate_reentry_conditions, cold
+    yield "snapshot.build_snapshot", snapshot.build_snapshot, cold
+
+    for label, entry_point in strategies.PLANS.items():
+        module = entry_point.partition(":")[0].rsplit(".", 1)[-1]
+        yield f"render.{module}", lambda label=label: run_app(RENDER_SCRIPT.format(label=label)), None
+
+    for label in strategies.PLANS:
+        yield f"dashboard[{label}]", lambda label=label: run_app(path=DASHBOARD_PATH, select=label), None
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current, previous_path):
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = json.load(f)
+    print(f"\nChange vs {previous['commit']} ({previous['timestamp']}):")
+    for name, result in current["scenarios"].items():
+        before = previous["scenarios"].get(name)
+        if before:
+            change = (result["p50_ms"] / before["p50_ms"] - 1) * 100 if before["p50_ms"] else float("nan")
+            print(f"{name:<48} p50 {before['p50_ms']:9.2f} → {result['p50_ms']:9.2f} ms ({change:+.1f}%)  "
+                  f"calls {before['upstream_calls']:.1f} → {result['upstream_calls']:.1f}")
+
+
+def main():
+    if not args.record and not os.path.isdir(os.path.join(FIXTURES_DIR, "yahoo")):
+        sys.exit(f"No fixtures in {FIXTURES_DIR}; run with --record first.")
+
+    metrics.configure_fred()
+    snapshot.publish(snapshot.build_snapshot())  # Pages render from the published snapshot
+
+    iterations = 1 if args.record else args.iterations
+    results = {name: measure(name, fn, iterations, reset) for name, fn, reset in scenarios()}
+    if args.record:
+        print(f"\nFixtures recorded to {FIXTURES_DIR}")
+        return
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "latency_s": args.latency,
+        "scenarios": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{report['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
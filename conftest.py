@@ -0,0 +1,5 @@
+# Marks the repository root for pytest, so tests import market_data, signals and portfolio as top-level packages
+
+# Streamlit pages and archived copies, not tests (test_fred_api_key.py only matches pytest's file pattern)
+collect_ignore = ["test_fred_api_key.py"]
+collect_ignore_glob = ["archived/*", "legacy/*", "new-monitor-debt-crisis/*", "market_signals_repo_final/*"]
@@ -0,0 +1 @@
+# Shared market data layer
@@ -0,0 +1,115 @@
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+# --- Cache Policy ---
+# Seconds a cached result stays fresh, per upstream source
+SOURCE_TTLS = {
+    "prices": 15 * 60,
+    "fred": 6 * 60 * 60,
+}
+MAX_ENTRIES = 256
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a per-entry TTL."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> (lock, threads holding or waiting on it)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @contextmanager
+    def key_lock(self, key):
+        """Hold `key`'s fetch lock; it is dropped once no thread holds or waits on it, so the table stays small."""
+        with self._lock:
+            lock, users = self._key_locks.get(key, (None, 0))
+            lock = lock or threading.Lock()
+            self._key_locks[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                lock, users = self._key_locks[key]
+                if users == 1:
+                    del self._key_locks[key]
+                else:
+                    self._key_locks[key] = (lock, users - 1)
+
+    def clear(self, source=None):
+        with self._lock:
+            if source is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == source]:
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Module-level, so every Streamlit session in the server process shares it
+_cache = TTLCache()
+
+
+class Uncached:
+    """Wraps a fallback result (e.g. stale local data after a failed refresh) that `cached` returns but never stores."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+def cached(source, ttl=None):
+    """Memoize a fetch function process-wide under `source`'s TTL.
+
+    Exceptions and Uncached results are passed through without being stored, so the next call retries.
+    """
+    ttl = ttl if ttl is not None else SOURCE_TTLS[source]
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (source, fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())))
+            hit, value = _cache.get(key)
+            if hit:
+                return value
+            # Concurrent sessions asking for the same key wait for one fetch instead of repeating it
+            with _cache.key_lock(key):
+                hit, value = _cache.get(key)
+                if not hit:
+                    value = fn(*args, **kwargs)
+                    if isinstance(value, Uncached):
+                        return value.value
+                    _cache.set(key, value, ttl)
+            return value
+        return wrapper
+    return decorator
+
+
+def clear(source=None):
+    _cache.clear(source)
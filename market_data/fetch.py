@@ -0,0 +1,41 @@
+import asyncio
+from dataclasses import dataclass, field
+
+REQUEST_TIMEOUT = 30  # Seconds per upstream request
+MAX_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    name: str
+    fn: object
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+
+
+class FetchError(Exception):
+    pass
+
+
+async def _run(request, semaphore, timeout):
+    async with semaphore:
+        try:
+            # Blocking clients (yfinance, fredapi) run on worker threads; a timed-out thread is abandoned, not killed
+            return await asyncio.wait_for(
+                asyncio.to_thread(request.fn, *request.args, **request.kwargs), timeout
+            )
+        except asyncio.TimeoutError:
+            return FetchError(f"{request.name} timed out after {timeout}s")
+        except Exception as e:
+            return FetchError(f"{request.name} failed: {e}")
+
+
+async def gather_requests(requests, timeout=REQUEST_TIMEOUT, max_concurrency=MAX_CONCURRENCY):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results = await asyncio.gather(*(_run(request, semaphore, timeout) for request in requests))
+    return {request.name: result for request, result in zip(requests, results)}
+
+
+def fetch_all(requests, timeout=REQUEST_TIMEOUT, max_concurrency=MAX_CONCURRENCY):
+    """Run every request concurrently; failed or timed-out ones map to a FetchError instead of raising."""
+    return asyncio.run(gather_requests(list(requests), timeout, max_concurrency))
@@ -0,0 +1,151 @@
+import datetime
+from contextlib import closing
+
+import pandas as pd
+
+from market_data.store import DB_PATH, connect, init_db
+
+# --- Series Calendar ---
+# Native frequency of each series the dashboards use: d(aily), w(eekly), m(onthly), q(uarterly)
+SERIES_FREQUENCY = {
+    "CPIAUCSL": "m",
+    "BAMLH0A0HYM2": "d",
+    "GDP": "q",
+    "USSLIND": "m",
+    # Constant-maturity Treasury yields (market_data.treasury)
+    "DGS1MO": "d", "DGS3MO": "d", "DGS6MO": "d", "DGS1": "d", "DGS2": "d", "DGS3": "d",
+    "DGS5": "d", "DGS7": "d", "DGS10": "d", "DGS20": "d", "DGS30": "d",
+}
+
+# Observation length and typical publication lag after the observation period ends
+PERIOD_LENGTH = {
+    "d": pd.DateOffset(days=1),
+    "w": pd.DateOffset(weeks=1),
+    "m": pd.DateOffset(months=1),
+    "q": pd.DateOffset(months=3),
+}
+RELEASE_LAG_DAYS = {"d": 1, "w": 3, "m": 10, "q": 25}
+
+# Once a release is overdue, don't ask FRED again more often than this
+RECHECK_INTERVAL = datetime.timedelta(hours=6)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fred_observations (
+    series_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (series_id, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fred_series (
+    series_id TEXT PRIMARY KEY,
+    frequency TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    last_value REAL NOT NULL,
+    checked_at TEXT NOT NULL
+);
+"""
+
+
+def next_release(last_date, frequency):
+    """Earliest date a new observation after `last_date` is expected to be published."""
+    period_end = pd.Timestamp(last_date) + PERIOD_LENGTH[frequency]
+    return (period_end + pd.Timedelta(days=RELEASE_LAG_DAYS[frequency])).date()
+
+
+class FredCache:
+    """Local copy of FRED series that only requests observations newer than the cached tail."""
+
+    def __init__(self, fred=None, path=DB_PATH):
+        self.fred = fred
+        self.path = path
+        init_db(path, SCHEMA)
+
+    def _connect(self):
+        return connect(self.path)
+
+    def _meta(self, series_id):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT frequency, last_date, last_value, checked_at FROM fred_series WHERE series_id = ?",
+                (series_id,),
+            ).fetchone()
+
+    # --- Release Calendar ---
+    def is_due(self, series_id, frequency=None, now=None):
+        now = now or datetime.datetime.now()
+        meta = self._meta(series_id)
+        if meta is None:
+            return True
+        stored_frequency, last_date, _, checked_at = meta
+        frequency = frequency or stored_frequency
+        if now.date() < next_release(last_date, frequency):
+            return False
+        return now - datetime.datetime.fromisoformat(checked_at) >= RECHECK_INTERVAL
+
+    # --- Sync ---
+    def refresh(self, series_id, frequency=None, force=False):
+        frequency = frequency or SERIES_FREQUENCY.get(series_id, "m")
+        if not force and not self.is_due(series_id, frequency):
+            return False
+        if self.fred is None:
+            return False
+
+        meta = self._meta(series_id)
+        # Re-request the cached tail itself so a revised last observation is picked up
+        start = meta[1] if meta else None
+        data = self.fred.get_series(series_id, observation_start=start).dropna()
+
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        rows = [(series_id, pd.Timestamp(d).date().isoformat(), float(v)) for d, v in data.items()]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO fred_observations VALUES (?, ?, ?)", rows)
+            if rows:
+                last_date, last_value = max(rows)[1:]
+                if meta is None or last_date >= meta[1]:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO fred_series VALUES (?, ?, ?, ?, ?)",
+                        (series_id, frequency, last_date, last_value, now),
+                    )
+            if meta is not None:
+                conn.execute("UPDATE fred_series SET checked_at = ? WHERE series_id = ?", (now, series_id))
+        return True
+
+    # --- Reads ---
+    def latest(self, series_id, frequency=None):
+        """Most recent (date, value), read from the series summary row without touching history."""
+        try:
+            self.refresh(series_id, frequency)
+        except Exception:
+            pass  # Serve the cached value when FRED is unreachable
+        meta = self._meta(series_id)
+        if meta is None:
+            return None, None
+        return datetime.date.fromisoformat(meta[1]), meta[2]
+
+    def latest_value(self, series_id, frequency=None):
+        return self.latest(series_id, frequency)[1]
+
+    def history(self, series_id, start=None):
+        query = "SELECT date, value FROM fred_observations WHERE series_id = ?"
+        params = [series_id]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).date().isoformat())
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query + " ORDER BY date", params).fetchall()
+        index = pd.to_datetime([d for d, _ in rows])
+        return pd.Series([v for _, v in rows], index=index, name=series_id, dtype=float)
+
+    def history_frame(self, series_ids, start=None):
+        """Date x series frame for several series from one query; dates missing from a series are NaN."""
+        series_ids = list(series_ids)
+        query = f"SELECT date, series_id, value FROM fred_observations WHERE series_id IN ({','.join('?' * len(series_ids))})"
+        params = list(series_ids)
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(pd.Timestamp(start).date().isoformat())
+        with closing(self._connect()) as conn:
+            rows = pd.read_sql_query(query, conn, params=params)
+        frame = rows.pivot(index="date", columns="series_id", values="value")
+        frame.index = pd.to_datetime(frame.index)
+        return frame.reindex(columns=series_ids).sort_index().astype(float)
@@ -0,0 +1,166 @@
+import os
+
+import pandas as pd
+
+from market_data import prices, treasury
+from market_data import cache, providers
+from market_data.cache import cached
+from market_data.fetch import FetchError, FetchRequest, fetch_all
+from market_data.fred_cache import FredCache
+from market_data.store import period_start
+
+FRED_SERIES = {
+    "cpi": "CPIAUCSL",
+    "oas": "BAMLH0A0HYM2",
+    "gdp": "GDP",
+    "lei": "USSLIND",
+}
+
+# Plan inputs without a live source yet; shared so every page shows the same placeholder
+SIMULATED_METRICS = {
+    "cds_spread": 55,
+    "china_holdings_drop": 120,
+    "gscpi": 1.7,
+    "trade_deficit": 85,
+}
+PANEL_TICKERS = tuple(prices.SIGNAL_TICKERS + prices.CONTEXT_TICKERS)
+FRED_HISTORY_START = "2000-01-01"
+
+_fred_cache = None
+_fred_key = None
+
+
+def configure_fred(api_key=None):
+    """Create the shared FRED cache; without a key it serves only locally cached observations."""
+    global _fred_cache, _fred_key
+    api_key = api_key or os.getenv("FRED_API_KEY")
+    if _fred_cache is not None and api_key == _fred_key:
+        return _fred_cache
+    _fred_key = api_key
+    provider = providers.get_provider()
+    if api_key and not provider.has_fred:
+        provider.fred_api_key = api_key
+    _fred_cache = FredCache(provider if provider.has_fred else None)
+    return _fred_cache
+
+
+def get_fred_cache():
+    return _fred_cache or configure_fred()
+
+
+# --- Cached Loaders ---
+@cached("prices")
+def load_panel(tickers=PANEL_TICKERS, period="1y"):
+    return prices.fetch_panel(list(tickers), period=period)
+
+
+@cached("fred")
+def load_fred_history(series_id, start=FRED_HISTORY_START):
+    fred_cache = get_fred_cache()
+    try:
+        fred_cache.refresh(series_id)
+    except Exception:
+        # Serve whatever is stored locally, but don't hold it for the FRED TTL; the next call retries
+        return cache.Uncached(fred_cache.history(series_id, start=start))
+    return fred_cache.history(series_id, start=start)
+
+
+@cached("fred")
+def load_curve(start=treasury.CURVE_START):
+    """Date x tenor Treasury yield matrix; tenors are brought up to date concurrently first."""
+    fred_cache = get_fred_cache()
+    failed = treasury.refresh(fred_cache)
+    curve = treasury.curve_matrix(fred_cache, start=start)
+    return cache.Uncached(curve) if failed else curve
+
+
+def refresh_now():
+    """Drop every cached result and re-request FRED regardless of its release calendar."""
+    cache.clear()
+    fred_cache = get_fred_cache()
+    for series_id in (*FRED_SERIES.values(), *treasury.TENORS.values()):
+        try:
+            fred_cache.refresh(series_id, force=True)
+        except Exception:
+            pass
+
+
+# --- Derived Macro Values ---
+def cpi_yoy(history):
+    if len(history) < 13:
+        return None
+    year_ago = history.asof(history.index[-1] - pd.DateOffset(years=1))
+    return float((history.iloc[-1] / year_ago - 1) * 100)
+
+
+def gdp_growth(history):
+    if len(history) < 2:
+        return None
+    return float(((history.iloc[-1] / history.iloc[-2]) ** 4 - 1) * 100)  # Annualized QoQ
+
+
+def oas_bps(history):
+    return None if history.empty else float(history.iloc[-1] * 100)
+
+
+def last_value(history):
+    return None if history.empty else float(history.iloc[-1])
+
+
+def prefetch():
+    """Warm the price panel and every FRED series concurrently, so the reads below are cache hits."""
+    requests = [FetchRequest("panel", load_panel), FetchRequest("treasury", load_curve)]
+    requests += [FetchRequest(series_id, load_fred_history, (series_id,)) for series_id in FRED_SERIES.values()]
+    return fetch_all(requests)
+
+
+def collect_as_of():
+    """Date of the observation behind each metric group."""
+    panel = load_panel()
+    as_of = {"market": panel.dropna(how="all").index.max()}
+    for name, series_id in FRED_SERIES.items():
+        history = load_fred_history(series_id)
+        as_of[name] = None if history.empty else history.index[-1]
+    curve = load_curve()
+    as_of["treasury"] = curve.index.max() if len(curve) else None
+    return {name: None if pd.isna(ts) else ts.date() for name, ts in as_of.items()}
+
+
+def fetched_or_local(results, name, read_local):
+    """A prefetched result; when that fetch failed or timed out, the locally stored data instead.
+
+    The local read bypasses the cache, so a miss is retried by the next snapshot build rather than
+    waiting out the TTL (or the abandoned fetch still holding the key).
+    """
+    result = results[name]
+    return read_local() if isinstance(result, FetchError) else result
+
+
+def collect_metrics():
+    """Common metric set shared by the dashboards: market levels plus derived macro readings."""
+    results = prefetch()
+    fred_cache = get_fred_cache()
+    panel = fetched_or_local(
+        results, "panel", lambda: prices.get_store().read_close(PANEL_TICKERS, start=period_start("1y"))
+    )
+    history = {
+        name: fetched_or_local(results, series_id, lambda s=series_id: fred_cache.history(s, start=FRED_HISTORY_START))
+        for name, series_id in FRED_SERIES.items()
+    }
+    curve = fetched_or_local(results, "treasury", lambda: treasury.curve_matrix(fred_cache))
+    vix = prices.get_vix(panel)
+    sp_price, sp_ma = prices.get_sp500_vs_ma(panel)
+    t10, t3m = prices.get_yield_curve(panel)
+    return {
+        "vix": vix,
+        "sp_price": sp_price,
+        "sp_ma": sp_ma,
+        "t10": t10,
+        "t3m": t3m,
+        "cpi": cpi_yoy(history["cpi"]),
+        "oas": oas_bps(history["oas"]),
+        "gdp": gdp_growth(history["gdp"]),
+        "lei": last_value(history["lei"]),
+        **prices.context_changes(panel),
+        **treasury.curve_metrics(treasury.term_structure(curve)),
+    }
@@ -0,0 +1,92 @@
+import pandas as pd
+
+from market_data.store import PriceStore, period_start
+
+# Tickers every signal evaluation needs; fetched together in one request
+SIGNAL_TICKERS = ["^VIX", "^GSPC", "^TNX", "^IRX"]
+# Cross-asset inputs for the debt, China and trade plans; synced in the same request as the signal tickers
+CONTEXT_TICKERS = ["DX-Y.NYB", "EEM", "SPY", "DBC"]
+SP500_MOVING_AVG_DAYS = 200
+CHANGE_WINDOW = pd.DateOffset(months=3)
+
+
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = PriceStore()
+    return _store
+
+
+# --- Batched Fetch ---
+def fetch_panel(tickers=SIGNAL_TICKERS, period="1y", store=None):
+    """Sync missing bars for all tickers in one request, then read a date x ticker close frame locally."""
+    store = store or get_store()
+    tickers = list(dict.fromkeys(tickers))
+    store.sync(tickers, period=period)
+    return store.read_close(tickers, start=period_start(period))
+
+
+# --- Panel Views ---
+def get_price(panel, ticker):
+    return panel[ticker].dropna()
+
+
+def latest(panel, ticker):
+    return float(get_price(panel, ticker).iloc[-1])
+
+
+def latest_closes(panel):
+    """Most recent close per ticker (tickers that stopped trading keep their last bar)."""
+    return panel.ffill().iloc[-1] if len(panel) else pd.Series(float("nan"), index=panel.columns)
+
+
+def get_vix(panel):
+    return latest(panel, "^VIX")
+
+
+def get_sp500_vs_ma(panel, window=SP500_MOVING_AVG_DAYS):
+    data = get_price(panel, "^GSPC")
+    current = float(data.iloc[-1])
+    ma = float(data.iloc[-window:].mean()) if len(data) >= window else float("nan")
+    return current, ma
+
+
+def signal_frame(panel, window=SP500_MOVING_AVG_DAYS):
+    """Per-day metric rows (vix, sp_price, sp_ma, t10, t3m) for every S&P bar in the panel."""
+    panel = panel.dropna(subset=["^GSPC"])
+    sp = panel["^GSPC"]
+    return pd.DataFrame({
+        "vix": panel["^VIX"].ffill(),
+        "sp_price": sp,
+        "sp_ma": sp.rolling(window).mean(),
+        "t10": panel["^TNX"].ffill(),
+        "t3m": panel["^IRX"].ffill(),
+    })
+
+
+def pct_change(panel, ticker, window=CHANGE_WINDOW):
+    """Percent change from the last close on or before `window` ago to the latest close (NaN without data)."""
+    data = get_price(panel, ticker) if ticker in panel else pd.Series(dtype=float)
+    if data.empty:
+        return float("nan")
+    base = data.asof(data.index[-1] - window)
+    return float((data.iloc[-1] / base - 1) * 100)
+
+
+def context_changes(panel):
+    """3-month dollar, EM-vs-US and commodity moves, keyed by the rule-engine metric names."""
+    return {
+        "dxy_change_3mo": pct_change(panel, "DX-Y.NYB"),
+        "eem_vs_spy_3mo": pct_change(panel, "EEM") - pct_change(panel, "SPY"),
+        "dbc_change_3mo": pct_change(panel, "DBC"),
+    }
+
+
+def get_yield_curve(panel):
+    # Yahoo quotes ^TNX/^IRX directly in percent (4.25 = 4.25%), the unit the rule thresholds use; don't rescale
+    t10 = latest(panel, "^TNX")  # 10-Year Treasury
+    t3m = latest(panel, "^IRX")  # 3-Month Treasury
+    return t10, t3m
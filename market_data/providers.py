@@ -0,0 +1,187 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from market_data.store import ROOT_DIR
+
+# --- Configuration ---
+# MARKET_DATA_MODE: live (default), record (live + save responses) or replay (serve saved responses only)
+MODE = os.getenv("MARKET_DATA_MODE", "live")
+FIXTURES_DIR = os.getenv("MARKET_DATA_FIXTURES", os.path.join(ROOT_DIR, "fixtures"))
+REPLAY_LATENCY = float(os.getenv("MARKET_DATA_LATENCY", "0"))  # Simulated seconds per replayed call
+
+
+class DataProvider(ABC):
+    """Source of Yahoo bars and FRED observations; mirrors yf.download and Fred.get_series."""
+
+    has_fred = True
+    download_errors = (OSError, ValueError)  # Failures a caller can treat as "source unavailable, keep cached bars"
+
+    def __init__(self):
+        self.calls = {"download": 0, "get_series": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, kind):
+        with self._lock:
+            self.calls[kind] += 1
+
+    @abstractmethod
+    def download(self, tickers, **kwargs):
+        """Bars shaped like yf.download: one column level per field, one per ticker."""
+
+    @abstractmethod
+    def get_series(self, series_id, observation_start=None):
+        """Observations shaped like Fred.get_series: a date-indexed Series."""
+
+
+class LiveProvider(DataProvider):
+    def __init__(self, fred_api_key=None):
+        super().__init__()
+        self.fred_api_key = fred_api_key or os.getenv("FRED_API_KEY")
+        self._fred = None
+
+    @property
+    def has_fred(self):
+        return bool(self.fred_api_key)
+
+    @property
+    def download_errors(self):
+        from yfinance.exceptions import YFException
+        return (*DataProvider.download_errors, YFException)
+
+    def download(self, tickers, **kwargs):
+        import yfinance as yf
+        self._count("download")
+        return yf.download(tickers, progress=False, **kwargs)
+
+    def get_series(self, series_id, observation_start=None):
+        if self._fred is None:
+            from fredapi import Fred
+            self._fred = Fred(api_key=self.fred_api_key)
+        self._count("get_series")
+        return self._fred.get_series(series_id, observation_start=observation_start)
+
+
+# --- Fixture Files ---
+def _fixture_path(kind, name, fixtures_dir):
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    return os.path.join(fixtures_dir, kind, f"{safe}.pkl")
+
+
+def _merge_fixture(path, data):
+    """Union new observations into a fixture so repeated recordings build up one history per ticker/series."""
+    if os.path.exists(path):
+        existing = pd.read_pickle(path)
+        data = pd.concat([existing, data])
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data.to_pickle(path)
+
+
+class RecordingProvider(LiveProvider):
+    """Live provider that also saves every response under the fixtures directory."""
+
+    def __init__(self, fred_api_key=None, fixtures_dir=FIXTURES_DIR):
+        super().__init__(fred_api_key)
+        self.fixtures_dir = fixtures_dir
+
+    def download(self, tickers, **kwargs):
+        data = super().download(tickers, **kwargs)
+        if data is None or data.empty:
+            return data
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(-1):
+                    continue
+                bars = data.xs(ticker, axis=1, level=-1)
+            else:
+                bars = data
+            _merge_fixture(_fixture_path("yahoo", ticker, self.fixtures_dir), bars.dropna(how="all"))
+        return data
+
+    def get_series(self, series_id, observation_start=None):
+        data = super().get_series(series_id, observation_start=observation_start)
+        _merge_fixture(_fixture_path("fred", series_id, self.fixtures_dir), data)
+        return data
+
+
+class ReplayProvider(DataProvider):
+    """Serves recorded fixtures only; never touches the network."""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=REPLAY_LATENCY):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self._loaded = {}
+
+    def _load(self, kind, name):
+        key = (kind, name)
+        if key not in self._loaded:
+            path = _fixture_path(kind, name, self.fixtures_dir)
+            self._loaded[key] = pd.read_pickle(path) if os.path.exists(path) else None
+        return self._loaded[key]
+
+    def download(self, tickers, start=None, period=None, **kwargs):
+        from market_data.store import period_start
+        self._count("download")
+        if self.latency:
+            time.sleep(self.latency)
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for ticker in tickers:
+            bars = self._load("yahoo", ticker)
+            if bars is None or bars.empty:
+                continue
+            if start is not None:
+                bars = bars[bars.index >= pd.Timestamp(start)]
+            elif period:
+                # Periods are relative to the end of the recording, so replays are deterministic
+                since = period_start(period, today=bars.index[-1].date())
+                bars = bars if since is None else bars[bars.index >= pd.Timestamp(since)]
+            frames[ticker] = bars
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1, names=["Ticker", "Price"])
+        return data.swaplevel(axis=1).sort_index(axis=1)
+
+    def get_series(self, series_id, observation_start=None):
+        self._count("get_series")
+        if self.latency:
+            time.sleep(self.latency)
+        data = self._load("fred", series_id)
+        if data is None:
+            raise KeyError(f"No recorded FRED fixture for {series_id}")
+        if observation_start is not None:
+            data = data[data.index >= pd.Timestamp(observation_start)]
+        return data
+
+
+# --- Active Provider ---
+_provider = None
+
+
+def configure(mode=None, fred_api_key=None, **kwargs):
+    global _provider
+    mode = mode or MODE
+    if mode == "replay":
+        _provider = ReplayProvider(**kwargs)
+    elif mode == "record":
+        _provider = RecordingProvider(fred_api_key, **kwargs)
+    elif mode == "live":
+        _provider = LiveProvider(fred_api_key)
+    else:
+        raise ValueError(f"Unknown MARKET_DATA_MODE: {mode}")
+    return _provider
+
+
+def get_provider():
+    return _provider or configure()
+
+
+def set_provider(provider):
+    global _provider
+    _provider = provider
@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import datetime
+import threading
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from types import MappingProxyType
+
+from market_data import metrics
+from market_data.store import DATA_DIR
+from signals import backtest, history, rules
+
+SNAPSHOT_PATH = os.path.join(DATA_DIR, "snapshot.json")
+REFRESH_INTERVAL = 15 * 60  # Seconds; matches the price cache TTL
+
+
+@dataclass(frozen=True)
+class MarketContext:
+    """Typed, read-only market readings every plan page renders from; one per snapshot."""
+    built_at: datetime.datetime
+    vix: float
+    sp_price: float
+    sp_ma: float
+    t10: float
+    t3m: float
+    dxy_change_3mo: float
+    eem_vs_spy_3mo: float
+    dbc_change_3mo: float
+    cpi: float
+    oas: float
+    gdp: float
+    lei: float
+    triggered: frozenset = frozenset()
+    simulated: frozenset = frozenset()
+    as_of: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    metrics: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))  # Everything else by name
+
+    @property
+    def sp_vs_ma(self):
+        return self.sp_price / self.sp_ma
+
+    @property
+    def curve_spread(self):
+        return self.t10 - self.t3m
+
+    def get(self, name, default=float("nan")):
+        return self.metrics.get(name, default)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        m = snapshot.metrics
+        readings = {f.name: float(m.get(f.name, float("nan"))) for f in fields(cls) if f.type is float}
+        return cls(
+            built_at=snapshot.built_at,
+            triggered=frozenset(snapshot.triggered),
+            simulated=frozenset(snapshot.simulated),
+            as_of=snapshot.as_of,
+            metrics=snapshot.metrics,
+            **readings,
+        )
+
+
+@dataclass(frozen=True)
+class SignalSnapshot:
+    """Everything a page needs to render, captured at one point in time."""
+    built_at: datetime.datetime
+    metrics: MappingProxyType
+    as_of: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    triggered: tuple = ()
+    simulated: tuple = ()
+
+    def to_dict(self):
+        return {
+            "built_at": self.built_at.isoformat(timespec="seconds"),
+            "metrics": dict(self.metrics),
+            "as_of": {k: v and v.isoformat() for k, v in self.as_of.items()},
+            "triggered": list(self.triggered),
+            "simulated": list(self.simulated),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            built_at=datetime.datetime.fromisoformat(data["built_at"]),
+            metrics=MappingProxyType(dict(data["metrics"])),
+            as_of=MappingProxyType({k: v and datetime.date.fromisoformat(v) for k, v in data["as_of"].items()}),
+            triggered=tuple(data["triggered"]),
+            simulated=tuple(data.get("simulated", ())),
+        )
+
+    @cached_property
+    def context(self):
+        """The snapshot as a MarketContext, built on first use and shared by every page render."""
+        return MarketContext.from_snapshot(self)
+
+
+# --- Build & Publish ---
+def build_snapshot():
+    live = {k: float("nan") if v is None else float(v) for k, v in metrics.collect_metrics().items()}
+    simulated = {k: float(v) for k, v in metrics.SIMULATED_METRICS.items() if k not in live}
+    values = {**simulated, **live}
+    return SignalSnapshot(
+        built_at=datetime.datetime.now(),
+        metrics=MappingProxyType(values),
+        as_of=MappingProxyType(metrics.collect_as_of()),
+        triggered=rules.triggered(values),
+        simulated=tuple(simulated),
+    )
+
+
+def record_history(snapshot):
+    """Append the snapshot's evaluation of every live (non-simulated) rule to the signal history."""
+    live = [rule for rule in rules.RULES if rule.metric not in snapshot.simulated]
+    history.get_history().record(snapshot.metrics, live, ts=snapshot.built_at, source="snapshot")
+
+
+def sync_long_history():
+    """Keep the multi-decade price history behind the chart panels current, off the page request path."""
+    try:
+        backtest.sync_history()
+    except Exception as e:
+        print(f"Long history sync failed: {e}")
+
+
+def publish(snapshot, path=SNAPSHOT_PATH):
+    """Write the snapshot next to its destination and rename it into place, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+def load(path=SNAPSHOT_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return SignalSnapshot.from_dict(json.load(f))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# --- Background Refresher ---
+class SnapshotRefresher(threading.Thread):
+    """Rebuilds the snapshot on a schedule; pages only ever read the last published one."""
+
+    def __init__(self, interval=REFRESH_INTERVAL, path=SNAPSHOT_PATH):
+        super().__init__(name="snapshot-refresher", daemon=True)
+        self.interval = interval
+        self.path = path
+        self.last_error = None
+        self._latest = load(path)
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._force = False
+        if self._latest is not None:
+            self._ready.set()
+
+    def latest(self, wait=None):
+        """Latest snapshot; only a cold start with nothing on disk waits (up to `wait` seconds)."""
+        if self._latest is None and wait:
+            self._ready.wait(wait)
+        return self._latest
+
+    def refresh_now(self):
+        self._force = True
+        self._wake.set()
+
+    def run(self):
+        while True:
+            try:
+                if self._force:
+                    self._force = False
+                    metrics.refresh_now()
+                snapshot = build_snapshot()
+                publish(snapshot, self.path)
+                record_history(snapshot)
+                self._latest = snapshot  # Single reference swap; readers see the old or new snapshot, never a mix
+                self.last_error = None
+                self._ready.set()
+                sync_long_history()
+            except Exception as e:
+                self.last_error = e
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+class SnapshotFileReader:
+    """Reads snapshots published by a separate worker process (python -m market_data.snapshot)."""
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = path
+        self.last_error = None
+        self._latest = None
+        self._mtime = None
+
+    def latest(self, wait=None):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return self._latest
+        if mtime != self._mtime:
+            self._latest, self._mtime = load(self.path) or self._latest, mtime
+        return self._latest
+
+    def refresh_now(self):
+        pass  # The worker owns the schedule
+
+
+def start_refresher():
+    """Snapshot source for the app: a file reader when an external worker is configured, else a background thread."""
+    if os.getenv("MARKET_SNAPSHOT_WORKER"):
+        return SnapshotFileReader()
+    refresher = SnapshotRefresher()
+    refresher.start()
+    return refresher
+
+
+# --- Worker Process Entry Point ---
+if __name__ == "__main__":
+    metrics.configure_fred()
+    while True:
+        started = time.monotonic()
+        try:
+            latest = build_snapshot()
+            publish(latest)
+            record_history(latest)
+            print(f"[{datetime.datetime.now():%Y-%m-%d %H:%M:%S}] Snapshot published to {SNAPSHOT_PATH}")
+            sync_long_history()
+        except Exception as e:
+            print(f"Snapshot build failed: {e}")
+        time.sleep(max(0, REFRESH_INTERVAL - (time.monotonic() - started)))
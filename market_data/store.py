@@ -0,0 +1,194 @@
+import os
+import sqlite3
+import datetime
+from contextlib import closing
+
+import pandas as pd
+
+# --- Storage Location ---
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.getenv("MARKET_DATA_DIR", os.path.join(ROOT_DIR, ".cache"))
+DB_PATH = os.path.join(DATA_DIR, "market_data.sqlite")
+
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    ticker TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL, high REAL, low REAL, close REAL, volume REAL,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tickers (
+    ticker TEXT PRIMARY KEY,
+    last_bar TEXT NOT NULL,
+    covered_from TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def period_start(period, today=None):
+    """Translate a yfinance period string ('5d', '6mo', '1y', 'max') into a start date."""
+    today = today or datetime.date.today()
+    if period == "max":
+        return None
+    count, unit = int(period.rstrip("dmoy")), period.lstrip("0123456789")
+    if unit == "d":
+        return today - datetime.timedelta(days=count)
+    if unit == "mo":
+        return (pd.Timestamp(today) - pd.DateOffset(months=count)).date()
+    if unit == "y":
+        return (pd.Timestamp(today) - pd.DateOffset(years=count)).date()
+    raise ValueError(f"Unsupported period: {period}")
+
+
+# --- Connections ---
+def connect(path):
+    return sqlite3.connect(path, timeout=30)
+
+
+def init_db(path, schema):
+    """Create the database file and `schema`; shared by every store that lives in DB_PATH.
+
+    WAL journaling lets page reads proceed while the concurrent fetch threads write, and the
+    connect timeout makes writers queue behind each other instead of failing with "database is locked".
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with closing(connect(path)) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema)
+
+
+class PriceStore:
+    """Local OHLC bars keyed by (ticker, date); only bars after the last stored one are downloaded."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.stale = {}  # Ticker -> reason its last sync failed; cleared by the next successful one
+        init_db(path, SCHEMA)
+
+    def _connect(self):
+        return connect(self.path)
+
+    # --- Reads ---
+    def coverage(self, tickers):
+        placeholders = ",".join("?" * len(tickers))
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                f"SELECT ticker, last_bar, covered_from FROM tickers WHERE ticker IN ({placeholders})",
+                list(tickers),
+            ).fetchall()
+        return {
+            ticker: (datetime.date.fromisoformat(last), covered and datetime.date.fromisoformat(covered))
+            for ticker, last, covered in rows
+        }
+
+    def last_bar(self, ticker):
+        covered = self.coverage([ticker]).get(ticker)
+        return covered[0] if covered else None
+
+    def read_close(self, tickers, start=None):
+        tickers = list(tickers)
+        placeholders = ",".join("?" * len(tickers))
+        query = f"SELECT date, ticker, close FROM bars WHERE ticker IN ({placeholders})"
+        params = list(tickers)
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.isoformat())
+        with closing(self._connect()) as conn:
+            rows = pd.read_sql_query(query, conn, params=params)
+        panel = rows.pivot(index="date", columns="ticker", values="close")
+        panel.index = pd.to_datetime(panel.index)
+        panel.columns.name = None
+        return panel.reindex(columns=tickers).sort_index()
+
+    def read_bars(self, ticker, start=None):
+        query = "SELECT date, open, high, low, close, volume FROM bars WHERE ticker = ?"
+        params = [ticker]
+        if start is not None:
+            query += " AND date >= ?"
+            params.append(start.isoformat())
+        with closing(self._connect()) as conn:
+            bars = pd.read_sql_query(query + " ORDER BY date", conn, params=params)
+        bars["date"] = pd.to_datetime(bars["date"])
+        return bars.set_index("date")
+
+    # --- Writes ---
+    def append(self, ticker, bars, covered_from=False):
+        bars = bars.dropna(subset=["Close"])
+        if bars.empty:
+            return 0
+        rows = [
+            (ticker, ts.date().isoformat(), *(None if pd.isna(v) else float(v) for v in values))
+            for ts, values in zip(bars.index, bars[FIELDS].itertuples(index=False))
+        ]
+        last = rows[-1][1]
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                "INSERT INTO tickers VALUES (?, ?, ?, ?) ON CONFLICT(ticker) DO UPDATE "
+                "SET last_bar = MAX(last_bar, excluded.last_bar), updated_at = excluded.updated_at",
+                (ticker, last, rows[0][1], now),
+            )
+            # covered_from=None records a full-history ("max") download
+            if covered_from is not False:
+                conn.execute(
+                    "UPDATE tickers SET covered_from = ? WHERE ticker = ?",
+                    (covered_from and covered_from.isoformat(), ticker),
+                )
+        return len(rows)
+
+    # --- Incremental Sync ---
+    def sync(self, tickers, period="1y"):
+        """Download only missing bars: new tickers get `period` of history, known ones a delta.
+
+        Returns the tickers that could not be refreshed; their stored bars (and last_bar) are left as they were.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        known = self.coverage(tickers)
+        start = period_start(period)
+        # Unknown tickers, or ones stored with less history than requested, need a full download
+        backfill = [
+            t for t in tickers
+            if t not in known or (known[t][1] is not None and (start is None or start < known[t][1]))
+        ]
+        stored = [t for t in tickers if t not in backfill]
+
+        failed = []
+        if backfill:
+            failed += self._download(backfill, covered_from=start, period=period)
+        if stored:
+            # Start at the last stored bar so a partial intraday bar gets overwritten
+            failed += self._download(stored, start=min(known[t][0] for t in stored))
+        return failed
+
+    def _download(self, tickers, covered_from=False, **kwargs):
+        """Fetch and append bars; returns the tickers that came back with none."""
+        from market_data.providers import get_provider
+        provider = get_provider()
+        request = ", ".join(f"{k}={v}" for k, v in kwargs.items())
+        try:
+            data = provider.download(tickers, **kwargs)
+        except provider.download_errors as e:
+            print(f"Price download failed for {', '.join(tickers)} ({request}): {e}")
+            self.stale.update(dict.fromkeys(tickers, str(e)))
+            return list(tickers)
+        failed = []
+        for ticker in tickers:
+            if data is None or data.empty:
+                bars = None
+            elif isinstance(data.columns, pd.MultiIndex):
+                levels = data.columns.get_level_values(-1)
+                bars = data.xs(ticker, axis=1, level=-1) if ticker in levels else None
+            else:
+                bars = data
+            if bars is not None and self.append(ticker, bars.reindex(columns=FIELDS), covered_from=covered_from):
+                self.stale.pop(ticker, None)
+            else:
+                failed.append(ticker)
+        if failed:
+            print(f"Price download returned no bars for {', '.join(failed)} ({request})")
+            self.stale.update(dict.fromkeys(failed, "no bars returned"))
+        return failed
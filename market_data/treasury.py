@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from market_data.fetch import FetchRequest, fetch_all
+
+# Constant-maturity Treasury yields, shortest to longest
+TENORS = {
+    "1M": "DGS1MO",
+    "3M": "DGS3MO",
+    "6M": "DGS6MO",
+    "1Y": "DGS1",
+    "2Y": "DGS2",
+    "3Y": "DGS3",
+    "5Y": "DGS5",
+    "7Y": "DGS7",
+    "10Y": "DGS10",
+    "20Y": "DGS20",
+    "30Y": "DGS30",
+}
+TENOR_YEARS = {"1M": 1 / 12, "3M": 0.25, "6M": 0.5, "1Y": 1, "2Y": 2, "3Y": 3, "5Y": 5, "7Y": 7, "10Y": 10, "20Y": 20, "30Y": 30}
+# Spreads the plans quote by name: (short tenor, long tenor)
+KEY_SPREADS = {"3m10y": ("3M", "10Y"), "2s10s": ("2Y", "10Y"), "5s30s": ("5Y", "30Y")}
+CURVE_START = "2000-01-01"
+FILL_LIMIT = 5  # Business days a tenor's last yield carries over a gap in that series alone
+DEPTH_CHANGE_DAYS = 21  # "Is the inversion deepening" compares against this many observations back
+
+
+@dataclass(frozen=True)
+class TermStructure:
+    curve: pd.DataFrame  # Date x tenor yields (%)
+    spreads: pd.DataFrame  # Date x "short/long" pair, long minus short (pp), every pair of tenors
+    inversion_depth: pd.Series  # Largest amount any longer tenor yields below a shorter one (pp, 0 when none)
+    inverted_share: pd.Series  # Share of tenor pairs inverted (%)
+    days_inverted: pd.DataFrame  # Date x KEY_SPREADS: consecutive observations the spread has been below zero
+
+
+# --- Data ---
+def refresh(fred_cache):
+    """Bring every tenor up to date concurrently; each only requests observations after its cached tail."""
+    results = fetch_all(FetchRequest(series_id, fred_cache.refresh, (series_id,)) for series_id in TENORS.values())
+    return {name: result for name, result in results.items() if isinstance(result, Exception)}
+
+
+def curve_matrix(fred_cache, start=CURVE_START):
+    """Aligned date x tenor yield matrix from the local FRED cache (one query, nothing fetched)."""
+    frame = fred_cache.history_frame(TENORS.values(), start=start)
+    frame.columns = list(TENORS)
+    return frame.dropna(how="all").ffill(limit=FILL_LIMIT)
+
+
+# --- Derived Term Structure ---
+def pair_spreads(curve):
+    """Every long-minus-short tenor spread at once: (days x T x T) differences, upper triangle kept."""
+    values = curve.to_numpy(float)
+    short, long = np.triu_indices(values.shape[1], k=1)
+    diffs = values[:, None, :] - values[:, :, None]  # [day, i, j] = yield[j] - yield[i]
+    names = [f"{curve.columns[i]}/{curve.columns[j]}" for i, j in zip(short, long)]
+    return pd.DataFrame(diffs[:, short, long], index=curve.index, columns=names)
+
+
+def run_lengths(mask):
+    """Length of the current True run at each row, per column (0 where False)."""
+    mask = np.asarray(mask, dtype=bool)
+    counts = np.cumsum(mask, axis=0)
+    reset = np.maximum.accumulate(np.where(mask, 0, counts), axis=0)
+    return counts - reset
+
+
+def term_structure(curve):
+    spreads = pair_spreads(curve)
+    values = spreads.to_numpy(float)
+    known = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        inverted = values < 0
+    depth = np.fmax(-np.nanmin(np.where(known.any(axis=1)[:, None], values, 0.0), axis=1), 0.0)
+    share = inverted.sum(axis=1) / np.maximum(known.sum(axis=1), 1) * 100
+    key = spreads[[f"{short}/{long}" for short, long in KEY_SPREADS.values()]]
+    with np.errstate(invalid="ignore"):
+        days = run_lengths(key.to_numpy(float) < 0)
+    return TermStructure(
+        curve=curve,
+        spreads=spreads,
+        inversion_depth=pd.Series(depth, index=curve.index, name="inversion_depth"),
+        inverted_share=pd.Series(share, index=curve.index, name="inverted_share"),
+        days_inverted=pd.DataFrame(days, index=curve.index, columns=list(KEY_SPREADS)),
+    )
+
+
+def curve_metrics(structure):
+    """Latest readings as flat metric names, for the snapshot and rule engine."""
+    if structure.curve.empty:
+        return {}
+    out = {}
+    for name, (short, long) in KEY_SPREADS.items():
+        out[f"spread_{name}"] = structure.spreads[f"{short}/{long}"].iloc[-1]
+        out[f"days_inverted_{name}"] = structure.days_inverted[name].iloc[-1]
+    depth = structure.inversion_depth
+    out["inversion_depth"] = depth.iloc[-1]
+    out["inversion_depth_chg_1mo"] = depth.iloc[-1] - depth.iloc[-1 - DEPTH_CHANGE_DAYS] if len(depth) > DEPTH_CHANGE_DAYS else np.nan
+    out["inverted_pairs_pct"] = structure.inverted_share.iloc[-1]
+    return {name: float(value) for name, value in out.items()}
@@ -1,75 +1,308 @@
-import yfinance as yf
-import smtplib
-from email.message import EmailMessage
-import ssl
+import argparse
 import datetime
+import math
 import os
+import time
+import pandas as pd
 from dotenv import load_dotenv
 
+from market_data import prices
+from market_data.fetch import FetchError, FetchRequest, fetch_all
+from market_data.metrics import FRED_SERIES, cpi_yoy, gdp_growth, last_value, load_fred_history, oas_bps
+from market_data.store import DATA_DIR, period_start
+from signals import indicators
+from signals.alert_state import AlertStateMachine
+from signals import history, rules
+from signals.notify import NotificationDispatcher
+from signals import subscribers as subs
+
 # ----------- Load Environment Variables -----------
-load_dotenv()
-EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
-EMAIL_PASSWORD = os.getenv("EMAIL_PASSWORD")
-TO_EMAIL = os.getenv("TO_EMAIL")
+load_dotenv()  # EMAIL_ADDRESS, EMAIL_PASSWORD, TO_EMAIL, SMTP_*, ALERT_WEBHOOK_URL are read by signals.notify
 
 # Thresholds
-VIX_ALERT_LEVEL = 20
+VIX_ALERT_LEVEL = rules.RULES_BY_ID["dynamics.vix_gt_20"].threshold
 SP500_MOVING_AVG_DAYS = 200
+INDICATOR_STATE_PATH = os.path.join(DATA_DIR, "monitor_indicators.json")
+ALERT_STATE_PATH = os.path.join(DATA_DIR, "monitor_alerts.json")
+POLL_INTERVAL = 60  # Seconds between polls in daemon mode
+PRIME_BARS = 10  # Past bars replayed into a fresh alert state so confirmation counts start warm
+TRADING_DAYS_PER_YEAR = 245  # Conservative, so a period always covers the bars asked for
 
 # ----------- Utility Functions -----------
-def fetch_vix_level():
-    vix = yf.download("^VIX", period="5d")['Close']
-    return vix.iloc[-1].item()
+class SP500Trend:
+    """Streaming 200-day SMA over completed S&P bars; the still-forming latest bar is peeked at, never committed."""
+
+    def __init__(self, sma=None, last_date=None):
+        self.sma = sma
+        self.last_date = last_date
+
+    @classmethod
+    def load(cls, path=INDICATOR_STATE_PATH):
+        last_date, state = indicators.load_state(path)
+        sma = state.get("sp500_ma")
+        if sma is None or sma.window != SP500_MOVING_AVG_DAYS:
+            return cls()
+        return cls(sma, last_date)
+
+    def save(self, path=INDICATOR_STATE_PATH):
+        if self.sma is not None:
+            indicators.save_state(path, self.last_date, {"sp500_ma": self.sma})
+
+    def advance(self, closes):
+        """Absorb completed bars newer than the last one seen; None if `closes` is too short to (re)initialize."""
+        completed = closes.iloc[:-1]
+        if self.sma is not None and self.last_date in completed.index:
+            for close in completed[completed.index > self.last_date]:
+                self.sma.update(close)
+        elif len(completed) >= SP500_MOVING_AVG_DAYS:
+            self.sma = indicators.SMA.from_history(completed, SP500_MOVING_AVG_DAYS)
+        else:
+            return None
+        self.last_date = completed.index[-1]
+        current_price = closes.iloc[-1].item()
+        return current_price, self.sma.peek(current_price)
 
-def fetch_sp500_vs_moving_avg():
-    sp500 = yf.download("^GSPC", period="1y")['Close']
-    current_price = sp500.iloc[-1].item()
-    moving_avg = sp500.rolling(window=SP500_MOVING_AVG_DAYS).mean().dropna().iloc[-1].item()
-    return current_price, moving_avg
+def fetch_signal_panel(period="1y", tickers=prices.SIGNAL_TICKERS):
+    return prices.fetch_panel(tickers, period=period)
 
-def fetch_yield_curve():
-    t10 = yf.download("^TNX", period="5d")['Close'].iloc[-1].item() / 100  # 10Y
-    t3m = yf.download("^IRX", period="5d")['Close'].iloc[-1].item() / 100  # 3M
-    return t10, t3m
+def fetch_vix_level(panel):
+    return prices.get_vix(panel)
+
+def fetch_sp500_vs_moving_avg(panel, trend=None):
+    # One-shot runs persist the trend between invocations; the daemon passes its in-memory instance
+    persist = trend is None
+    trend = trend or SP500Trend.load()
+    result = trend.advance(prices.get_price(panel, "^GSPC"))
+    if result is None:
+        # Short poll window and stale state: re-prime from a year of locally stored bars
+        trend.sma = None
+        result = trend.advance(prices.get_price(prices.fetch_panel(["^GSPC"], period="1y"), "^GSPC"))
+    if persist:
+        trend.save()
+    return result
+
+def fetch_yield_curve(panel):
+    return prices.get_yield_curve(panel)
 
 # ----------- Evaluation Logic -----------
+ALERT_MESSAGES = {
+    "dynamics.vix_gt_20": "VIX elevated: {vix:.2f}",
+    "dynamics.sp_below_ma": "S&P 500 dropped below {ma_window}-day MA: {sp_price:.2f} < {sp_ma:.2f}",
+    "dynamics.curve_inverted": "Yield curve inversion: 10Y={t10:.2f}% < 3M={t3m:.2f}%",
+    "dynamics.cpi_gt_4": "CPI inflation elevated: {cpi:.2f}% YoY",
+    "dynamics.oas_gt_500": "High-yield spreads widening: OAS {oas:.0f} bps",
+}
+MONITOR_RULES = tuple(ALERT_MESSAGES)
+MACRO_DERIVATIONS = {"cpi": cpi_yoy, "oas": oas_bps, "gdp": gdp_growth, "lei": last_value}
+# Rule metrics a full (subscriber) observation provides; the rest are simulated placeholders
+LIVE_METRICS = frozenset({"vix", "sp_vs_ma", "curve_spread", "t10", "t3m", *MACRO_DERIVATIONS,
+                          "dxy_change_3mo", "eem_vs_spy_3mo", "dbc_change_3mo"})
+CONTEXT_HISTORY = "6mo"  # Enough stored bars for the 3-month cross-asset changes
+
+def fetch_inputs(period="1y", full=False):
+    # The Yahoo batch and each FRED series are independent, so they are fetched concurrently
+    tickers = prices.SIGNAL_TICKERS + prices.CONTEXT_TICKERS if full else prices.SIGNAL_TICKERS
+    requests = [FetchRequest("panel", fetch_signal_panel, (period, tickers))]
+    names = MACRO_DERIVATIONS if full else ("cpi", "oas")
+    requests += [FetchRequest(name, load_fred_history, (FRED_SERIES[name],)) for name in names]
+    results = fetch_all(requests)
+    if isinstance(results["panel"], FetchError):
+        raise results["panel"]
+    return results
+
+def collect_metrics(period="1y", trend=None):
+    return collect_observation(period, trend)[0]
+
+def collect_observation(period="1y", trend=None, full=False):
+    """Current metrics plus the price panel they were computed from.
+
+    The default profile needs only the dynamics inputs; `full` adds GDP, LEI and the cross-asset
+    changes so every LIVE_METRICS rule a subscriber may pick can be evaluated.
+    """
+    results = fetch_inputs(period, full)
+    panel = results["panel"]
+    sp_price, sp_ma = fetch_sp500_vs_moving_avg(panel, trend)
+    t10, t3m = fetch_yield_curve(panel)
+    metrics = {"vix": fetch_vix_level(panel), "sp_price": sp_price, "sp_ma": sp_ma, "t10": t10, "t3m": t3m}
+    # Macro rules are skipped (never trigger) when FRED is unavailable
+    for name in results:
+        if name in MACRO_DERIVATIONS:
+            history = results[name]
+            value = None if isinstance(history, FetchError) else MACRO_DERIVATIONS[name](history)
+            metrics[name] = float("nan") if value is None else value
+    if full:
+        # The panel may only span the latest poll; the store holds the months the changes need
+        stored = prices.get_store().read_close(prices.CONTEXT_TICKERS, start=period_start(CONTEXT_HISTORY))
+        metrics.update(prices.context_changes(stored))
+    return metrics, panel
+
 def evaluate_conditions():
-    alerts = []
+    """Level view: every monitor rule currently breached."""
+    metrics = collect_metrics()
+    triggered = rules.triggered(metrics, rules.rules_for(MONITOR_RULES))
+    return [ALERT_MESSAGES[rule_id].format(ma_window=SP500_MOVING_AVG_DAYS, **metrics) for rule_id in triggered]
+
+def evaluate_alerts(machine=None, period="1y", trend=None):
+    """Edge view: messages for alerts that just fired, plus the rule ids that just cleared."""
+    persist = machine is None
+    machine = machine or AlertStateMachine.load(ALERT_STATE_PATH, rules.rules_for(MONITOR_RULES))
+    metrics, panel = collect_observation(period, trend)
+    history.get_history().record(metrics, machine.rules, source="monitor")
+    fresh = machine.last_bar is None
+    if fresh:
+        machine.prime(prices.signal_frame(panel).dropna().iloc[-PRIME_BARS - 1:-1])
+    events = machine.update(metrics, panel["^GSPC"].dropna().index[-1])
+    if persist:
+        machine.save(ALERT_STATE_PATH)
+    # A fresh state reports everything already active, like a first cron run always did
+    raised_ids = machine.active_rules() if fresh else [rule_id for rule_id, change in events if change == "raised"]
+    raised = [ALERT_MESSAGES[rule_id].format(ma_window=SP500_MOVING_AVG_DAYS, **metrics) for rule_id in raised_ids]
+    cleared = [rule_id for rule_id, change in events if change == "cleared"]
+    return raised, cleared
+
+# ----------- Subscriber Profiles -----------
+def ma_history_period(windows):
+    """Store period holding the longest MA window plus the bars a fresh state primes from."""
+    bars = max(windows, default=SP500_MOVING_AVG_DAYS) + PRIME_BARS + 1
+    return f"{math.ceil(bars / TRADING_DAYS_PER_YEAR)}y"
+
+def moving_averages(windows):
+    """Date x window S&P moving averages from one read of locally stored closes (already synced this cycle)."""
+    closes = prices.get_price(
+        prices.get_store().read_close(["^GSPC"], start=period_start(ma_history_period(windows))), "^GSPC"
+    )
+    short = [w for w in windows if w > len(closes)]
+    if short:
+        raise ValueError(f"Only {len(closes)} S&P bars stored; ma_window {max(short)} needs more history")
+    return pd.DataFrame({w: closes.rolling(w).mean() for w in windows})
 
-    vix = fetch_vix_level()
-    if vix > VIX_ALERT_LEVEL:
-        alerts.append(f"VIX elevated: {vix:.2f}")
+def profile_message(rule, metrics, sp_ma, ma_window):
+    if rule.rule_id in ALERT_MESSAGES:
+        return ALERT_MESSAGES[rule.rule_id].format(ma_window=ma_window, **{**metrics, "sp_ma": sp_ma})
+    value = rules.metric_frame({**metrics, "sp_ma": sp_ma}).iloc[0].get(rule.metric, float("nan"))
+    return f"{rule.describe(value)}: {rule.action}"
 
-    sp_price, sp_ma = fetch_sp500_vs_moving_avg()
-    if sp_price < sp_ma:
-        alerts.append(f"S&P 500 dropped below 200-day MA: {sp_price:.2f} < {sp_ma:.2f}")
+def evaluate_subscribers(matrix, period="1y", trend=None):
+    """One fetch and one vectorized match for every profile; returns {profile name: (raised msgs, cleared ids)}."""
+    metrics, panel = collect_observation(period, trend, full=True)
+    history.get_history().record(metrics, rules.rules_for(MONITOR_RULES), source="monitor")
+    ma_frame = moving_averages(matrix.windows)
+    sp_ma_by_window = ma_frame.iloc[-1].to_dict()
+    fresh = matrix.last_bar is None
+    if fresh:
+        past = prices.signal_frame(panel).dropna().iloc[-PRIME_BARS - 1:-1]
+        matrix.prime(past, ma_frame.reindex(past.index))
+    raised, cleared = matrix.update(metrics, sp_ma_by_window, panel["^GSPC"].dropna().index[-1])
+    # A fresh state reports everything already active, like the default profile does
+    raised = matrix.active if fresh else raised
+    raised, cleared = matrix.hits(raised), matrix.hits(cleared)
+    results = {}
+    for profile in matrix.profiles:
+        if profile.name in raised or profile.name in cleared:
+            sp_ma = sp_ma_by_window[profile.ma_window]
+            msgs = [profile_message(rules.RULES_BY_ID[r], metrics, sp_ma, profile.ma_window) for r in raised.get(profile.name, [])]
+            results[profile.name] = (msgs, cleared.get(profile.name, []))
+    return results
 
-    t10, t3m = fetch_yield_curve()
-    if t10 < t3m:
-        alerts.append(f"Yield curve inversion: 10Y={t10:.2f}% < 3M={t3m:.2f}%")
+def notify_subscribers(matrix, results):
+    for profile in matrix.profiles:
+        msgs = results.get(profile.name, ([], []))[0]
+        if msgs:
+            get_dispatcher().notify(ALERT_SUBJECT, msgs, profile.recipients)
 
-    return alerts
+def load_subscriber_matrix(path):
+    matrix = subs.ProfileMatrix(subs.load_profiles(path, available=LIVE_METRICS))
+    # Polls only sync recent bars; backfill once to the longest moving average any profile uses
+    prices.get_store().sync(["^GSPC"], period=ma_history_period(matrix.windows))
+    matrix.load_state()
+    return matrix
 
 # ----------- Email Notification -----------
+ALERT_SUBJECT = '🚨 Market Alert: Defensive Portfolio Transition Signal'
+_dispatcher = None
+
+
+def get_dispatcher():
+    """Shared background dispatcher for SMTP / webhook channels configured in the environment."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = NotificationDispatcher.from_env()
+    return _dispatcher
+
+
 def send_email(alerts):
-    msg = EmailMessage()
-    msg['Subject'] = '🚨 Market Alert: Defensive Portfolio Transition Signal'
-    msg['From'] = EMAIL_ADDRESS
-    msg['To'] = TO_EMAIL
+    """Queue alerts for delivery; returns immediately, the dispatcher batches and sends them."""
+    get_dispatcher().notify(ALERT_SUBJECT, alerts)
 
-    msg.set_content("\n".join(alerts))
+# ----------- Daemon Mode -----------
+def run_daemon(interval=POLL_INTERVAL, subscribers_path=None):
+    """Poll continuously, keeping indicator and alert state in memory and emailing only when an alert fires."""
+    trend = SP500Trend.load()
+    machine = AlertStateMachine.load(ALERT_STATE_PATH, rules.rules_for(MONITOR_RULES))
+    matrix = load_subscriber_matrix(subscribers_path) if subscribers_path else None
+    period = "1y"  # The first poll primes the trend; later polls only need the latest bars
+    print(f"Market signal monitor polling every {interval}s (Ctrl+C to stop)...")
+    while True:
+        started = time.monotonic()
+        try:
+            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if matrix is not None:
+                results = evaluate_subscribers(matrix, period=period, trend=trend)
+                report_subscribers(results, now)
+                notify_subscribers(matrix, results)
+                matrix.save_state()
+            else:
+                raised, cleared = evaluate_alerts(machine, period=period, trend=trend)
+                if raised:
+                    print(f"[{now}] New signals:", raised)
+                    send_email(raised)
+                for rule_id in cleared:
+                    print(f"[{now}] Cleared: {rules.RULES_BY_ID[rule_id].label}")
+                machine.save(ALERT_STATE_PATH)
+            period = "5d"
+            trend.save()
+        except Exception as e:
+            print(f"Poll failed: {e}")
+        time.sleep(max(0, interval - (time.monotonic() - started)))
 
-    context = ssl.create_default_context()
-    with smtplib.SMTP_SSL('smtp.gmail.com', 465, context=context) as smtp:
-        smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-        smtp.send_message(msg)
+def report_subscribers(results, now=None):
+    prefix = f"[{now}] " if now else ""
+    for name, (raised, cleared) in results.items():
+        for msg in raised:
+            print(f"{prefix}{name}: {msg}")
+        for rule_id in cleared:
+            print(f"{prefix}{name}: cleared {rules.RULES_BY_ID[rule_id].label}")
 
 # ----------- Main Entry Point -----------
 if __name__ == "__main__":
-    print(f"Running market signal monitor at {datetime.datetime.now()}...")
-    signals = evaluate_conditions()
-    if signals:
-        print("Signals detected:", signals)
-        send_email(signals)
+    parser = argparse.ArgumentParser(description="Market signal monitor")
+    parser.add_argument("--daemon", action="store_true", help="Keep running and alert on signal changes")
+    parser.add_argument("--interval", type=int, default=POLL_INTERVAL, help="Seconds between polls in daemon mode")
+    parser.add_argument("--subscribers", nargs="?", const=subs.SUBSCRIBERS_PATH, default=None,
+                        help="Alert every profile in a subscriber config (JSON) instead of the single default profile")
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args.interval, args.subscribers)
+    elif args.subscribers:
+        print(f"Running market signal monitor for subscribers at {datetime.datetime.now()}...")
+        matrix = load_subscriber_matrix(args.subscribers)
+        results = evaluate_subscribers(matrix)
+        matrix.save_state()
+        report_subscribers(results)
+        notify_subscribers(matrix, results)
+        if results:
+            get_dispatcher().flush(timeout=120)
+        else:
+            print("No new alerts triggered.")
     else:
-        print("No alerts triggered.")
+        print(f"Running market signal monitor at {datetime.datetime.now()}...")
+        signals, cleared = evaluate_alerts()
+        for rule_id in cleared:
+            print(f"Cleared: {rules.RULES_BY_ID[rule_id].label}")
+        if signals:
+            print("Signals detected:", signals)
+            send_email(signals)
+            get_dispatcher().flush(timeout=120)
+        else:
+            print("No new alerts triggered.")
@@ -1,21 +1,9 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-import altair as alt
-import streamlit.components.v1 as components
-from fredapi import Fred
-
-from strategies import (
-    plan_2025_dynamics,
-    plan_tax_defensive,
-    plan_reentry,
-    plan_debt_crisis,
-    plan_china_selloff,
-    plan_trade_shift,
-    plan_50_30_20,
-    market_dashboard,
-    enhancement_actions
-)
+
+import strategies
+from market_data import metrics, snapshot
+from signals import history, rules
 
 st.set_page_config(page_title="📊 Market Signals Dashboard", layout="wide")
 st.title("📊 Harrell Family Strategic Signal Monitor")
@@ -24,38 +12,48 @@ FRED_API_KEY = st.secrets.get("FRED_API_KEY")
 if not FRED_API_KEY:
     st.error("❌ Missing FRED_API_KEY in Streamlit secrets.")
     st.stop()
-fred = Fred(api_key=FRED_API_KEY)
-
-plan = st.selectbox(
-    "Select Strategic Plan to Monitor:",
-    [
-        "📑 Portfolio Enhancement Actions per Strategy",
-        "📊 Market Dashboard",
-        "📘 2025 Market Dynamics Plan",
-        "📙 Tax-Sensitive Defensive Plan",
-        "📗 Re-entry Plan",
-        "🇺🇸 U.S.A. Debt Crisis Plan",
-        "🇨🇳 China Treasury Selloff Monitor",
-        "🌍 Trade Regime Shift Tracker",
-        "📐 50/30/20 Plan"
-    ]
-)
-
-if plan == "📑 Portfolio Enhancement Actions per Strategy":
-    enhancement_actions.render()
-elif plan == "📊 Market Dashboard":
-    market_dashboard.render()
-elif plan == "📘 2025 Market Dynamics Plan":
-    plan_2025_dynamics.render()
-elif plan == "📙 Tax-Sensitive Defensive Plan":
-    plan_tax_defensive.render()
-elif plan == "📗 Re-entry Plan":
-    plan_reentry.render()
-elif plan == "🇺🇸 U.S.A. Debt Crisis Plan":
-    plan_debt_crisis.render()
-elif plan == "🇨🇳 China Treasury Selloff Monitor":
-    plan_china_selloff.render()
-elif plan == "🌍 Trade Regime Shift Tracker":
-    plan_trade_shift.render()
-elif plan == "📐 50/30/20 Plan":
-    plan_50_30_20.render()
+metrics.configure_fred(FRED_API_KEY)
+
+# --- Signal Snapshot (built in the background; pages never fetch) ---
+@st.cache_resource
+def get_refresher():
+    return snapshot.start_refresher()
+
+refresher = get_refresher()
+
+st.sidebar.title("📡 Market & Macro Data")
+if st.sidebar.button("🔁 Refresh Data Now"):
+    refresher.refresh_now()
+    st.sidebar.info("Refresh requested — new data will appear on the next rerun.")
+
+latest = refresher.latest(wait=30)
+if latest is None:
+    st.info("⏳ Building the first market snapshot — reload in a moment.")
+    if refresher.last_error:
+        st.caption(f"Last refresh error: {refresher.last_error}")
+    st.stop()
+st.sidebar.caption(f"Snapshot built {latest.built_at:%Y-%m-%d %H:%M}")
+
+# Only the selected plan's module (and its heavy imports, e.g. altair) is loaded
+plan = st.selectbox("Select Strategic Plan to Monitor:", list(strategies.PLANS))
+strategies.render(plan, latest)
+
+# --- Signal History (persisted by every monitor and snapshot run) ---
+with st.expander("📜 Signal History"):
+    summary = history.get_history().summary()
+    if summary.empty:
+        st.caption("No evaluations recorded yet.")
+    else:
+        labels = {rule.rule_id: rule.label.split(" (")[0] for rule in rules.RULES}
+        st.dataframe(
+            pd.DataFrame({
+                "Rule": summary["rule_id"].map(labels).fillna(summary["rule_id"]),
+                "Triggered": summary["triggered"],
+                "In Current State Since": summary["streak_since"],
+                "Consecutive Checks": summary["streak_runs"],
+                "Last Triggered": summary["last_triggered"],
+                "Triggers (90d)": summary["recent_triggers"],
+                "Last Checked": summary["last_ts"],
+            }),
+            use_container_width=True,
+        )
@@ -1,10 +1,9 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import yfinance as yf
-import pandas as pd
 import altair as alt
 from datetime import datetime
-from fredapi import Fred
+
+from market_data import cache, metrics, prices
 
 # --- Securely load FRED API key ---
 FRED_API_KEY = st.secrets.get("FRED_API_KEY")
@@ -12,7 +11,7 @@ if not FRED_API_KEY:
     st.error("❌ Missing FRED_API_KEY in Streamlit secrets.")
     st.stop()
 
-fred = Fred(api_key=FRED_API_KEY)
+fred_cache = metrics.configure_fred(FRED_API_KEY)
 
 st.set_page_config(page_title="📊 Market Signals Dashboard", layout="wide")
 st.title("📊 Harrell Family Strategic Signal Monitor")
@@ -33,43 +32,44 @@ plan = st.selectbox(
     ]
 )
 
+# --- Refresh Control ---
+st.sidebar.title("📡 Market & Macro Data")
+if st.sidebar.button("🔁 Refresh Data Now"):
+    metrics.refresh_now()  # Re-requests FRED past its release calendar, then drops every cached result
+
 # --- Signal & Metric Calculators ---
-def get_price(ticker, period='6mo'):
-    try:
-        return yf.download(ticker, period=period)['Close']
-    except:
-        return pd.Series()
+@cache.cached("prices")
+def get_signal_panel():
+    return prices.fetch_panel(prices.SIGNAL_TICKERS, period="1y")
+
+def get_vix(panel):
+    return prices.get_vix(panel)
 
-def get_vix():
-    return get_price("^VIX", period="5d").iloc[-1]
+def get_sp500_vs_ma(panel):
+    return prices.get_sp500_vs_ma(panel)
 
-def get_sp500_vs_ma():
-    data = get_price("^GSPC", period="1y")
-    current = data.iloc[-1]
-    ma_200 = data.rolling(200).mean().dropna().iloc[-1]
-    return current, ma_200
+def get_yield_curve(panel):
+    return prices.get_yield_curve(panel)
 
-def get_yield_curve():
-    t10 = get_price("^TNX", period="5d").iloc[-1] / 100
-    t3m = get_price("^IRX", period="5d").iloc[-1] / 100
-    return t10, t3m
+@cache.cached("fred")
+def _fetch_fred_series(series_id, frequency=None):
+    value = fred_cache.latest_value(series_id, frequency)
+    if value is None:
+        raise LookupError(f"No FRED observations for {series_id}")
+    return value
 
-def fetch_fred_series(series_id, frequency="m"):
+def fetch_fred_series(series_id, frequency=None):
+    # Failures raise out of the cached fetch, so they are retried next run instead of cached for the FRED TTL
     try:
-        data = fred.get_series(series_id)
-        df = data.to_frame(name="value").reset_index()
-        df.columns = ["Date", "Value"]
-        df = df.sort_values("Date")
-        if frequency == "q":
-            df = df[df["Date"].dt.month.isin([3, 6, 9, 12])]
-        return df.iloc[-1]["Value"]
-    except:
+        return _fetch_fred_series(series_id, frequency)
+    except Exception:
         return None
 
 # Fetch common metrics
-vix = get_vix()
-sp_price, sp_ma = get_sp500_vs_ma()
-t10, t3m = get_yield_curve()
+panel = get_signal_panel()
+vix = get_vix(panel)
+sp_price, sp_ma = get_sp500_vs_ma(panel)
+t10, t3m = get_yield_curve(panel)
 cpi = fetch_fred_series("CPIAUCSL")
 oas = fetch_fred_series("BAMLH0A0HYM2")
 gdp = fetch_fred_series("GDP", frequency="q")
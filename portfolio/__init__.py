@@ -0,0 +1 @@
+# Portfolio holdings, rebalancing and tax lots
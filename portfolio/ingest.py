@@ -0,0 +1,229 @@
+import io
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+ASSET_CLASSES = ("Stocks", "Bonds", "Private")
+UNCLASSIFIED = "Unclassified"
+BUCKETS = ASSET_CLASSES + (UNCLASSIFIED,)
+CHUNK_ROWS = 100_000
+MAX_UNCLASSIFIED_REPORTED = 20
+MAX_SKIPPED_REPORTED = 20
+
+# Money market / sweep funds: counted toward Bonds, and spendable like cash when rebalancing
+CASH_TICKERS = ("SPAXX", "FDRXX", "VMFXX", "SWVXX", "CASH")
+
+# Ticker -> 50/30/20 bucket
+ASSET_CLASS_TICKERS = {
+    "Stocks": (
+        "VTI", "VOO", "SPY", "IVV", "ITOT", "SCHB", "SCHX", "QQQ", "VUG", "VTV", "IWM", "IWF", "IWD", "VB", "VO",
+        "VXUS", "VEA", "VWO", "IEFA", "IEMG", "EFA", "EEM", "SCHF", "SCHD", "VIG", "DIA", "RSP", "FXAIX", "FSKAX",
+        "FZROX", "FTIHX", "FZILX", "VFIAX", "VTSAX", "VTIAX", "SWPPX", "SWTSX",
+        "AAPL", "MSFT", "AMZN", "GOOGL", "GOOG", "META", "NVDA", "TSLA", "BRK.B", "JPM", "JNJ", "V", "XOM", "PG",
+    ),
+    "Bonds": (
+        "BND", "AGG", "SCHZ", "IUSB", "BNDX", "TLT", "IEF", "SHY", "GOVT", "VGSH", "VGIT", "VGLT", "TIP", "SCHP",
+        "VTIP", "STIP", "LQD", "VCIT", "VCSH", "HYG", "JNK", "MUB", "VTEB", "BIL", "SGOV", "SHV", "FXNAX", "VBTLX",
+        "VBMFX", "SWAGX",
+    ) + CASH_TICKERS,
+    "Private": (
+        "VNQ", "SCHH", "IYR", "XLRE", "VNQI", "PSP", "BIZD", "ARCC", "MAIN", "BX", "KKR", "APO", "GLD", "IAU", "DBC",
+    ),
+}
+
+# Precomputed lookup index: ticker -> bucket code, resolved per chunk with one get_indexer call
+TICKER_INDEX = pd.Index([ticker for tickers in ASSET_CLASS_TICKERS.values() for ticker in tickers])
+TICKER_CODES = np.array(
+    [BUCKETS.index(asset_class) for asset_class, tickers in ASSET_CLASS_TICKERS.items() for _ in tickers]
+)
+CLASS_INDEX = pd.Index([asset_class.lower() for asset_class in BUCKETS])
+
+# Brokerage export headers, lower-cased -> canonical column
+COLUMN_ALIASES = {
+    "ticker": "Ticker", "symbol": "Ticker",
+    "asset class": "Asset Class", "asset_class": "Asset Class", "class": "Asset Class",
+    "amount": "Amount", "market value": "Amount", "current value": "Amount", "value": "Amount",
+    "account": "Account", "account name": "Account", "account number": "Account",
+    "account type": "Account Type", "registration": "Account Type",
+    "quantity": "Quantity", "shares": "Quantity",
+    "cost basis": "Cost Basis", "cost basis total": "Cost Basis", "cost": "Cost Basis",
+    "acquired": "Acquired", "date acquired": "Acquired", "acquisition date": "Acquired", "open date": "Acquired",
+}
+NUMERIC_COLUMNS = ("Amount", "Quantity", "Cost Basis")
+
+
+@dataclass(frozen=True)
+class HoldingsSummary:
+    allocation: pd.DataFrame  # Asset Class, Amount: one row per non-empty bucket
+    rows: int
+    unclassified: pd.Series  # Largest unmapped tickers by amount
+    skipped_rows: int  # Rows dropped because a numeric cell could not be parsed
+    skipped: pd.DataFrame  # First of those rows as exported, indexed by CSV line number
+
+
+def resolve_columns(header, required=None):
+    """Map export headers to canonical names; `required` replaces the default amount + ticker/class check."""
+    columns = {}
+    for name in header:
+        canonical = COLUMN_ALIASES.get(str(name).strip().lower())
+        if canonical and canonical not in columns.values():
+            columns[name] = canonical
+    if required is None and ("Amount" not in columns.values() or not {"Ticker", "Asset Class"} & set(columns.values())):
+        raise ValueError("Holdings CSV needs an amount/market value column plus a ticker or asset class column")
+    missing = set(required or ()) - set(columns.values())
+    if missing:
+        raise ValueError(f"Holdings CSV is missing required columns: {', '.join(sorted(missing))}")
+    return columns
+
+
+def parse_amounts(values):
+    """Parse "$1,234.50" / "(12.00)" cells; blank or "--" cells are 0.0, anything else unparseable is NaN."""
+    cleaned = values.str.replace(r"[$,\s]", "", regex=True).str.replace(r"^\((.*)\)$", r"-\1", regex=True)
+    blank = cleaned.fillna("").str.fullmatch(r"-*")
+    return pd.to_numeric(cleaned, errors="coerce").mask(blank, 0.0).to_numpy(float)
+
+
+def count_lines(source):
+    """Newlines in a seekable buffer, counted block by block; the row total that parse progress is measured against."""
+    lines = 0
+    while block := source.read(1 << 20):
+        lines += block.count(b"\n" if isinstance(block, bytes) else "\n")
+    source.seek(0)
+    return lines
+
+
+def report_skipped(rows):
+    lines = ", ".join(str(line) for line in rows.index[:MAX_SKIPPED_REPORTED])
+    print(f"Skipped {len(rows)} holdings rows with unparseable numbers (CSV lines {lines})")
+
+
+def bucket_codes(chunk):
+    """Bucket code per row: an explicit asset class column wins, then the ticker index, else Unclassified."""
+    codes = np.full(len(chunk), BUCKETS.index(UNCLASSIFIED))
+    if "Ticker" in chunk:
+        positions = TICKER_INDEX.get_indexer(chunk["Ticker"])
+        codes = np.where(positions >= 0, TICKER_CODES[positions], codes)
+    if "Asset Class" in chunk:
+        positions = CLASS_INDEX.get_indexer(chunk["Asset Class"].fillna("").str.strip().str.lower())
+        codes = np.where(positions >= 0, positions, codes)
+    return codes
+
+
+def iter_holdings(source, chunksize=CHUNK_ROWS, progress=None, required=None, on_skipped=report_skipped):
+    """Yield normalized chunks of a holdings CSV: canonical column names, numeric amounts and a Bucket code.
+
+    Every column is read as a string and parsed per chunk, so memory stays bounded by `chunksize`
+    whatever the file size; `progress(fraction)` is called after each chunk with the share of rows parsed.
+    Rows with an unparseable numeric cell are dropped and passed, as exported and indexed by CSV line,
+    to `on_skipped`.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter_holdings(f, chunksize, progress, required, on_skipped)
+        return
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    columns = resolve_columns(pd.read_csv(source, nrows=0).columns, required)
+    source.seek(0)
+    total = max(count_lines(source) - 1, 1) if progress else None  # Less the header line
+
+    parsed = 0
+    reader = pd.read_csv(source, usecols=list(columns), dtype={name: "string" for name in columns}, chunksize=chunksize)
+    with reader:
+        for chunk in reader:
+            parsed += len(chunk)
+            chunk = chunk.rename(columns=columns)
+            numbers = {name: parse_amounts(chunk[name]) for name in NUMERIC_COLUMNS if name in chunk}
+            invalid = np.logical_or.reduce([np.isnan(values) for values in numbers.values()])
+            if invalid.any():
+                skipped = chunk[invalid]
+                skipped.index = pd.Index(skipped.index + 2, name="Line")  # 1-based, after the header
+                on_skipped(skipped.rename(columns={v: k for k, v in columns.items()}))
+                chunk = chunk[~invalid].copy()
+                numbers = {name: values[~invalid] for name, values in numbers.items()}
+            for name, values in numbers.items():
+                chunk[name] = values
+            if "Ticker" in chunk:
+                chunk["Ticker"] = chunk["Ticker"].fillna("").str.strip().str.upper()
+            if "Acquired" in chunk:
+                chunk["Acquired"] = pd.to_datetime(chunk["Acquired"], format="mixed", errors="coerce")
+            chunk["Bucket"] = bucket_codes(chunk)
+            yield chunk
+            if progress:
+                progress(min(parsed / total, 1.0))
+
+
+def stream_holdings(source, chunksize=CHUNK_ROWS, progress=None):
+    """Aggregate a holdings CSV (pre-aggregated or lot-level) into 50/30/20 buckets, chunk by chunk."""
+    totals = np.zeros(len(BUCKETS))
+    unclassified = pd.Series(dtype=float)
+    rows = skipped_rows = 0
+    skipped = []
+
+    def skip(bad):
+        nonlocal skipped_rows
+        if skipped_rows < MAX_SKIPPED_REPORTED:
+            skipped.append(bad.head(MAX_SKIPPED_REPORTED - skipped_rows))
+        skipped_rows += len(bad)
+
+    for chunk in iter_holdings(source, chunksize, progress, on_skipped=skip):
+        amounts = chunk["Amount"].to_numpy(float)
+        codes = chunk["Bucket"].to_numpy()
+        totals += np.bincount(codes, weights=amounts, minlength=len(BUCKETS))
+        rows += len(chunk)
+
+        missing = codes == BUCKETS.index(UNCLASSIFIED)
+        if missing.any() and "Ticker" in chunk:
+            by_ticker = pd.Series(amounts[missing]).groupby(chunk["Ticker"].to_numpy()[missing]).sum()
+            unclassified = unclassified.add(by_ticker, fill_value=0.0)
+
+    allocation = pd.DataFrame({"Asset Class": BUCKETS, "Amount": totals})
+    allocation = allocation[allocation["Amount"] != 0].reset_index(drop=True)
+    unclassified = unclassified.sort_values(ascending=False).head(MAX_UNCLASSIFIED_REPORTED)
+    skipped = pd.concat(skipped) if skipped else pd.DataFrame(index=pd.Index([], name="Line"))
+    return HoldingsSummary(allocation, rows, unclassified, skipped_rows, skipped)
+
+
+def read_positions(source, chunksize=CHUNK_ROWS, progress=None, on_skipped=report_skipped):
+    """Collapse a lot-level export to one row per (Account, Ticker), aggregating chunk by chunk.
+
+    Columns: Account, Ticker, Asset Class, Quantity, Amount, Cost Basis (NaN when not exported),
+    plus Account Type when the export has it.
+    """
+    keys = ["Account", "Ticker"]
+    parts = []
+    for chunk in iter_holdings(source, chunksize, progress, ("Ticker", "Amount"), on_skipped):
+        if "Account" not in chunk:
+            chunk["Account"] = "Portfolio"
+        if "Quantity" not in chunk:
+            chunk["Quantity"] = np.nan
+        if "Cost Basis" not in chunk:
+            chunk["Cost Basis"] = np.nan
+        if "Account Type" not in chunk:
+            chunk["Account Type"] = ""
+        chunk["Account"] = chunk["Account"].fillna("")
+        sums = chunk.groupby(keys, sort=False)[["Quantity", "Amount", "Cost Basis"]].sum(min_count=1)
+        firsts = chunk.groupby(keys, sort=False)[["Bucket", "Account Type"]].first()
+        parts.append(sums.join(firsts))
+    if not parts:
+        return pd.DataFrame(columns=keys + ["Asset Class", "Quantity", "Amount", "Cost Basis", "Account Type"])
+    combined = pd.concat(parts)
+    grouped = combined.groupby(level=keys, sort=False)
+    positions = grouped[["Quantity", "Amount", "Cost Basis"]].sum(min_count=1)
+    positions = positions.join(grouped[["Bucket", "Account Type"]].first()).reset_index()
+    positions.insert(2, "Asset Class", np.array(BUCKETS)[positions.pop("Bucket").to_numpy(int)])
+    return positions
+
+
+def read_lots(source, chunksize=CHUNK_ROWS, progress=None, on_skipped=report_skipped):
+    """Lot-level rows (Account, Ticker, Quantity, Cost Basis, Acquired, and Amount/Account Type when exported)."""
+    required = ("Ticker", "Quantity", "Cost Basis", "Acquired")
+    chunks = list(iter_holdings(source, chunksize, progress, required, on_skipped))
+    lots = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["Ticker", "Quantity"])
+    for name, default in (("Account", "Portfolio"), ("Account Type", ""), ("Amount", np.nan)):
+        if name not in lots:
+            lots[name] = default
+    lots["Account"] = lots["Account"].fillna("")
+    return lots.drop(columns=["Bucket", "Asset Class"], errors="ignore")
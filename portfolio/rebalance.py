@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from portfolio.ingest import ASSET_CLASSES, CASH_TICKERS
+
+TARGET_ALLOC = {"Stocks": 50, "Bonds": 30, "Private": 20}
+TOLERANCE = 5.0  # Percentage points either side of target
+BUFFER = 1.0  # Land this far inside the band so lot rounding and drift don't immediately re-trigger
+MIN_TRADE = 100.0  # Smaller buys are left as cash
+# Trades in whole shares need a price from the export; the rest (cash, funds the account doesn't hold yet)
+# are dollar-amount orders whose share count is left to the broker
+ORDER_SHARES, ORDER_DOLLARS = "Shares", "Dollar amount"
+DEFAULT_FUNDS = {"Stocks": "VTI", "Bonds": "BND", "Private": "VNQ"}
+# Account name/type words that mark IRAs, workplace plans, HSAs and 529s
+TAX_ADVANTAGED_PATTERN = r"\b(?:ira|roth|401\(?k\)?|403\(?b\)?|457|hsa|529|sep|simple|tsp)\b"
+
+
+@dataclass(frozen=True)
+class RebalancePlan:
+    trades: pd.DataFrame  # Account, Ticker, Asset Class, Action, Order, Shares, Amount
+    allocation: pd.DataFrame  # Asset Class, Current, After, Current %, After %, Target %
+    turnover: float  # Dollars sold
+
+
+def is_tax_advantaged(positions):
+    text = (positions["Account Type"].fillna("") + " " + positions["Account"].fillna("")).str.lower()
+    return text.str.contains(TAX_ADVANTAGED_PATTERN, regex=True).to_numpy(bool)
+
+
+def fill(room, need):
+    """Take up to `need` from `room` in order (one group): the cumulative-sum form of a greedy fill."""
+    before = np.cumsum(room) - room
+    return np.clip(need - before, 0, room)
+
+
+def bucket_trades(amounts, targets, tolerance=TOLERANCE, buffer=BUFFER):
+    """Minimal-turnover dollar change per bucket that lands every bucket inside target ± band.
+
+    Each bucket first moves to the nearest band edge; whichever side (buys or sells) falls short
+    is topped up from the buckets with the most room, so sells always equal buys.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    weights = np.asarray(targets, dtype=float) / 100
+    total = amounts.sum()
+    band = max(tolerance - buffer, 0.0) / 100
+    low, high = np.clip(weights - band, 0, 1) * total, np.clip(weights + band, 0, 1) * total
+    moved = np.clip(amounts, low, high)
+    imbalance = moved.sum() - total
+    if imbalance > 0:
+        # More to buy than to sell: trim further from the buckets furthest above target
+        order = np.argsort(-(moved / total - weights), kind="stable")
+        moved[order] -= fill((moved - low)[order], imbalance)
+    elif imbalance < 0:
+        order = np.argsort(moved / total - weights, kind="stable")
+        moved[order] += fill((high - moved)[order], -imbalance)
+    return moved - amounts
+
+
+def plan_rebalance(positions, target_alloc=TARGET_ALLOC, tolerance=TOLERANCE, buffer=BUFFER, min_trade=MIN_TRADE):
+    """Trade list that brings the target buckets inside tolerance with minimal turnover.
+
+    Sales come from cash first, then tax-advantaged accounts, then taxable positions with the
+    smallest unrealized gain; proceeds are reinvested in the same account (no cash moves between
+    accounts), in whole shares where the price is known. Unclassified positions are left alone.
+    """
+    classes = [c for c in ASSET_CLASSES if c in target_alloc]
+    positions = positions[positions["Asset Class"].isin(classes) & (positions["Amount"] > 0)].reset_index(drop=True)
+    bucket = pd.Categorical(positions["Asset Class"], categories=classes).codes
+    amount = positions["Amount"].to_numpy(float)
+    current = np.bincount(bucket, weights=amount, minlength=len(classes))
+    targets = np.array([target_alloc[c] for c in classes], dtype=float)
+    delta = bucket_trades(current, targets, tolerance, buffer) if current.sum() > 0 else np.zeros(len(classes))
+
+    quantity = positions["Quantity"].to_numpy(float)
+    price = np.where(quantity > 0, amount / np.where(quantity > 0, quantity, 1), np.nan)
+    cash = positions["Ticker"].isin(CASH_TICKERS).to_numpy()
+    sheltered = is_tax_advantaged(positions)
+    basis = positions["Cost Basis"].to_numpy(float)
+    gain = np.where(np.isnan(basis), 0.0, (amount - basis) / np.where(amount > 0, amount, 1))
+
+    # --- Sells: one lexsort, then a per-bucket cumulative fill ---
+    order = np.lexsort((gain, ~sheltered, ~cash, bucket))
+    sorted_bucket, sorted_amount = bucket[order], amount[order]
+    cum = pd.Series(sorted_amount).groupby(sorted_bucket).cumsum().to_numpy()
+    need = np.clip(-delta, 0, None)[sorted_bucket]
+    take = np.clip(need - (cum - sorted_amount), 0, sorted_amount)
+    sell = np.zeros(len(positions))
+    sell[order] = take
+    whole = ~cash & ~np.isnan(price)
+    sell_shares = np.where(whole, np.minimum(np.ceil(sell / np.where(whole, price, 1)), quantity), np.nan)
+    sell = np.where(whole, sell_shares * np.nan_to_num(price), sell)
+
+    # --- Buys: route each account's proceeds to underweight buckets without crossing accounts ---
+    accounts, account_code = np.unique(positions["Account"].to_numpy(str), return_inverse=True)
+    funds = np.bincount(account_code, weights=sell, minlength=len(accounts))
+    account_sheltered = np.bincount(account_code, weights=sheltered, minlength=len(accounts)) > 0
+    account_order = np.lexsort((-funds, ~account_sheltered))
+    buy_need = np.clip(delta, 0, None)
+    if buy_need.sum() > 0:
+        buy_need *= funds.sum() / buy_need.sum()
+    funds_high = np.cumsum(funds[account_order])
+    need_high = np.cumsum(buy_need)
+    overlap = np.minimum(funds_high[:, None], need_high[None, :]) - np.maximum(
+        (funds_high - funds[account_order])[:, None], (need_high - buy_need)[None, :]
+    )
+    buys = np.zeros((len(accounts), len(classes)))
+    buys[account_order] = np.clip(overlap, 0, None)
+
+    trades = [_sell_trades(positions, sell, sell_shares)]
+    trades.append(_buy_trades(positions, price, cash, accounts, classes, buys, min_trade))
+    trades = pd.concat(trades, ignore_index=True)
+
+    after = current.copy()
+    np.add.at(after, pd.Categorical(trades["Asset Class"], categories=classes).codes,
+              np.where(trades["Action"] == "Buy", trades["Amount"], -trades["Amount"]))
+    allocation = pd.DataFrame({
+        "Asset Class": classes,
+        "Current": current,
+        "After": after,
+        "Current %": current / current.sum() * 100 if current.sum() else 0.0,
+        "After %": after / after.sum() * 100 if after.sum() else 0.0,
+        "Target %": targets,
+    })
+    return RebalancePlan(trades, allocation, float(sell.sum()))
+
+
+def _sell_trades(positions, sell, shares):
+    mask = sell > 0
+    return pd.DataFrame({
+        "Account": positions["Account"].to_numpy()[mask],
+        "Ticker": positions["Ticker"].to_numpy()[mask],
+        "Asset Class": positions["Asset Class"].to_numpy()[mask],
+        "Action": "Sell",
+        "Order": np.where(np.isnan(shares[mask]), ORDER_DOLLARS, ORDER_SHARES),
+        "Shares": shares[mask],
+        "Amount": sell[mask],
+    })
+
+
+def _buy_trades(positions, price, cash, accounts, classes, buys, min_trade):
+    """Buy the account's largest existing holding in each bucket, else the bucket's default fund."""
+    held = positions.assign(Price=price)[~cash].sort_values("Amount", ascending=False)
+    held = held.drop_duplicates(["Account", "Asset Class"]).set_index(["Account", "Asset Class"])
+    quotes = positions.assign(Price=price).dropna(subset=["Price"]).drop_duplicates("Ticker").set_index("Ticker")["Price"]
+
+    rows, cols = np.nonzero(buys >= min_trade)
+    keys = pd.MultiIndex.from_arrays([accounts[rows], np.array(classes)[cols]])
+    tickers = held["Ticker"].reindex(keys).to_numpy(object)
+    defaults = np.array([DEFAULT_FUNDS.get(classes[c]) for c in cols], dtype=object)
+    tickers = np.where(pd.isna(tickers), defaults, tickers)
+    amount = buys[rows, cols]
+    unit = quotes.reindex(tickers).to_numpy(float)
+    shares = np.floor(amount / unit)
+    amount = np.where(np.isnan(unit), amount, shares * unit)
+    return pd.DataFrame({
+        "Account": accounts[rows],
+        "Ticker": tickers,
+        "Asset Class": np.array(classes)[cols],
+        "Action": "Buy",
+        "Order": np.where(np.isnan(shares), ORDER_DOLLARS, ORDER_SHARES),
+        "Shares": shares,
+        "Amount": amount,
+    })
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from portfolio.ingest import CASH_TICKERS
+from portfolio.rebalance import is_tax_advantaged
+
+WASH_SALE_DAYS = 30
+SHORT_TERM_RATE = 0.35  # Ordinary income bracket applied to short-term losses
+LONG_TERM_RATE = 0.15
+QUOTE_PERIOD = "5d"
+
+
+@dataclass(frozen=True)
+class HarvestScan:
+    lots: pd.DataFrame  # Every lot marked to market, with holding period and wash-sale columns
+    candidates: pd.DataFrame  # Taxable loss lots ranked by tax benefit
+    missing_quotes: tuple  # Tickers priced from the export (or skipped) because no quote came back
+
+
+def quote_tickers(lots):
+    return tuple(sorted(set(lots["Ticker"]) - set(CASH_TICKERS) - {""}))
+
+
+def mark_to_market(lots, quotes):
+    """Price per lot from the quote map; fall back to the export's own market value where unquoted."""
+    price = pd.Series(quotes, dtype=float).reindex(lots["Ticker"]).to_numpy()
+    price = np.where(lots["Ticker"].isin(CASH_TICKERS).to_numpy(), 1.0, price)
+    quantity = lots["Quantity"].to_numpy(float)
+    exported = lots["Amount"].to_numpy(float)
+    value = np.where(np.isnan(price), exported, quantity * price)
+    return value, np.isnan(price)
+
+
+def recent_purchases(tickers, acquired, quantity, as_of, days=WASH_SALE_DAYS):
+    """Shares of each row's ticker bought in the `days` before `as_of`, via searchsorted on (ticker, day) keys."""
+    codes, uniques = pd.factorize(tickers)
+    dates = acquired.to_numpy("datetime64[D]")
+    valid = ~np.isnat(dates)
+    span = np.int64(1) << 32  # Day numbers fit comfortably below this
+    keys = np.where(valid, codes.astype("int64") * span + dates.astype("int64"), np.iinfo("int64").max)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    shares = np.concatenate([[0.0], np.cumsum(np.where(valid, quantity, 0.0)[order])])
+
+    today = np.int64(pd.Timestamp(as_of).normalize().value // 86_400_000_000_000)
+    low = np.searchsorted(sorted_keys, codes * span + today - days, side="left")
+    high = np.searchsorted(sorted_keys, codes * span + today, side="right")
+    return shares[high] - shares[low]
+
+
+def scan(lots, quotes, as_of=None, short_term_rate=SHORT_TERM_RATE, long_term_rate=LONG_TERM_RATE):
+    """Mark lots to market and rank taxable loss lots by the tax their loss would offset.
+
+    A lot is long-term once held more than a year. Purchases of the same ticker in any account
+    (IRAs included) during the last 30 days, other than the lot itself, would make part of its
+    loss a wash sale; that share of the loss earns no benefit.
+    """
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    lots = lots.reset_index(drop=True)
+    value, unquoted = mark_to_market(lots, quotes)
+    quantity = lots["Quantity"].to_numpy(float)
+    basis = lots["Cost Basis"].to_numpy(float)
+    acquired = lots["Acquired"]
+
+    gain = value - basis
+    long_term = (acquired < as_of - pd.DateOffset(years=1)).to_numpy()
+    own_recent = ((acquired >= as_of - pd.Timedelta(days=WASH_SALE_DAYS)) & (acquired <= as_of)).to_numpy()
+    recent = recent_purchases(lots["Ticker"], acquired, quantity, as_of) - np.where(own_recent, quantity, 0.0)
+    washed = np.clip(recent / np.where(quantity > 0, quantity, 1), 0, 1)
+    loss = np.clip(-gain, 0, None)
+    rate = np.where(long_term, long_term_rate, short_term_rate)
+    benefit = loss * (1 - washed) * rate
+
+    lots = lots.assign(**{
+        "Market Value": value,
+        "Unrealized Gain": gain,
+        "Term": np.where(long_term, "Long", "Short"),
+        "Days Held": (as_of - acquired).dt.days,
+        "Recent Buys (30d)": recent,
+        "Wash Sale Risk": recent > 0,
+        "Tax Benefit": benefit,
+    })
+    harvestable = (loss > 0) & ~is_tax_advantaged(lots) & ~np.isnan(value) & ~lots["Ticker"].isin(CASH_TICKERS)
+    candidates = lots[harvestable].sort_values("Tax Benefit", ascending=False, kind="stable")
+    missing = tuple(sorted(set(lots["Ticker"][unquoted]) - set(CASH_TICKERS)))
+    return HarvestScan(lots, candidates, missing)
@@ -1,60 +1,79 @@
-import yfinance as yf
+import os
 import datetime
 
+from market_data import prices
+from market_data.store import DATA_DIR
+from signals.alert_state import AlertStateMachine
+from signals import history, rules
+
 # --- Re-entry signal thresholds ---
-REENTRY_VIX_THRESHOLD = 18
+REENTRY_VIX_THRESHOLD = rules.RULES_BY_ID["reentry.vix_lt_18"].threshold
 REENTRY_SP500_MA_RECOVERY = True  # S&P 500 crosses back above 200-day MA
 YIELD_CURVE_NORMALIZATION = True  # 10Y > 3M
+ALERT_STATE_PATH = os.path.join(DATA_DIR, "reentry_alerts.json")
+PRIME_BARS = 10
 
 # --- Helper Functions ---
-def get_price(ticker, period='6mo'):
-    return yf.download(ticker, period=period)['Close']
+def get_panel():
+    return prices.fetch_panel(prices.SIGNAL_TICKERS, period='1y')
 
-def get_vix():
-    return get_price('^VIX').iloc[-1].item()
+def get_vix(panel):
+    return prices.get_vix(panel)
 
-def get_sp500_vs_ma():
-    data = get_price('^GSPC', period='1y')
-    current = data.iloc[-1].item()
-    ma_200 = data.rolling(window=200).mean().dropna().iloc[-1].item()
-    return current, ma_200
+def get_sp500_vs_ma(panel):
+    return prices.get_sp500_vs_ma(panel)
 
-def get_yield_curve():
-    t10 = get_price('^TNX').iloc[-1].item() / 100  # 10-Year Treasury
-    t3m = get_price('^IRX').iloc[-1].item() / 100  # 3-Month Treasury
-    return t10, t3m
+def get_yield_curve(panel):
+    return prices.get_yield_curve(panel)
 
 # --- Signal Evaluation ---
-def evaluate_reentry_conditions():
-    signals = []
+# Message when each rule is met / not met
+REENTRY_MESSAGES = {
+    "reentry.vix_lt_18": ("✅ VIX below 18 — volatility normalized", "❌ VIX still elevated"),
+    "reentry.sp_above_ma": ("✅ S&P 500 above 200-day MA — trend recovery", "❌ S&P 500 still below 200-day MA"),
+    "reentry.curve_normal": ("✅ Yield curve normalized (10Y > 3M)", "❌ Yield curve still inverted"),
+}
 
-    vix = get_vix()
-    if vix < REENTRY_VIX_THRESHOLD:
-        signals.append("✅ VIX below 18 — volatility normalized")
-    else:
-        signals.append("❌ VIX still elevated")
+def collect_metrics(panel=None):
+    panel = get_panel() if panel is None else panel
+    sp_price, sp_ma = get_sp500_vs_ma(panel)
+    t10, t3m = get_yield_curve(panel)
+    return {"vix": get_vix(panel), "sp_price": sp_price, "sp_ma": sp_ma, "t10": t10, "t3m": t3m}
 
-    sp_price, sp_ma = get_sp500_vs_ma()
-    if sp_price > sp_ma:
-        signals.append("✅ S&P 500 above 200-day MA — trend recovery")
-    else:
-        signals.append("❌ S&P 500 still below 200-day MA")
+def update_reentry_state():
+    """Advance the persisted re-entry state machine in memory; conditions stay met until they cross their exit levels.
 
-    t10, t3m = get_yield_curve()
-    if t10 > t3m:
-        signals.append("✅ Yield curve normalized (10Y > 3M)")
-    else:
-        signals.append("❌ Yield curve still inverted")
+    Nothing is written here; the entry point records history and saves the state.
+    """
+    machine = AlertStateMachine.load(ALERT_STATE_PATH, rules.rules_for(rules.REENTRY_RULES))
+    panel = get_panel()
+    if machine.last_bar is None:
+        machine.prime(prices.signal_frame(panel).dropna().iloc[-PRIME_BARS - 1:-1])
+    metrics = collect_metrics(panel)
+    events = machine.update(metrics, panel["^GSPC"].dropna().index[-1])
+    return machine, events, metrics
+
+def reentry_messages(machine):
+    met = set(machine.active_rules())
+    return [REENTRY_MESSAGES[rule_id][0 if rule_id in met else 1] for rule_id in rules.REENTRY_RULES]
 
-    return signals
+def evaluate_reentry_conditions():
+    machine, _, _ = update_reentry_state()
+    return reentry_messages(machine)
 
 # --- Main Execution ---
 if __name__ == "__main__":
     print(f"\n[Re-Entry Signal Monitor] {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    results = evaluate_reentry_conditions()
+    machine, events, metrics = update_reentry_state()
+    history.get_history().record(metrics, machine.rules, source="reentry")
+    machine.save(ALERT_STATE_PATH)
+    results = reentry_messages(machine)
     for line in results:
         print(line)
 
+    for rule_id, change in events:
+        print(f"{'Newly met' if change == 'raised' else 'No longer met'}: {rules.RULES_BY_ID[rule_id].label}")
+
     conditions_met = [line for line in results if line.startswith("✅")]
     print("\nSummary:")
     if len(conditions_met) == 3:
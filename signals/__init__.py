@@ -0,0 +1 @@
+# Signal rules and evaluation
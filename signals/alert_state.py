@@ -0,0 +1,99 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from signals import rules
+
+
+class AlertStateMachine:
+    """Edge-triggered alert state per rule, with enter/exit hysteresis and N-bar confirmation.
+
+    An inactive rule becomes active once its entry condition has held for `confirm_bars`
+    consecutive bars; an active rule clears once the metric has crossed back past
+    `exit_threshold` for the same number of bars. Re-evaluating the same bar (an intraday
+    poll) replaces that bar's observation instead of counting it twice.
+    """
+
+    def __init__(self, rule_list, state=None):
+        self.rules = list(rule_list)
+        self.rule_ids = [rule.rule_id for rule in self.rules]
+        self._enter = np.array([rule.threshold for rule in self.rules], dtype=float)
+        self._exit = np.array(
+            [rule.threshold if rule.exit_threshold is None else rule.exit_threshold for rule in self.rules], dtype=float
+        )
+        self._greater = np.array([rule.op == ">" for rule in self.rules])
+        self._confirm = np.array([rule.confirm_bars for rule in self.rules])
+
+        state = state or {}
+        saved = state.get("rules", {})
+        self.active = np.array([saved.get(r, {}).get("active", False) for r in self.rule_ids])
+        self.streak = np.array([saved.get(r, {}).get("streak", 0) for r in self.rule_ids])
+        self.prev_streak = np.array([saved.get(r, {}).get("prev_streak", 0) for r in self.rule_ids])
+        self.since = [saved.get(r, {}).get("since") for r in self.rule_ids]
+        self.last_bar = state.get("last_bar")
+
+    def update(self, metrics, bar):
+        """Feed one observation for `bar` (its date); returns [(rule_id, "raised" | "cleared"), ...]."""
+        bar = pd.Timestamp(bar).date().isoformat()
+        values = rules.metric_frame(metrics).reindex(columns=[r.metric for r in self.rules]).to_numpy(float)[0]
+        with np.errstate(invalid="ignore"):
+            entering = np.where(self._greater, values > self._enter, values < self._enter)
+            exiting = np.where(self._greater, values < self._exit, values > self._exit)
+        # Count toward the transition away from the current state
+        pending = np.where(self.active, exiting, entering)
+
+        if bar != self.last_bar:
+            self.prev_streak = self.streak
+            self.last_bar = bar
+        self.streak = np.where(pending, self.prev_streak + 1, 0)
+
+        flips = self.streak >= self._confirm
+        events = []
+        for i in np.flatnonzero(flips):
+            self.active[i] = not self.active[i]
+            self.since[i] = bar
+            events.append((self.rule_ids[i], "raised" if self.active[i] else "cleared"))
+        self.streak = np.where(flips, 0, self.streak)
+        self.prev_streak = np.where(flips, 0, self.prev_streak)
+        return events
+
+    def prime(self, history):
+        """Replay a date-indexed frame of past metric rows so confirmation counts start warm."""
+        for bar, row in history.iterrows():
+            self.update(row.to_dict(), bar)
+
+    def active_rules(self):
+        return [rule_id for rule_id, active in zip(self.rule_ids, self.active) if active]
+
+    # --- Persistence ---
+    def to_dict(self):
+        return {
+            "last_bar": self.last_bar,
+            "rules": {
+                rule_id: {
+                    "active": bool(self.active[i]),
+                    "streak": int(self.streak[i]),
+                    "prev_streak": int(self.prev_streak[i]),
+                    "since": self.since[i],
+                }
+                for i, rule_id in enumerate(self.rule_ids)
+            },
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, rule_list):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = None
+        return cls(rule_list, state)
@@ -0,0 +1,138 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from market_data import metrics, prices
+from market_data.store import period_start
+from market_data.fred_cache import PERIOD_LENGTH, RELEASE_LAG_DAYS, SERIES_FREQUENCY
+from signals import rules
+
+HISTORY_PERIOD = "30y"
+FORWARD_HORIZONS = {"1m": 21, "3m": 63, "12m": 252}
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    metrics: pd.DataFrame  # Date x metric, as the rule engine sees it each day
+    triggers: pd.DataFrame  # Date x rule_id booleans
+    stagflation_count: pd.Series  # DEFENSIVE_RULES met per day (stagflation dashboard signal_count)
+    reentry_count: pd.Series  # REENTRY_RULES met per day
+    forward_returns: pd.DataFrame  # S&P 500 return over each horizon starting that day
+
+
+# --- History Assembly ---
+def released(history, series_id):
+    """Re-date observations to when they were published, so backtests never see data early."""
+    frequency = SERIES_FREQUENCY.get(series_id, "m")
+    published = history.index + PERIOD_LENGTH[frequency] + pd.Timedelta(days=RELEASE_LAG_DAYS[frequency])
+    return pd.Series(history.to_numpy(), index=published, name=history.name)
+
+
+def macro_history(fred_cache=None, sync=True):
+    fred_cache = fred_cache or metrics.get_fred_cache()
+    series = {}
+    for name, series_id in metrics.FRED_SERIES.items():
+        if sync:
+            try:
+                fred_cache.refresh(series_id)
+            except Exception:
+                pass
+        series[name] = fred_cache.history(series_id)
+
+    cpi, oas, gdp, lei = series["cpi"], series["oas"], series["gdp"], series["lei"]
+    return {
+        "cpi": released(cpi.pct_change(12, fill_method=None) * 100, metrics.FRED_SERIES["cpi"]),
+        "oas": released(oas * 100, metrics.FRED_SERIES["oas"]),
+        "gdp": released(((gdp / gdp.shift(1)) ** 4 - 1) * 100, metrics.FRED_SERIES["gdp"]),
+        "lei": released(lei, metrics.FRED_SERIES["lei"]),
+    }
+
+
+def sync_history(period=HISTORY_PERIOD, store=None):
+    """Bring the stored signal-ticker history up to `period`: one backfill, then daily deltas."""
+    (store or prices.get_store()).sync(prices.SIGNAL_TICKERS, period=period)
+
+
+def load_history(period=HISTORY_PERIOD, store=None, fred_cache=None, window=prices.SP500_MOVING_AVG_DAYS, sync=True):
+    """Daily metric frame for the full history: market closes plus forward-filled, release-dated FRED series.
+
+    With sync=False nothing is fetched; the frame covers whatever the local stores already hold.
+    """
+    if sync:
+        panel = prices.fetch_panel(prices.SIGNAL_TICKERS, period=period, store=store)
+    else:
+        panel = (store or prices.get_store()).read_close(prices.SIGNAL_TICKERS, start=period_start(period))
+    frame = prices.signal_frame(panel, window)
+    for name, values in macro_history(fred_cache, sync=sync).items():
+        values = values[~values.index.duplicated(keep="last")].dropna()
+        frame[name] = values.reindex(frame.index.union(values.index)).ffill().reindex(frame.index)
+    return frame
+
+
+# --- Backtest ---
+def forward_returns(sp, horizons=FORWARD_HORIZONS):
+    values = sp.to_numpy(dtype=float)
+    out = {}
+    for label, days in horizons.items():
+        ahead = np.full_like(values, np.nan)
+        ahead[:-days] = values[days:]
+        out[label] = ahead / values - 1
+    return pd.DataFrame(out, index=sp.index)
+
+
+def run_backtest(history, plan_rules=rules.RULES):
+    triggers = rules.evaluate(history, plan_rules)
+    # Days before the 200-day MA exists can't evaluate the trend rules
+    triggers = triggers[history["sp_ma"].notna()]
+    history = history.loc[triggers.index]
+    return BacktestResult(
+        metrics=history,
+        triggers=triggers,
+        stagflation_count=triggers.reindex(columns=list(rules.DEFENSIVE_RULES), fill_value=False).sum(axis=1),
+        reentry_count=triggers.reindex(columns=list(rules.REENTRY_RULES), fill_value=False).sum(axis=1),
+        forward_returns=forward_returns(history["sp_price"]),
+    )
+
+
+def combined(triggers, rule_ids):
+    """Days on which every rule in `rule_ids` fired together."""
+    return triggers[list(rule_ids)].all(axis=1)
+
+
+def summarize(result):
+    """Per-rule trigger frequency, episode count and mean forward S&P returns on trigger days."""
+    hits = result.triggers.to_numpy()
+    starts = hits & ~np.vstack([np.zeros((1, hits.shape[1]), dtype=bool), hits[:-1]])
+    fwd = result.forward_returns.to_numpy()
+    summary = pd.DataFrame({
+        "days_triggered": hits.sum(axis=0),
+        "pct_of_days": hits.mean(axis=0) * 100,
+        "episodes": starts.sum(axis=0),
+    }, index=result.triggers.columns)
+    # Masked means over all rules at once: (days x rules)^T @ (days x horizons)
+    valid = ~np.isnan(fwd)
+    sums = hits.T.astype(float) @ np.where(valid, fwd, 0.0)
+    counts = hits.T.astype(float) @ valid.astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts * 100
+    for i, label in enumerate(result.forward_returns.columns):
+        summary[f"fwd_{label}_%"] = means[:, i]
+    return summary
+
+
+if __name__ == "__main__":
+    history = load_history()
+    started = time.perf_counter()
+    result = run_backtest(history)
+    summary = summarize(result)
+    elapsed = time.perf_counter() - started
+
+    pd.set_option("display.width", 160)
+    print(f"Backtest {result.triggers.index[0]:%Y-%m-%d} → {result.triggers.index[-1]:%Y-%m-%d}, "
+          f"{len(result.triggers)} days x {result.triggers.shape[1]} rules in {elapsed * 1000:.1f} ms\n")
+    print(summary.round(2).to_string())
+    full = (result.stagflation_count == len(rules.DEFENSIVE_RULES)).sum()
+    print(f"\nAll defensive signals together (VIX > 20, S&P < 200DMA, curve inverted): {full} days")
+    print(f"All re-entry conditions met: {(result.reentry_count == len(rules.REENTRY_RULES)).sum()} days")
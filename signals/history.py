@@ -0,0 +1,159 @@
+import datetime
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from market_data.store import DB_PATH, connect, init_db
+from signals import rules
+
+# One row per rule per evaluation. `raised_total` is the running count of False -> True edges,
+# so counting episodes in a window is two index seeks instead of a scan.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signal_events (
+    rule_id TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    triggered INTEGER NOT NULL,
+    value REAL,
+    source TEXT NOT NULL,
+    raised_total INTEGER NOT NULL,
+    PRIMARY KEY (rule_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS signal_state (
+    rule_id TEXT PRIMARY KEY,
+    last_ts TEXT NOT NULL,
+    triggered INTEGER NOT NULL,
+    value REAL,
+    streak_since TEXT NOT NULL,
+    streak_runs INTEGER NOT NULL,
+    last_triggered TEXT,
+    raised_total INTEGER NOT NULL
+);
+"""
+
+
+class SignalHistory:
+    """Append-only record of every rule evaluation, with a per-rule summary row kept current on write."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        init_db(path, SCHEMA)
+
+    def _connect(self):
+        return connect(self.path)
+
+    # --- Writes ---
+    def record(self, values, rule_list=rules.RULES, ts=None, source=""):
+        """Evaluate `rule_list` against a metrics mapping and append one event per rule with a known value.
+
+        Evaluations at or before a rule's last recorded timestamp are ignored, keeping each
+        rule's history in time order. Returns the number of events written.
+        """
+        ts = (ts or datetime.datetime.now()).isoformat(timespec="seconds")
+        rule_list = list(rule_list)
+        frame = rules.metric_frame(values)
+        hits = rules.evaluate(frame, rule_list).iloc[0]
+        observed = frame.reindex(columns=[rule.metric for rule in rule_list]).iloc[0].to_numpy(float)
+
+        written = 0
+        with closing(self._connect()) as conn, conn:
+            state = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    f"SELECT rule_id, last_ts, triggered, streak_since, streak_runs, last_triggered, raised_total "
+                    f"FROM signal_state WHERE rule_id IN ({','.join('?' * len(rule_list))})",
+                    [rule.rule_id for rule in rule_list],
+                )
+            }
+            for rule, value in zip(rule_list, observed):
+                if np.isnan(value):
+                    continue
+                fired = bool(hits[rule.rule_id])
+                last_ts, was, since, runs, last_triggered, raised = state.get(rule.rule_id, (None, None, ts, 0, None, 0))
+                if last_ts is not None and ts <= last_ts:
+                    continue
+                if was is None or bool(was) != fired:
+                    since, runs = ts, 1
+                else:
+                    runs += 1
+                if fired:
+                    last_triggered = ts
+                    raised += 0 if was else 1
+                conn.execute(
+                    "INSERT INTO signal_events VALUES (?, ?, ?, ?, ?, ?)",
+                    (rule.rule_id, ts, int(fired), float(value), source, raised),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO signal_state VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (rule.rule_id, ts, int(fired), float(value), since, runs, last_triggered, raised),
+                )
+                written += 1
+        return written
+
+    # --- Queries ---
+    def last_triggered(self, rule_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT last_triggered FROM signal_state WHERE rule_id = ?", (rule_id,)).fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    def streak(self, rule_id):
+        """(triggered, since, evaluations) for the rule's current run of identical outcomes, or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT triggered, streak_since, streak_runs FROM signal_state WHERE rule_id = ?", (rule_id,)
+            ).fetchone()
+        return None if row is None else (bool(row[0]), pd.Timestamp(row[1]), row[2])
+
+    def trigger_count(self, rule_id, window=pd.Timedelta(days=90), now=None):
+        """Times the rule went from clear to triggered within the trailing `window`."""
+        start = (pd.Timestamp(now or datetime.datetime.now()) - window).isoformat(timespec="seconds")
+        with closing(self._connect()) as conn:
+            latest = conn.execute("SELECT raised_total FROM signal_state WHERE rule_id = ?", (rule_id,)).fetchone()
+            before = conn.execute(
+                "SELECT raised_total FROM signal_events WHERE rule_id = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+                (rule_id, start),
+            ).fetchone()
+        return 0 if latest is None else latest[0] - (before[0] if before else 0)
+
+    def summary(self, rule_ids=None, window=pd.Timedelta(days=90)):
+        """One row per recorded rule: current state, streak, last trigger and recent trigger count."""
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(
+                "SELECT rule_id, triggered, value, streak_since, streak_runs, last_triggered, last_ts "
+                "FROM signal_state ORDER BY rule_id",
+                conn,
+            )
+        if rule_ids is not None:
+            frame = frame[frame["rule_id"].isin(list(rule_ids))]
+        frame["triggered"] = frame["triggered"].astype(bool)
+        for column in ("streak_since", "last_triggered", "last_ts"):
+            frame[column] = pd.to_datetime(frame[column])
+        frame["recent_triggers"] = [self.trigger_count(rule_id, window) for rule_id in frame["rule_id"]]
+        return frame.reset_index(drop=True)
+
+    def first_recorded(self):
+        """Timestamp of the oldest evaluation on record, or None for an empty history."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT MIN(ts) FROM signal_events").fetchone()
+        return pd.Timestamp(row[0]) if row[0] else None
+
+    def events(self, rule_id, start=None):
+        with closing(self._connect()) as conn:
+            frame = pd.read_sql_query(
+                "SELECT ts, triggered, value, source FROM signal_events WHERE rule_id = ? AND ts >= ? ORDER BY ts",
+                conn,
+                params=(rule_id, "" if start is None else pd.Timestamp(start).isoformat(timespec="seconds")),
+                parse_dates=["ts"],
+            )
+        frame["triggered"] = frame["triggered"].astype(bool)
+        return frame.set_index("ts")
+
+
+_history = None
+
+
+def get_history():
+    global _history
+    if _history is None:
+        _history = SignalHistory()
+    return _history
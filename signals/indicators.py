@@ -0,0 +1,266 @@
+import os
+import json
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+class RingBuffer:
+    """Fixed-size window of the most recent values."""
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self._data = np.full(size, np.nan)
+        self._start = 0
+        self.count = 0
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        """Append a value; returns the value it evicted (nan while not yet full)."""
+        index = (self._start + self.count) % self.size
+        evicted = self._data[index] if self.count == self.size else np.nan
+        self._data[index] = value
+        if self.count == self.size:
+            self._start = (self._start + 1) % self.size
+        else:
+            self.count += 1
+        return evicted
+
+    @property
+    def full(self):
+        return self.count == self.size
+
+    def oldest(self):
+        """The value the next push would evict once full, read in place (nan when empty)."""
+        return float(self._data[self._start]) if self.count else math.nan
+
+    def values(self):
+        return np.roll(self._data, -self._start)[:self.count]
+
+
+# --- Streaming Indicators ---
+class SMA:
+    """Simple moving average, O(1) per bar via a running sum over a ring buffer."""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self._sum = 0.0
+        self._updates = 0
+
+    def update(self, value):
+        evicted = self.buffer.push(value)
+        self._sum += value - (0.0 if math.isnan(evicted) else evicted)
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._sum = float(self.buffer.values().sum())  # Shed accumulated float drift
+        return self.value
+
+    def peek(self, value):
+        """Average if `value` were the next bar, without committing it (e.g. a partial intraday bar)."""
+        if self.buffer.count < self.window - 1:
+            return math.nan
+        oldest = self.buffer.oldest() if self.buffer.full else 0.0
+        return float((self._sum - oldest + value) / self.window)
+
+    @property
+    def value(self):
+        return self._sum / self.window if self.buffer.full else math.nan
+
+    @classmethod
+    def from_history(cls, values, window):
+        sma = cls(window)
+        tail = np.asarray(values, dtype=float)[-window:]
+        for value in tail:
+            sma.buffer.push(value)
+        sma._sum = float(tail.sum())
+        return sma
+
+    @staticmethod
+    def batch(values, window):
+        return pd.Series(values).rolling(window).mean()
+
+    def to_dict(self):
+        return {"type": "SMA", "window": self.window, "values": self.buffer.values().tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.from_history(data["values"], data["window"])
+
+
+class EMA:
+    """Exponential moving average with smoothing 2 / (span + 1), seeded with the first value.
+
+    Like SMA, the average reads NaN until `span` values have been seen; streaming and batch agree bar for bar.
+    """
+
+    def __init__(self, span, value=math.nan, count=0):
+        self.span = span
+        self.alpha = 2 / (span + 1)
+        self._value = value
+        self.count = count
+
+    def update(self, value):
+        self._value = value if self.count == 0 else self._value + self.alpha * (value - self._value)
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self._value if self.count >= self.span else math.nan
+
+    @classmethod
+    def from_history(cls, values, span):
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return cls(span)
+        state = pd.Series(values).ewm(span=span, adjust=False).mean()  # Unmasked, so a warm-up state carries over
+        return cls(span, float(state.iloc[-1]), len(values))
+
+    @staticmethod
+    def batch(values, span):
+        return pd.Series(values).ewm(span=span, adjust=False, min_periods=span).mean()
+
+    def to_dict(self):
+        return {"type": "EMA", "span": self.span, "value": self._value, "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["span"], data["value"], data["count"])
+
+
+class RollingStd:
+    """Sample standard deviation over a window from running sums of x and x²."""
+
+    def __init__(self, window):
+        self.window = window
+        self.buffer = RingBuffer(window)
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._updates = 0
+
+    def update(self, value):
+        evicted = self.buffer.push(value)
+        if not math.isnan(evicted):
+            self._sum -= evicted
+            self._sumsq -= evicted * evicted
+        self._sum += value
+        self._sumsq += value * value
+        self._updates += 1
+        if self._updates % self.window == 0:
+            values = self.buffer.values()
+            self._sum, self._sumsq = float(values.sum()), float((values * values).sum())
+        return self.value
+
+    @property
+    def value(self):
+        n = self.buffer.count
+        if n < self.window or n < 2:
+            return math.nan
+        variance = (self._sumsq - self._sum * self._sum / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    @classmethod
+    def from_history(cls, values, window):
+        std = cls(window)
+        tail = np.asarray(values, dtype=float)[-window:]
+        for value in tail:
+            std.buffer.push(value)
+        std._sum, std._sumsq = float(tail.sum()), float((tail * tail).sum())
+        return std
+
+    @staticmethod
+    def batch(values, window):
+        return pd.Series(values).rolling(window).std()
+
+    def to_dict(self):
+        return {"type": "RollingStd", "window": self.window, "values": self.buffer.values().tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.from_history(data["values"], data["window"])
+
+
+class RollingMax:
+    """Rolling maximum and drawdown from it, amortized O(1) via a monotonic queue bounded by the window."""
+
+    def __init__(self, window):
+        self.window = window
+        self._queue = deque()  # (bar number, value), values strictly decreasing
+        self._bar = 0
+        self.last = math.nan
+
+    def update(self, value):
+        while self._queue and self._queue[-1][1] <= value:
+            self._queue.pop()
+        self._queue.append((self._bar, value))
+        if self._queue[0][0] <= self._bar - self.window:
+            self._queue.popleft()
+        self._bar += 1
+        self.last = value
+        return self.value
+
+    @property
+    def value(self):
+        return self._queue[0][1] if self._queue else math.nan
+
+    @property
+    def drawdown(self):
+        """Fractional distance of the latest value below the rolling max (0 at a new high)."""
+        return self.last / self.value - 1 if self._queue else math.nan
+
+    @classmethod
+    def from_history(cls, values, window):
+        rolling_max = cls(window)
+        for value in np.asarray(values, dtype=float)[-window:]:
+            rolling_max.update(value)
+        return rolling_max
+
+    @staticmethod
+    def batch(values, window):
+        values = pd.Series(values)
+        peak = values.rolling(window, min_periods=1).max()
+        return pd.DataFrame({"max": peak, "drawdown": values / peak - 1})
+
+    def to_dict(self):
+        return {"type": "RollingMax", "window": self.window, "bar": self._bar, "last": self.last,
+                "queue": [list(item) for item in self._queue]}
+
+    @classmethod
+    def from_dict(cls, data):
+        rolling_max = cls(data["window"])
+        rolling_max._bar, rolling_max.last = data["bar"], data["last"]
+        rolling_max._queue = deque(tuple(item) for item in data["queue"])
+        return rolling_max
+
+
+INDICATOR_TYPES = {cls.__name__: cls for cls in (SMA, EMA, RollingStd, RollingMax)}
+
+
+# --- Persistence ---
+def save_state(path, last_date, indicators):
+    """Persist named indicators plus the date of the last bar they have absorbed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    state = {
+        "last_date": pd.Timestamp(last_date).date().isoformat(),
+        "indicators": {name: indicator.to_dict() for name, indicator in indicators.items()},
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    indicators = {
+        name: INDICATOR_TYPES[data["type"]].from_dict(data) for name, data in state["indicators"].items()
+    }
+    return pd.Timestamp(state["last_date"]), indicators
@@ -0,0 +1,205 @@
+import os
+import ssl
+import json
+import time
+import queue
+import smtplib
+import datetime
+import threading
+import urllib.request
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+
+DIGEST_WINDOW = 30  # Seconds to coalesce alerts into one digest
+MAX_RETRIES = 4
+RETRY_BACKOFF = 2.0  # Seconds before the first retry; doubles each attempt
+
+
+@dataclass(frozen=True)
+class Notification:
+    subject: str
+    lines: tuple
+    recipients: tuple = ()  # Empty means each channel's default recipients
+    created_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+
+
+def digest(notifications):
+    """Merge a batch into one notification per recipient list, keeping each alert line once."""
+    groups = {}
+    for n in notifications:
+        groups.setdefault(n.recipients, []).append(n)
+    merged = []
+    for recipients, group in groups.items():
+        lines = tuple(dict.fromkeys(line for n in group for line in n.lines))
+        subjects = list(dict.fromkeys(n.subject for n in group))
+        subject = subjects[0] if len(subjects) == 1 else f"{subjects[0]} (+{len(subjects) - 1} more)"
+        merged.append(Notification(subject, lines, recipients, group[0].created_at))
+    return merged
+
+
+# --- Channels ---
+# A channel turns notifications into its own delivery units with messages(), then send() delivers a list
+# of them in order, removing each one as it goes out; after a failure the list holds only what is unsent.
+class SMTPChannel:
+    """Email over one authenticated connection per batch, one message per recipient."""
+
+    name = "smtp"
+
+    def __init__(self, host, port, sender, recipients, username=None, password=None, use_ssl=True, timeout=30):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipients = list(recipients)
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls):
+        sender = os.getenv("EMAIL_ADDRESS")
+        recipients = [r.strip() for r in os.getenv("TO_EMAIL", "").split(",") if r.strip()]
+        if not sender:
+            return None
+        return cls(
+            host=os.getenv("SMTP_HOST", "smtp.gmail.com"),
+            port=int(os.getenv("SMTP_PORT", "465")),
+            sender=sender,
+            recipients=recipients,
+            username=os.getenv("SMTP_USERNAME", sender),
+            password=os.getenv("EMAIL_PASSWORD"),
+            use_ssl=os.getenv("SMTP_SSL", "1") != "0",
+        )
+
+    def _connect(self):
+        if self.use_ssl:
+            return smtplib.SMTP_SSL(self.host, self.port, context=ssl.create_default_context(), timeout=self.timeout)
+        return smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+    def messages(self, notifications):
+        """One email per (notification, recipient)."""
+        messages = []
+        for notification in notifications:
+            for recipient in notification.recipients or self.recipients:
+                msg = EmailMessage()
+                msg["Subject"] = notification.subject
+                msg["From"] = self.sender
+                msg["To"] = recipient
+                msg.set_content("\n".join(notification.lines))
+                messages.append(msg)
+        return messages
+
+    def send(self, messages):
+        if not messages:
+            return
+        with self._connect() as smtp:
+            if self.username and self.password:
+                smtp.login(self.username, self.password)
+            while messages:
+                smtp.send_message(messages[0])
+                messages.pop(0)
+
+
+class WebhookChannel:
+    """POSTs the notification as JSON (Slack-compatible "text" field included)."""
+
+    name = "webhook"
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls):
+        url = os.getenv("ALERT_WEBHOOK_URL")
+        return cls(url) if url else None
+
+    def messages(self, notifications):
+        return list(notifications)
+
+    def send(self, messages):
+        while messages:
+            self._post(messages[0])
+            messages.pop(0)
+
+    def _post(self, notification):
+        payload = {
+            "subject": notification.subject,
+            "alerts": list(notification.lines),
+            "text": "\n".join([notification.subject, *notification.lines]),
+            "created_at": notification.created_at.isoformat(timespec="seconds"),
+        }
+        if notification.recipients:
+            payload["recipients"] = list(notification.recipients)
+        request = urllib.request.Request(
+            self.url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+# --- Dispatcher ---
+_FLUSH = object()
+
+
+class NotificationDispatcher:
+    """Queue-backed sender: notify() returns immediately; a worker thread batches, delivers and retries."""
+
+    def __init__(self, channels, digest_window=DIGEST_WINDOW, max_retries=MAX_RETRIES, backoff=RETRY_BACKOFF):
+        self.channels = [channel for channel in channels if channel is not None]
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.failures = []
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def from_env(cls, **kwargs):
+        return cls([SMTPChannel.from_env(), WebhookChannel.from_env()], **kwargs)
+
+    def notify(self, subject, lines, recipients=()):
+        self._queue.put(Notification(subject, tuple(lines), tuple(recipients)))
+
+    def flush(self, timeout=None):
+        """Send whatever is queued now, skipping the digest window, and wait for delivery."""
+        self._queue.put(_FLUSH)
+        done = threading.Event()
+        threading.Thread(target=lambda: (self._queue.join(), done.set()), daemon=True).start()
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [] if item is _FLUSH else [item]
+            taken = 1
+            deadline = time.monotonic() + self.digest_window
+            # Coalesce everything raised within the window, unless a flush asks to send now
+            while item is not _FLUSH:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is not _FLUSH:
+                    batch.append(item)
+            if batch:
+                self._deliver(digest(batch))
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _deliver(self, notifications):
+        """Send through every channel; retries resend only the messages a failed attempt didn't get out."""
+        for channel in self.channels:
+            pending = channel.messages(notifications)
+            for attempt in range(self.max_retries + 1):
+                try:
+                    channel.send(pending)
+                    break
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        self.failures.append((channel.name, pending, e))  # The messages never delivered
+                        print(f"Notification via {channel.name} failed after {attempt + 1} attempts: {e}")
+                    else:
+                        time.sleep(self.backoff * 2 ** attempt)
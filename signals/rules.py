@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# --- Plans ---
+PLAN_2025_DYNAMICS = "📘 2025 Market Dynamics Plan"
+PLAN_TAX_DEFENSIVE = "📙 Tax-Sensitive Defensive Plan"
+PLAN_REENTRY = "📗 Re-entry Plan"
+PLAN_DEBT_CRISIS = "🇺🇸 U.S.A. Debt Crisis Plan"
+PLAN_CHINA_SELLOFF = "🇨🇳 China Treasury Selloff Monitor"
+PLAN_TRADE_SHIFT = "🌍 Trade Regime Shift Tracker"
+
+
+@dataclass(frozen=True)
+class Rule:
+    rule_id: str
+    label: str  # Formatted with the metric's current value as {value}
+    metric: str
+    op: str  # ">" or "<"
+    threshold: float
+    plan: str
+    action: str
+    exit_threshold: float = None  # Level that clears an active alert; defaults to `threshold` (no hysteresis)
+    confirm_bars: int = 1  # Consecutive bars a crossing must hold before the alert changes state
+
+    def describe(self, value):
+        return self.label.format(value=value)
+
+
+# --- Registry ---
+RULES = [
+    Rule("dynamics.vix_gt_20", "VIX > 20", "vix", ">", 20, PLAN_2025_DYNAMICS, "Rotate into real assets",
+         exit_threshold=18),
+    Rule("dynamics.sp_below_ma", "S&P < 200-Day MA", "sp_vs_ma", "<", 1.0, PLAN_2025_DYNAMICS, "Shift to value",
+         exit_threshold=1.01, confirm_bars=2),
+    Rule("dynamics.curve_inverted", "Yield Curve Inverted", "curve_spread", "<", 0.0, PLAN_2025_DYNAMICS, "Add gold",
+         exit_threshold=0.10, confirm_bars=3),
+    Rule("dynamics.cpi_gt_4", "CPI > 4% ({value:.2f})", "cpi", ">", 4, PLAN_2025_DYNAMICS, "Add TIPS",
+         exit_threshold=3.75),
+    Rule("dynamics.oas_gt_500", "HY OAS > 500bps ({value:.0f})", "oas", ">", 500, PLAN_2025_DYNAMICS, "Reduce high yield",
+         exit_threshold=450, confirm_bars=2),
+    Rule("tax.vix_gt_25", "VIX > 25", "vix", ">", 25, PLAN_TAX_DEFENSIVE, "Rebalance IRAs"),
+    Rule("tax.sp_correction", "S&P Drop >10%", "sp_vs_ma", "<", 0.9, PLAN_TAX_DEFENSIVE, "Harvest losses"),
+    Rule("tax.gdp_lt_0", "GDP < 0 ({value:.2f})", "gdp", "<", 0, PLAN_TAX_DEFENSIVE, "Increase liquidity"),
+    Rule("tax.lei_lt_101", "LEI < 101 ({value:.2f})", "lei", "<", 101, PLAN_TAX_DEFENSIVE, "Lock in 24mo cushion"),
+    Rule("reentry.vix_lt_18", "VIX < 18", "vix", "<", 18, PLAN_REENTRY, "Begin phased re-entry",
+         exit_threshold=20, confirm_bars=2),
+    Rule("reentry.sp_above_ma", "S&P > 200-Day MA", "sp_vs_ma", ">", 1.0, PLAN_REENTRY, "Trend recovery",
+         exit_threshold=0.99, confirm_bars=2),
+    Rule("reentry.curve_normal", "Yield Curve Normalized", "curve_spread", ">", 0.0, PLAN_REENTRY, "Resume intermediate bonds",
+         exit_threshold=-0.10, confirm_bars=3),
+    Rule("reentry.cpi_lt_3_5", "CPI < 3.5% ({value:.2f})", "cpi", "<", 3.5, PLAN_REENTRY, "Reduce inflation hedges"),
+    Rule("debt.t10_gt_5", "10Y > 5% ({value:.2f})", "t10", ">", 5.0, PLAN_DEBT_CRISIS, "Shift to short duration"),
+    Rule("debt.dxy_drop_5", "DXY ↓ >5% ({value:.2f}%)", "dxy_change_3mo", "<", -5, PLAN_DEBT_CRISIS, "Add gold/foreign assets"),
+    Rule("debt.vix_gt_25", "VIX > 25", "vix", ">", 25, PLAN_DEBT_CRISIS, "Add defensive equity ETFs"),
+    Rule("debt.cpi_gt_4", "CPI > 4% ({value:.2f})", "cpi", ">", 4, PLAN_DEBT_CRISIS, "Add TIPS, commodities"),
+    Rule("debt.cds_gt_50", "CDS > 50bps ({value:.0f})", "cds_spread", ">", 50, PLAN_DEBT_CRISIS, "Add private credit"),
+    Rule("china.t10_gt_5", "10Y > 5% ({value:.2f})", "t10", ">", 5.0, PLAN_CHINA_SELLOFF, "Exit long bonds"),
+    Rule("china.dxy_drop_5", "DXY ↓ >5% ({value:.2f}%)", "dxy_change_3mo", "<", -5, PLAN_CHINA_SELLOFF, "Add gold, FX-hedged bonds"),
+    Rule("china.holdings_drop_100", "China Holdings ↓ >$100B ({value:.0f})", "china_holdings_drop", ">", 100, PLAN_CHINA_SELLOFF, "Rotate to global debt"),
+    Rule("trade.gscpi_gt_1_5", "GSCPI > 1.5 ({value:.2f})", "gscpi", ">", 1.5, PLAN_TRADE_SHIFT, "Add U.S. infra"),
+    Rule("trade.deficit_gt_80", "Trade Deficit > $80B ({value:.0f})", "trade_deficit", ">", 80, PLAN_TRADE_SHIFT, "Add exporters"),
+    Rule("trade.eem_beats_spy", "EEM > SPY (3-mo Δ {value:.2f}%)", "eem_vs_spy_3mo", ">", 5, PLAN_TRADE_SHIFT, "Add EM"),
+    Rule("trade.commodities_up_5", "Commodities +5% ({value:.2f}%)", "dbc_change_3mo", ">", 5, PLAN_TRADE_SHIFT, "Add DBC/PDBC"),
+]
+RULES_BY_ID = {rule.rule_id: rule for rule in RULES}
+
+# Rule groups the stand-alone monitors score
+DEFENSIVE_RULES = ("dynamics.vix_gt_20", "dynamics.sp_below_ma", "dynamics.curve_inverted")
+REENTRY_RULES = ("reentry.vix_lt_18", "reentry.sp_above_ma", "reentry.curve_normal")
+
+
+def rules_for(rule_ids):
+    return [RULES_BY_ID[rule_id] for rule_id in rule_ids]
+
+
+def plan_rules(plan):
+    return [rule for rule in RULES if rule.plan == plan]
+
+
+# --- Evaluation ---
+def metric_frame(data):
+    """One row per record (a metrics mapping becomes a single row), plus derived ratio/spread columns."""
+    frame = pd.DataFrame([dict(data)]) if not isinstance(data, pd.DataFrame) else data
+    derived = {}
+    if {"sp_price", "sp_ma"} <= set(frame.columns):
+        derived["sp_vs_ma"] = frame["sp_price"] / frame["sp_ma"]
+    if {"t10", "t3m"} <= set(frame.columns):
+        derived["curve_spread"] = frame["t10"] - frame["t3m"]
+    return frame.assign(**derived).astype(float)
+
+
+def evaluate(data, rules=RULES):
+    """Boolean records x rules frame from one vectorized comparison; missing metrics never trigger."""
+    frame = metric_frame(data)
+    values = frame.reindex(columns=[rule.metric for rule in rules]).to_numpy(dtype=float)
+    thresholds = np.array([rule.threshold for rule in rules], dtype=float)
+    greater = np.array([rule.op == ">" for rule in rules])
+    with np.errstate(invalid="ignore"):
+        hits = np.where(greater, values > thresholds, values < thresholds)
+    return pd.DataFrame(hits, index=frame.index, columns=[rule.rule_id for rule in rules])
+
+
+def triggered(metrics, rules=RULES):
+    row = evaluate(metrics, rules).iloc[0]
+    return tuple(row.index[row.to_numpy()])
+
+
+def rule_table(metrics, triggered_ids, rules=RULES):
+    """Display table of rules with their current value, status, plan and suggested action."""
+    frame = metric_frame(metrics).iloc[0]
+    hits = set(triggered_ids)
+    return pd.DataFrame(
+        [
+            (rule.rule_id, rule.describe(frame.get(rule.metric, np.nan)), rule.rule_id in hits, rule.plan, rule.action)
+            for rule in rules
+        ],
+        columns=["Rule", "Signal", "Triggered", "Plan", "Suggested Action"],
+    )
@@ -0,0 +1,209 @@
+"""Subscriber threshold profiles, all matched against one metric vector per cycle.
+
+Profiles live in a JSON file (MONITOR_SUBSCRIBERS, default subscribers.json in the repo root):
+
+    [
+      {"name": "harrell", "recipients": ["a@example.com"], "plans": ["dynamics", "reentry"],
+       "thresholds": {"dynamics.vix_gt_20": 25}, "ma_window": 150}
+    ]
+
+`plans` takes rule-id prefixes, plan labels or single rule ids (default: the 2025 Dynamics
+plan), `thresholds` overrides entry levels by rule id, and `ma_window` picks the S&P moving
+average its sp_vs_ma rules compare against.
+"""
+import os
+import json
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from market_data.store import DATA_DIR, ROOT_DIR
+from signals import rules
+
+SUBSCRIBERS_PATH = os.getenv("MONITOR_SUBSCRIBERS", os.path.join(ROOT_DIR, "subscribers.json"))
+SUBSCRIBER_STATE_PATH = os.path.join(DATA_DIR, "subscriber_alerts.json")
+DEFAULT_PLANS = ("dynamics",)
+DEFAULT_MA_WINDOW = 200
+MAX_MA_WINDOW = 1260  # Five years of trading days
+
+
+@dataclass(frozen=True)
+class Profile:
+    name: str
+    recipients: tuple = ()
+    plans: tuple = DEFAULT_PLANS
+    thresholds: dict = field(default_factory=dict)
+    ma_window: int = DEFAULT_MA_WINDOW
+
+    def includes(self, rule):
+        return any(
+            rule.rule_id == plan or rule.rule_id.startswith(f"{plan}.") or rule.plan == plan for plan in self.plans
+        )
+
+
+def load_profiles(path=SUBSCRIBERS_PATH, available=None):
+    """Profiles from the JSON config; with `available` (metric names), reject rules that could never fire."""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    profiles = []
+    for entry in entries:
+        unknown = set(entry.get("thresholds", {})) - set(rules.RULES_BY_ID)
+        if unknown:
+            raise ValueError(f"Subscriber {entry['name']!r} overrides unknown rules: {sorted(unknown)}")
+        profile = Profile(
+            name=entry["name"],
+            recipients=tuple(entry.get("recipients", ())),
+            plans=tuple(entry.get("plans", DEFAULT_PLANS)),
+            thresholds=dict(entry.get("thresholds", {})),
+            ma_window=int(entry.get("ma_window", DEFAULT_MA_WINDOW)),
+        )
+        if not 2 <= profile.ma_window <= MAX_MA_WINDOW:
+            raise ValueError(f"Subscriber {profile.name!r} ma_window must be 2-{MAX_MA_WINDOW} bars, got {profile.ma_window}")
+        if available is not None:
+            uncollected = [r.rule_id for r in rules.RULES if profile.includes(r) and r.metric not in available]
+            if uncollected:
+                raise ValueError(
+                    f"Subscriber {profile.name!r} subscribes to rules whose inputs have no live source: "
+                    f"{', '.join(uncollected)}. List the wanted rule ids in 'plans' instead of the whole plan."
+                )
+        profiles.append(profile)
+    return profiles
+
+
+class ProfileMatrix:
+    """Profiles x rules threshold matrices, evaluated against one metric vector with a single comparison.
+
+    Entry thresholds are each profile's overrides (or the registry default); exit thresholds keep
+    the registry's hysteresis band at the same distance from the profile's entry level. Rules a
+    profile does not subscribe to are masked out. Like AlertStateMachine, a cell only flips once
+    its condition has held for the rule's `confirm_bars` consecutive bars, and re-evaluating the
+    same bar replaces that bar's observation instead of counting it twice.
+    """
+
+    def __init__(self, profiles, rule_list=rules.RULES):
+        self.profiles = list(profiles)
+        self.rules = list(rule_list)
+        self.rule_ids = [rule.rule_id for rule in self.rules]
+        defaults = np.array([rule.threshold for rule in self.rules], dtype=float)
+        band = np.array(
+            [0.0 if rule.exit_threshold is None else rule.exit_threshold - rule.threshold for rule in self.rules]
+        )
+        self.enter = np.tile(defaults, (len(self.profiles), 1))
+        for i, profile in enumerate(self.profiles):
+            for rule_id, level in profile.thresholds.items():
+                if rule_id in self.rule_ids:
+                    self.enter[i, self.rule_ids.index(rule_id)] = level
+        self.exit = self.enter + band
+        self.enabled = np.array([[profile.includes(rule) for rule in self.rules] for profile in self.profiles])
+        self.enabled = self.enabled.reshape(len(self.profiles), len(self.rules))
+        self.greater = np.array([rule.op == ">" for rule in self.rules])
+        self.confirm = np.array([rule.confirm_bars for rule in self.rules])
+
+        # Moving-average rules read a per-profile column; everything else shares the metric vector
+        self.windows = sorted({profile.ma_window for profile in self.profiles})
+        self._window_index = np.array([self.windows.index(profile.ma_window) for profile in self.profiles], dtype=int)
+        self._ma_columns = np.array([rule.metric == "sp_vs_ma" for rule in self.rules])
+        self.active = np.zeros_like(self.enabled)
+        self.streak = np.zeros(self.enabled.shape, dtype=int)
+        self.prev_streak = np.zeros(self.enabled.shape, dtype=int)
+        self.last_bar = None
+
+    def values(self, metrics, sp_ma_by_window=None):
+        """Profiles x rules metric values: the shared vector, with sp_vs_ma swapped in per MA window."""
+        vector = rules.metric_frame(metrics).reindex(columns=[rule.metric for rule in self.rules]).to_numpy(float)[0]
+        values = np.tile(vector, (len(self.profiles), 1))
+        if sp_ma_by_window and self._ma_columns.any():
+            sp_price = metrics.get("sp_price", np.nan)
+            ratios = np.array([sp_price / sp_ma_by_window.get(w, np.nan) for w in self.windows], dtype=float)
+            values[:, self._ma_columns] = ratios[self._window_index][:, None]
+        return values
+
+    def evaluate(self, metrics, sp_ma_by_window=None):
+        """Level view: boolean profiles x rules matrix of breached, subscribed rules."""
+        values = self.values(metrics, sp_ma_by_window)
+        with np.errstate(invalid="ignore"):
+            hits = np.where(self.greater, values > self.enter, values < self.enter)
+        return hits & self.enabled
+
+    def update(self, metrics, sp_ma_by_window=None, bar=None):
+        """Edge view with hysteresis and confirmation: returns (raised, cleared) boolean profiles x rules matrices.
+
+        `bar` is the observation's date; without one every call counts as a new bar.
+        """
+        values = self.values(metrics, sp_ma_by_window)
+        with np.errstate(invalid="ignore"):
+            entering = np.where(self.greater, values > self.enter, values < self.enter)
+            exiting = np.where(self.greater, values < self.exit, values > self.exit)
+        # Count toward the transition away from each cell's current state
+        pending = np.where(self.active, exiting, entering) & self.enabled
+
+        bar = None if bar is None else pd.Timestamp(bar).date().isoformat()
+        if bar is None or bar != self.last_bar:
+            self.prev_streak = self.streak
+            self.last_bar = bar
+        self.streak = np.where(pending, self.prev_streak + 1, 0)
+
+        flips = self.streak >= self.confirm
+        raised, cleared = flips & ~self.active, flips & self.active
+        self.active = self.active ^ flips
+        self.streak = np.where(flips, 0, self.streak)
+        self.prev_streak = np.where(flips, 0, self.prev_streak)
+        return raised, cleared
+
+    def prime(self, history, sp_ma_history=None):
+        """Replay date-indexed metric rows (and per-window MA rows) so confirmation counts start warm."""
+        for bar, row in history.iterrows():
+            ma = None if sp_ma_history is None else sp_ma_history.loc[bar].to_dict()
+            self.update(row.to_dict(), ma, bar)
+
+    def hits(self, matrix):
+        """{profile name: [rule_id, ...]} for the set cells of a profiles x rules matrix."""
+        rows, cols = np.nonzero(matrix)
+        found = {}
+        for i, j in zip(rows, cols):
+            found.setdefault(self.profiles[i].name, []).append(self.rule_ids[j])
+        return found
+
+    # --- Persistence ---
+    def _counts(self, matrix):
+        rows, cols = np.nonzero(matrix)
+        found = {}
+        for i, j in zip(rows, cols):
+            found.setdefault(self.profiles[i].name, {})[self.rule_ids[j]] = int(matrix[i, j])
+        return found
+
+    def save_state(self, path=SUBSCRIBER_STATE_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        state = {
+            "last_bar": self.last_bar,
+            "active": self.hits(self.active),
+            "streak": self._counts(self.streak),
+            "prev_streak": self._counts(self.prev_streak),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def load_state(self, path=SUBSCRIBER_STATE_PATH):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if "active" not in saved:
+            saved = {"active": saved}  # Older files held only {profile: [active rule ids]}
+        names = {profile.name: i for i, profile in enumerate(self.profiles)}
+        for name, rule_ids in saved["active"].items():
+            for rule_id in rule_ids:
+                if name in names and rule_id in self.rule_ids:
+                    self.active[names[name], self.rule_ids.index(rule_id)] = True
+        for key, matrix in (("streak", self.streak), ("prev_streak", self.prev_streak)):
+            for name, counts in saved.get(key, {}).items():
+                for rule_id, count in counts.items():
+                    if name in names and rule_id in self.rule_ids:
+                        matrix[names[name], self.rule_ids.index(rule_id)] = count
+        self.active &= self.enabled
+        self.last_bar = saved.get("last_bar")
+        return True
@@ -0,0 +1,214 @@
+import os
+import time
+import argparse
+from functools import reduce
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from signals import backtest, rules
+
+DRAWDOWN_EVENT = 0.10  # An S&P drawdown of this size from its running peak counts as the event a signal should lead
+LEAD_HORIZON = 252  # Trading days within which a drawdown must follow for a signal episode to count as a hit
+CELL_BUDGET = 10_000_000  # Days x combinations evaluated per shard; bounds each worker's memory
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    """A composite signal: every condition (metric, op, candidate levels) must hold, for each MA window."""
+    conditions: tuple
+    windows: tuple
+    current: dict  # Registry values, to locate today's thresholds in the grid
+
+
+PRESETS = {
+    # VIX > a, S&P / MA(w) < b (b = 1 - correction), 10Y-3M < c
+    "defensive": SweepSpec(
+        conditions=(
+            ("vix", ">", np.arange(12, 40.5, 1.0)),
+            ("sp_vs_ma", "<", np.round(np.arange(0.80, 1.0001, 0.01), 2)),
+            ("curve_spread", "<", np.arange(-1.0, 1.01, 0.25)),
+        ),
+        windows=(50, 100, 150, 200, 250, 300),
+        current={"vix": rules.RULES_BY_ID["dynamics.vix_gt_20"].threshold,
+                 "sp_vs_ma": rules.RULES_BY_ID["dynamics.sp_below_ma"].threshold,
+                 "curve_spread": rules.RULES_BY_ID["dynamics.curve_inverted"].threshold, "window": 200},
+    ),
+    # VIX < a, S&P / MA(w) > b, 10Y-3M > c
+    "reentry": SweepSpec(
+        conditions=(
+            ("vix", "<", np.arange(10, 30.5, 1.0)),
+            ("sp_vs_ma", ">", np.round(np.arange(0.90, 1.1001, 0.01), 2)),
+            ("curve_spread", ">", np.arange(-1.0, 1.01, 0.25)),
+        ),
+        windows=(50, 100, 150, 200, 250, 300),
+        current={"vix": rules.RULES_BY_ID["reentry.vix_lt_18"].threshold,
+                 "sp_vs_ma": rules.RULES_BY_ID["reentry.sp_above_ma"].threshold,
+                 "curve_spread": rules.RULES_BY_ID["reentry.curve_normal"].threshold, "window": 200},
+    ),
+}
+
+
+# --- Shared Inputs ---
+def prepare(history, windows, start=None):
+    """Arrays every worker needs: metric columns, per-window MA ratios, forward returns and drawdown lead times.
+
+    Everything is computed over the full history and then cut to days on or after `start`, so the first
+    sweep days already have their moving averages and running drawdown peak.
+    """
+    sp = history["sp_price"].to_numpy(float)
+    closes = pd.Series(sp)
+    data = {
+        "vix": history["vix"].to_numpy(float),
+        "curve_spread": (history["t10"] - history["t3m"]).to_numpy(float),
+        "forward": backtest.forward_returns(history["sp_price"]).to_numpy(float),
+        "lead": drawdown_lead(sp),
+    }
+    for window in windows:
+        data[f"sp_vs_ma:{window}"] = sp / closes.rolling(window).mean().to_numpy()
+    first = 0 if start is None else int(history.index.searchsorted(pd.Timestamp(start)))
+    return {name: values[first:] for name, values in data.items()}
+
+
+def drawdown_lead(sp, threshold=DRAWDOWN_EVENT, horizon=LEAD_HORIZON):
+    """Trading days from each day to the next start of a `threshold` drawdown (NaN if none within `horizon`)."""
+    drawdown = sp / np.fmax.accumulate(sp) - 1
+    in_drawdown = drawdown <= -threshold
+    starts = np.flatnonzero(in_drawdown & ~np.concatenate([[False], in_drawdown[:-1]]))
+    days = np.arange(len(sp))
+    nxt = np.searchsorted(starts, days, side="left")
+    lead = np.full(len(sp), np.nan)
+    found = nxt < len(starts)
+    lead[found] = starts[nxt[found]] - days[found]
+    lead[lead > horizon] = np.nan
+    return lead
+
+
+_data = None
+
+
+def _init_worker(data):
+    global _data
+    _data = data
+
+
+# --- Worker ---
+def evaluate_shard(conditions, window, data=None):
+    """Statistics for every level combination of `conditions` at one MA window, via broadcasting.
+
+    Each condition yields a days x levels boolean matrix; reshaping them onto separate axes and
+    AND-ing gives days x combinations in one step, and the per-combination statistics are column
+    reductions or matrix products against the forward-return and lead-time vectors.
+    """
+    data = data if data is not None else _data
+    hits = []
+    for axis, (metric, op, levels) in enumerate(conditions):
+        column = data[f"sp_vs_ma:{window}"] if metric == "sp_vs_ma" else data[metric]
+        with np.errstate(invalid="ignore"):
+            hit = column[:, None] > levels[None, :] if op == ">" else column[:, None] < levels[None, :]
+        shape = [len(column)] + [1] * len(conditions)
+        shape[axis + 1] = len(levels)
+        hits.append(hit.reshape(shape))
+    signal = reduce(np.logical_and, hits).reshape(len(column), -1)
+    # Only days where every input (incl. the MA) exists
+    valid = ~np.isnan(data[f"sp_vs_ma:{window}"]) & ~np.isnan(data["vix"]) & ~np.isnan(data["curve_spread"])
+    signal &= valid[:, None]
+
+    on = signal.astype(np.float32)
+    days = valid.sum()
+    starts = signal & ~np.vstack([np.zeros((1, signal.shape[1]), dtype=bool), signal[:-1]])
+    episodes = starts.sum(axis=0)
+
+    forward = data["forward"]
+    known = ~np.isnan(forward)
+    fwd_sum = on.T @ np.where(known, forward, 0.0).astype(np.float32)
+    fwd_count = on.T @ known.astype(np.float32)
+
+    lead = data["lead"]
+    hit_lead = ~np.isnan(lead)
+    start_f = starts.astype(np.float32)
+    hits_count = start_f.T @ hit_lead.astype(np.float32)
+    lead_sum = start_f.T @ np.where(hit_lead, lead, 0.0).astype(np.float32)
+
+    grid = np.meshgrid(*[levels for _, _, levels in conditions], indexing="ij")
+    out = {metric: g.ravel() for (metric, _, _), g in zip(conditions, grid)}
+    out["window"] = np.full(signal.shape[1], window)
+    out["pct_days"] = signal.sum(axis=0) / max(days, 1) * 100
+    out["episodes"] = episodes
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out["hit_rate_%"] = hits_count / episodes * 100
+        out["lead_days"] = lead_sum / hits_count
+        for i, label in enumerate(backtest.FORWARD_HORIZONS):
+            out[f"fwd_{label}_%"] = fwd_sum[:, i] / fwd_count[:, i] * 100
+    return pd.DataFrame(out)
+
+
+def shards(spec, n_days):
+    """(conditions, window) tasks, splitting the first condition's levels so each shard stays under CELL_BUDGET."""
+    first_metric, first_op, first_levels = spec.conditions[0]
+    rest = int(np.prod([len(levels) for _, _, levels in spec.conditions[1:]]))
+    chunk = max(1, CELL_BUDGET // max(n_days * rest, 1))
+    for window in spec.windows:
+        for start in range(0, len(first_levels), chunk):
+            conditions = ((first_metric, first_op, first_levels[start:start + chunk]),) + tuple(spec.conditions[1:])
+            yield conditions, window
+
+
+def run_sweep(history, spec, workers=None, start=None):
+    """Full grid for `spec` over the days of `history` from `start` on, sharded across a process pool."""
+    data = prepare(history, spec.windows, start)
+    tasks = list(shards(spec, len(data["vix"])))
+    if workers == 1:
+        frames = [evaluate_shard(conditions, window, data) for conditions, window in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+            frames = list(pool.map(evaluate_shard, *zip(*tasks)))
+    return pd.concat(frames, ignore_index=True)
+
+
+def grid_size(spec):
+    return int(np.prod([len(levels) for _, _, levels in spec.conditions])) * len(spec.windows)
+
+
+def current_row(results, spec):
+    """The grid point nearest to the registry's thresholds."""
+    distance = sum(
+        ((results[name] - value) / (results[name].std() or 1)) ** 2 for name, value in spec.current.items()
+    )
+    return results.loc[[distance.idxmin()]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Threshold sweep over the full signal history")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="defensive")
+    parser.add_argument("--years", type=int, default=25, help="History length to sweep")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--min-episodes", type=int, default=5, help="Ignore combinations that fired fewer times")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--out", help="Write the full results grid to this CSV")
+    args = parser.parse_args()
+
+    spec = PRESETS[args.preset]
+    history = backtest.load_history()
+    start = history.index[-1] - pd.DateOffset(years=args.years)
+    started = time.perf_counter()
+    results = run_sweep(history, spec, args.workers, start=start)
+    elapsed = time.perf_counter() - started
+
+    swept = history.index[history.index >= start]
+    pd.set_option("display.width", 200)
+    print(f"Swept {grid_size(spec):,} combinations over {len(swept):,} days "
+          f"({swept[0]:%Y-%m-%d} → {swept[-1]:%Y-%m-%d}) with "
+          f"{args.workers or os.cpu_count()} workers in {elapsed:.1f}s\n")
+    print("Current registry thresholds (nearest grid point):")
+    print(current_row(results, spec).round(2).to_string(index=False))
+    ranked = results[results["episodes"] >= args.min_episodes].sort_values(
+        ["hit_rate_%", "lead_days"], ascending=[False, False]
+    )
+    print(f"\nTop {args.top} by drawdown hit rate (>= {args.min_episodes} episodes), then lead time:")
+    print(ranked.head(args.top).round(2).to_string(index=False))
+    if args.out:
+        results.to_csv(args.out, index=False)
+        print(f"\nFull grid written to {args.out}")
@@ -1 +1,34 @@
-# Strategy module loader
+# Strategy module loader: plans register a label and a "module:function" entry point, imported on first use
+import importlib
+
+PLANS = {}
+_loaded = {}
+
+
+def register(label, entry_point):
+    PLANS[label] = entry_point
+
+
+def load(label):
+    """Import the plan's module on first selection and return its render function."""
+    if label not in _loaded:
+        module_name, _, attr = PLANS[label].partition(":")
+        _loaded[label] = getattr(importlib.import_module(module_name), attr or "render")
+    return _loaded[label]
+
+
+def render(label, snapshot):
+    """Render a plan from the snapshot's shared MarketContext (memoized on the snapshot, so switching plans refetches nothing)."""
+    return load(label)(snapshot.context)
+
+
+# --- Registry (dropdown order) ---
+register("📑 Portfolio Enhancement Actions per Strategy", "strategies.enhancement_actions:render")
+register("📊 Market Dashboard", "strategies.market_dashboard:render")
+register("📘 2025 Market Dynamics Plan", "strategies.plan_2025_dynamics:render")
+register("📙 Tax-Sensitive Defensive Plan", "strategies.plan_tax_defensive:render")
+register("📗 Re-entry Plan", "strategies.plan_reentry:render")
+register("🇺🇸 U.S.A. Debt Crisis Plan", "strategies.plan_debt_crisis:render")
+register("🇨🇳 China Treasury Selloff Monitor", "strategies.plan_china_selloff:render")
+register("🌍 Trade Regime Shift Tracker", "strategies.plan_trade_shift:render")
+register("📐 50/30/20 Plan", "strategies.plan_50_30_20:render")
@@ -0,0 +1,156 @@
+# Shared history charts for plan pages (not a plan; not in the registry)
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from market_data.cache import SOURCE_TTLS, TTLCache, cached
+from signals import backtest, rules
+
+POINT_BUDGET = 400  # Points per chart after downsampling, whatever the history length
+SPEC_CACHE_SIZE = 64
+RANGES = {"1Y": pd.DateOffset(years=1), "5Y": pd.DateOffset(years=5), "10Y": pd.DateOffset(years=10), "Max": None}
+DEFAULT_RANGE = "5Y"
+
+
+@dataclass(frozen=True)
+class ChartMetric:
+    key: str  # Rule-engine metric name
+    title: str
+    unit: str
+    scale: float = 1.0  # Display value = (metric + offset) * scale
+    offset: float = 0.0
+
+    def display(self, values):
+        return (values + self.offset) * self.scale
+
+
+HISTORY_METRICS = {
+    "vix": ChartMetric("vix", "VIX", ""),
+    "sp_vs_ma": ChartMetric("sp_vs_ma", "S&P 500 vs 200-Day MA", "%", scale=100, offset=-1),
+    "curve_spread": ChartMetric("curve_spread", "10Y – 3M Treasury Spread", "pp"),
+    "cpi": ChartMetric("cpi", "CPI Inflation (YoY)", "%"),
+    "oas": ChartMetric("oas", "High-Yield OAS", "bps"),
+}
+
+
+# --- Data ---
+@cached("prices")
+def load_metric_history(period=backtest.HISTORY_PERIOD):
+    """Daily metric frame (including derived sp_vs_ma / curve_spread) over the full stored history.
+
+    Reads the local stores only; the snapshot refresher keeps the long history synced.
+    """
+    return rules.metric_frame(backtest.load_history(period, sync=False))
+
+
+def metric_series(frame, metric, span=None):
+    """Display-scaled series for one metric, trimmed to `span` and with forward-filled repeats collapsed."""
+    series = HISTORY_METRICS[metric].display(frame[metric]).dropna()
+    if span is not None and len(series):
+        series = series[series.index >= series.index[-1] - span]
+    if series.empty:
+        return series
+    # Monthly macro series are forward-filled onto daily bars; keep only the steps (and the last bar)
+    changed = series.ne(series.shift()).to_numpy(copy=True)
+    changed[-1] = True
+    return series[changed]
+
+
+# --- Downsampling ---
+def lttb(x, y, threshold=POINT_BUDGET):
+    """Indices of the Largest-Triangle-Three-Buckets subset of (x, y); keeps peaks that plain striding drops."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    bounds = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    bounds = np.append(bounds, n)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        next_lo, next_hi = bounds[i + 1], bounds[i + 2]
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(series, threshold=POINT_BUDGET):
+    x = series.index.asi8.astype(float)
+    return series.iloc[lttb(x, series.to_numpy(float), threshold)]
+
+
+# --- Vega-Lite Specs ---
+_specs = TTLCache(max_entries=SPEC_CACHE_SIZE)  # Shared across session threads
+
+
+def data_hash(series):
+    digest = hashlib.sha1(series.index.asi8.tobytes())
+    digest.update(series.to_numpy(float).tobytes())
+    return digest.hexdigest()
+
+
+def history_spec(metric, series, threshold=POINT_BUDGET):
+    """Vega-Lite spec of the downsampled series plus the metric's rule thresholds, cached by data hash."""
+    key = (metric, threshold, data_hash(series))
+    hit, spec = _specs.get(key)
+    if hit:
+        return spec
+
+    chart_metric = HISTORY_METRICS[metric]
+    points = downsample(series, threshold)
+    values = [{"date": d, "value": round(v, 4)} for d, v in zip(points.index.strftime("%Y-%m-%d"), points.to_numpy())]
+    axis_title = f"{chart_metric.title} ({chart_metric.unit})" if chart_metric.unit else chart_metric.title
+    levels = {}
+    for rule in rules.RULES:
+        if rule.metric == metric:
+            level = round(float(chart_metric.display(rule.threshold)), 4)
+            levels.setdefault(level, rule.label.split(" (")[0])
+    spec = {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "height": 220,
+        "title": chart_metric.title,
+        "layer": [
+            {
+                "data": {"values": values},
+                "mark": {"type": "line", "interpolate": "step-after" if metric == "cpi" else "linear"},
+                "encoding": {
+                    "x": {"field": "date", "type": "temporal", "title": None},
+                    "y": {"field": "value", "type": "quantitative", "title": axis_title, "scale": {"zero": False}},
+                    "tooltip": [{"field": "date", "type": "temporal"}, {"field": "value", "type": "quantitative"}],
+                },
+            },
+            {
+                "data": {"values": [{"level": level, "rule": label} for level, label in levels.items()]},
+                "mark": {"type": "rule", "strokeDash": [4, 4], "color": "#d62728"},
+                "encoding": {"y": {"field": "level", "type": "quantitative"}, "tooltip": [{"field": "rule"}]},
+            },
+        ],
+    }
+    _specs.set(key, spec, SOURCE_TTLS["prices"])
+    return spec
+
+
+# --- Page Panel ---
+def render_history(metric_keys, key):
+    """Opt-in history panel: charts for `metric_keys`, loading the long history only when opened."""
+    if not st.toggle("📈 Show history", key=f"history_{key}"):
+        return
+    span = st.radio("Range", list(RANGES), index=list(RANGES).index(DEFAULT_RANGE), horizontal=True,
+                    key=f"history_range_{key}")
+    try:
+        frame = load_metric_history()
+    except Exception as e:
+        st.warning(f"History unavailable: {e}")
+        return
+    for metric in metric_keys:
+        series = metric_series(frame, metric, RANGES[span])
+        if series.empty:
+            st.caption(f"No history for {HISTORY_METRICS[metric].title}.")
+            continue
+        st.vega_lite_chart(history_spec(metric, series), use_container_width=True)
@@ -2,7 +2,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 import os
 
-def render():
+def render(ctx=None):
     st.subheader("📑 Portfolio Enhancement Actions per Strategy")
 
     html_path = "portfolio_enhancement_actions.html"
@@ -1,36 +1,38 @@
 import streamlit as st
 
-def render():
+from strategies import charts
+
+def render(ctx):
     st.subheader("📘 2025 Market Dynamics Plan")
 
-    # These would be passed into render() normally; using mock values here
-    vix = 23.5
-    sp_price = 4100
-    sp_ma = 4300
-    t10 = 4.75
-    t3m = 5.00
-    cpi = 4.6
-    oas = 510
+    vix = ctx.vix
+    sp_price, sp_ma = ctx.sp_price, ctx.sp_ma
+    t10, t3m = ctx.t10, ctx.t3m
+    cpi = ctx.cpi
+    oas = ctx.oas
+    triggered = ctx.triggered
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric("VIX", f"{vix:.2f}")
-        if vix > 20:
+        if "dynamics.vix_gt_20" in triggered:
             st.warning("⚠️ VIX > 20 → Rotate into floating-rate, cash, real assets")
 
     with col2:
         st.metric("S&P vs 200-Day MA", f"{sp_price:.0f} vs {sp_ma:.0f}")
-        if sp_price < sp_ma:
+        if "dynamics.sp_below_ma" in triggered:
             st.warning("⚠️ S&P < 200-day → Shift to value/dividend stocks")
 
     with col3:
         st.metric("Yield Curve", f"{t10:.2f}% - {t3m:.2f}%")
-        if t10 < t3m:
+        if "dynamics.curve_inverted" in triggered:
             st.warning("⚠️ Yield Curve Inverted → Add gold, reduce long bonds")
 
-    if cpi and cpi > 4:
+    if "dynamics.cpi_gt_4" in triggered:
         st.warning(f"⚠️ CPI YoY at {cpi:.2f}% → Add TIPS, commodities")
 
-    if oas and oas > 500:
+    if "dynamics.oas_gt_500" in triggered:
         st.warning(f"⚠️ HY OAS {oas:.0f} bps → Exit high-yield, raise cash")
+
+    charts.render_history(("vix", "sp_vs_ma", "curve_spread", "cpi", "oas"), key="2025_dynamics")
@@ -1,28 +1,53 @@
 import streamlit as st
-import pandas as pd
 import altair as alt
 
-def render():
+from portfolio import ingest, rebalance
+
+def render(ctx=None):
     st.subheader("📐 50/30/20 Plan – Allocation Comparison")
 
     st.markdown("Upload your current portfolio allocation as a CSV. Example format:")
 
     st.code("Asset Class,Amount\nStocks,500000\nBonds,300000\nPrivate,100000", language="csv")
+    st.caption("Lot-level brokerage exports (Account, Symbol, Quantity, Market Value, ...) are also accepted; "
+               "tickers are mapped to asset classes automatically.")
 
     uploaded_csv = st.file_uploader("Upload your allocation CSV", type="csv")
 
     if uploaded_csv:
-        df = pd.read_csv(uploaded_csv)
-        df["Amount"] = pd.to_numeric(df["Amount"], errors="coerce")
-        df.dropna(inplace=True)
+        bar = st.progress(0.0, text="Parsing holdings...")
+        try:
+            holdings = ingest.stream_holdings(uploaded_csv, progress=lambda done: bar.progress(done))
+        except ValueError as e:
+            bar.empty()
+            st.error(str(e))
+            return
+        bar.empty()
+        st.caption(f"Parsed {holdings.rows:,} rows.")
+        if not holdings.unclassified.empty:
+            st.warning("Unrecognized tickers (shown as Unclassified): " + ", ".join(holdings.unclassified.index))
+        if holdings.skipped_rows:
+            st.warning(f"Skipped {holdings.skipped_rows:,} rows with unparseable amounts; the first are shown below.")
+            st.dataframe(holdings.skipped, use_container_width=True)
+        df = holdings.allocation
 
+        # Unclassified holdings have no target; keep them out of the percentages and the rebalance check
+        unclassified = df["Asset Class"] == ingest.UNCLASSIFIED
+        other = df.loc[unclassified, "Amount"].sum()
+        df = df[~unclassified].copy()
         total = df["Amount"].sum()
+        if other:
+            st.info(f"${other:,.0f} Unclassified ({other / (total + other) * 100:.1f}% of the portfolio) "
+                    "is excluded from the target comparison.")
+        if not total:
+            st.error("No holdings map to a target asset class.")
+            return
         df["% Allocation"] = df["Amount"] / total * 100
 
-        target_alloc = {"Stocks": 50, "Bonds": 30, "Private": 20}
+        target_alloc = rebalance.TARGET_ALLOC
         df["Target %"] = df["Asset Class"].map(target_alloc)
         df["Deviation"] = df["% Allocation"] - df["Target %"]
-        df["Status"] = df["Deviation"].apply(lambda x: "✅ OK" if abs(x) <= 5 else "⚠️ Off Target")
+        df["Status"] = df["Deviation"].apply(lambda x: "✅ OK" if abs(x) <= rebalance.TOLERANCE else "⚠️ Off Target")
 
         st.dataframe(df, use_container_width=True)
 
@@ -38,7 +63,29 @@ def render():
 
         if any(df["Status"] == "⚠️ Off Target"):
             st.warning("⚠️ Some allocations deviate by more than ±5% from the target.")
+            render_trades(uploaded_csv, target_alloc)
         else:
             st.success("✅ All asset classes are within acceptable range.")
     else:
         st.info("Upload a CSV to compare against the 50/30/20 target.")
+
+
+def render_trades(uploaded_csv, target_alloc):
+    uploaded_csv.seek(0)
+    try:
+        positions = ingest.read_positions(uploaded_csv)
+    except ValueError:
+        st.caption("Upload a lot- or position-level export (with tickers) to get a suggested trade list.")
+        return
+    plan = rebalance.plan_rebalance(positions, target_alloc)
+    st.markdown("#### 🔁 Suggested Rebalance Trades")
+    st.caption(
+        f"Minimal-turnover trades (${plan.turnover:,.0f} sold) landing each class within "
+        f"±{rebalance.TOLERANCE - rebalance.BUFFER:.0f}% of target; sells favor cash and tax-advantaged "
+        "accounts, and proceeds stay in the account they were raised in."
+    )
+    st.dataframe(plan.trades, use_container_width=True)
+    if (plan.trades["Order"] == rebalance.ORDER_DOLLARS).any():
+        st.caption("Dollar-amount orders have no price in the export (cash, or a default fund the account doesn't "
+                   "hold yet), so the broker sets their share count; the After column assumes they fill in full.")
+    st.dataframe(plan.allocation, use_container_width=True)
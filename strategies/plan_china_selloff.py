@@ -1,26 +1,30 @@
 import streamlit as st
 
-def render():
+from strategies import term_structure
+
+def render(ctx):
     st.subheader("🇨🇳 China Treasury Selloff Monitor")
 
-    # Simulated signal data
-    t10 = 5.2
-    dxy_change_3mo = -5.8
-    china_holdings_drop = 120  # in $B
+    t10 = ctx.t10
+    dxy_change_3mo = ctx.dxy_change_3mo
+    china_holdings_drop = ctx.get("china_holdings_drop")  # in $B
+    triggered = ctx.triggered
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric("10Y Treasury Yield", f"{t10:.2f}%")
-        if t10 > 5.0:
+        if "china.t10_gt_5" in triggered:
             st.warning("⚠️ 10Y > 5% → Exit long bonds, increase floaters and private credit")
 
     with col2:
         st.metric("DXY 3-Mo Change", f"{dxy_change_3mo:.2f}%")
-        if dxy_change_3mo < -5:
+        if "china.dxy_drop_5" in triggered:
             st.warning("⚠️ USD down >5% → Add gold, FX-hedged global bonds")
 
     with col3:
-        st.metric("China Treasury Holdings ↓ YoY", f"${china_holdings_drop}B")
-        if china_holdings_drop > 100:
+        st.metric("China Treasury Holdings ↓ YoY", f"${china_holdings_drop:.0f}B")
+        if "china.holdings_drop_100" in triggered:
             st.warning("⚠️ Drop > $100B → Hedge U.S. bond exposure, rotate to global debt")
+
+    term_structure.render_term_structure(ctx, key="china_selloff")
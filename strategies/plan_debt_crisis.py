@@ -1,35 +1,41 @@
 import streamlit as st
 
-def render():
+from strategies import charts, term_structure
+
+def render(ctx):
     st.subheader("🇺🇸 U.S.A. Debt Crisis Plan")
 
-    # Mocked example data
-    t10 = 5.1
-    dxy_change_3mo = -6.2
-    vix = 27.3
-    cpi = 4.5
-    cds_spread = 56  # Simulated
+    t10 = ctx.t10
+    vix = ctx.vix
+    cpi = ctx.cpi
+    dxy_change_3mo = ctx.dxy_change_3mo
+    cds_spread = ctx.get("cds_spread")
+    triggered = ctx.triggered
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric("10Y Treasury Yield", f"{t10:.2f}%")
-        if t10 > 5.0:
+        if "debt.t10_gt_5" in triggered:
             st.warning("⚠️ 10Y > 5% → Exit long bonds, shift to short-duration")
 
     with col2:
         st.metric("USD Index (DXY 3-mo Δ)", f"{dxy_change_3mo:.2f}%")
-        if dxy_change_3mo < -5:
+        if "debt.dxy_drop_5" in triggered:
             st.warning("⚠️ USD ↓ >5% → Add gold, foreign equities, FX hedging")
 
     with col3:
         st.metric("VIX", f"{vix:.2f}")
-        if vix > 25:
+        if "debt.vix_gt_25" in triggered:
             st.warning("⚠️ VIX > 25 → Add defensive equity ETFs (USMV, SCHD)")
 
-    if cpi and cpi > 4:
+    if "debt.cpi_gt_4" in triggered:
         st.warning(f"⚠️ CPI > 4% ({cpi:.2f}%) → Add TIPS, commodities")
 
-    st.metric("U.S. CDS Spread (Simulated)", f"{cds_spread} bps")
-    if cds_spread > 50:
+    st.metric("U.S. CDS Spread (Simulated)", f"{cds_spread:.0f} bps")
+    if "debt.cds_gt_50" in triggered:
         st.warning("⚠️ CDS > 50 → Add dividend growth + private credit exposure")
+
+    term_structure.render_term_structure(ctx, key="debt_crisis")
+
+    charts.render_history(("vix", "cpi"), key="debt_crisis")
@@ -1,15 +1,15 @@
 import streamlit as st
 
-def render():
+from strategies import charts, term_structure
+
+def render(ctx):
     st.subheader("📗 Re-entry Plan")
 
-    # Example signal values (normally passed in)
-    vix = 16.8
-    sp_price = 4450
-    sp_ma = 4300
-    t10 = 4.75
-    t3m = 4.30
-    cpi = 3.2
+    vix = ctx.vix
+    sp_price, sp_ma = ctx.sp_price, ctx.sp_ma
+    t10, t3m = ctx.t10, ctx.t3m
+    cpi = ctx.cpi
+    triggered = ctx.triggered
 
     conditions_met = 0
 
@@ -17,7 +17,7 @@ def render():
 
     with col1:
         st.metric("VIX", f"{vix:.2f}")
-        if vix < 18:
+        if "reentry.vix_lt_18" in triggered:
             st.success("✅ VIX < 18 → Volatility normalized")
             conditions_met += 1
         else:
@@ -25,20 +25,22 @@ def render():
 
     with col2:
         st.metric("S&P vs 200-Day MA", f"{sp_price:.0f} vs {sp_ma:.0f}")
-        if sp_price > sp_ma:
+        if "reentry.sp_above_ma" in triggered:
             st.success("✅ Trend recovery confirmed")
             conditions_met += 1
 
     with col3:
         st.metric("Yield Curve", f"{t10:.2f}% - {t3m:.2f}%")
-        if t10 > t3m:
+        if "reentry.curve_normal" in triggered:
             st.success("✅ Curve normalized")
             conditions_met += 1
 
-    if cpi < 3.5:
+    if "reentry.cpi_lt_3_5" in triggered:
         st.success(f"✅ CPI stabilized at {cpi:.2f}%")
         conditions_met += 1
 
+    term_structure.render_term_structure(ctx, key="reentry")
+
     st.divider()
     if conditions_met == 4:
         st.success("🔁 All clear: Begin full portfolio re-entry")
@@ -46,3 +48,5 @@ def render():
         st.info("🟡 Consider phased re-entry — monitor remaining signals")
     else:
         st.warning("🔒 Re-entry not yet advised — hold position")
+
+    charts.render_history(("vix", "sp_vs_ma", "curve_spread", "cpi"), key="reentry")
@@ -1,31 +1,82 @@
 import streamlit as st
 
-def render():
+from market_data import metrics, prices
+from portfolio import ingest, tax_lots
+from strategies import charts
+
+MAX_CANDIDATES = 50
+
+def render(ctx):
     st.subheader("📙 Tax-Sensitive Defensive Plan")
 
-    # Mocked metrics for demonstration
-    vix = 27.1
-    sp_price = 3950
-    sp_ma = 4450
-    lei = 100.5
-    gdp = -0.4
+    vix = ctx.vix
+    sp_price, sp_ma = ctx.sp_price, ctx.sp_ma
+    lei = ctx.lei
+    gdp = ctx.gdp
+    triggered = ctx.triggered
 
     col1, col2, col3 = st.columns(3)
 
     with col1:
         st.metric("VIX", f"{vix:.2f}")
-        if vix > 25:
+        if "tax.vix_gt_25" in triggered:
             st.warning("⚠️ VIX > 25 → Rebalance in tax-advantaged accounts (e.g., IRAs)")
 
     with col2:
         st.metric("S&P vs 200-Day MA", f"{sp_price:.0f} vs {sp_ma:.0f}")
-        if sp_price < sp_ma * 0.9:
+        if "tax.sp_correction" in triggered:
             st.warning("⚠️ S&P Correction >10% → Harvest losses, shift to short-duration ETFs")
 
     with col3:
         st.metric("LEI", f"{lei:.2f}")
-        if lei < 101:
+        if "tax.lei_lt_101" in triggered:
             st.warning("⚠️ LEI < 101 → Build cash cushion for 24 months of expenses")
 
-    if gdp < 0:
+    if "tax.gdp_lt_0" in triggered:
         st.warning(f"⚠️ GDP Growth < 0% ({gdp:.2f}%) → Lock in liquidity buffer and de-risk portfolio")
+
+    charts.render_history(("vix", "sp_vs_ma"), key="tax_defensive")
+    render_harvest_scanner(correction="tax.sp_correction" in triggered)
+
+
+def render_harvest_scanner(correction=False):
+    st.markdown("#### 🧾 Tax-Loss Harvest Scanner")
+    uploaded = st.file_uploader(
+        "Upload tax lots CSV (Account, Symbol, Quantity, Cost Basis, Date Acquired)", type="csv", key="tax_lots"
+    )
+    if not uploaded:
+        st.caption("Upload lot-level holdings to rank harvest candidates by tax benefit.")
+        return
+    skipped = []
+    try:
+        lots = ingest.read_lots(uploaded, on_skipped=skipped.append)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if skipped:
+        lines = [str(line) for rows in skipped for line in rows.index][:ingest.MAX_SKIPPED_REPORTED]
+        st.warning(f"Skipped {sum(map(len, skipped)):,} lots with unparseable numbers (CSV lines {', '.join(lines)}).")
+
+    tickers = tax_lots.quote_tickers(lots)
+    try:
+        quotes = prices.latest_closes(metrics.load_panel(tickers, period=tax_lots.QUOTE_PERIOD)) if tickers else {}
+    except Exception as e:
+        st.warning(f"Live quotes unavailable ({e}); using exported market values.")
+        quotes = {}
+    result = tax_lots.scan(lots, quotes)
+
+    candidates = result.candidates
+    if correction and not candidates.empty:
+        st.warning(f"⚠️ Correction underway: {len(candidates):,} lots are harvestable for an estimated "
+                   f"${candidates['Tax Benefit'].sum():,.0f} in tax savings.")
+    if result.missing_quotes:
+        st.caption("No quote for: " + ", ".join(result.missing_quotes[:20]))
+    if candidates.empty:
+        st.success("✅ No taxable lots are currently below cost.")
+        return
+    if candidates["Wash Sale Risk"].any():
+        st.caption("⚠️ Wash Sale Risk: the same ticker was bought in the last 30 days (in any account); "
+                   "that portion of the loss would be disallowed.")
+    columns = ["Account", "Ticker", "Quantity", "Acquired", "Term", "Cost Basis", "Market Value",
+               "Unrealized Gain", "Wash Sale Risk", "Tax Benefit"]
+    st.dataframe(candidates[columns].head(MAX_CANDIDATES), use_container_width=True)
@@ -0,0 +1,61 @@
+# Treasury term-structure panel for plan pages (not a plan; not in the registry)
+import math
+
+import pandas as pd
+import streamlit as st
+
+from market_data import metrics, treasury
+
+COMPARE = {"Today": None, "1M ago": pd.DateOffset(months=1), "1Y ago": pd.DateOffset(years=1)}
+
+
+def curve_spec(curve):
+    """Vega-Lite yield-by-maturity lines for the latest curve and the COMPARE look-backs."""
+    values = []
+    for label, offset in COMPARE.items():
+        rows = curve if offset is None else curve[curve.index <= curve.index[-1] - offset]
+        if rows.empty:
+            continue
+        for tenor, value in rows.iloc[-1].items():
+            if not pd.isna(value):
+                values.append({"curve": label, "tenor": tenor, "years": treasury.TENOR_YEARS[tenor], "yield": round(value, 3)})
+    return {
+        "$schema": "https://vega.github.io/schema/vega-lite/v5.json",
+        "height": 220,
+        "title": f"Treasury Curve ({curve.index[-1]:%Y-%m-%d})",
+        "data": {"values": values},
+        "mark": {"type": "line", "point": True},
+        "encoding": {
+            "x": {"field": "years", "type": "quantitative", "scale": {"type": "log"}, "title": "Maturity (years)"},
+            "y": {"field": "yield", "type": "quantitative", "scale": {"zero": False}, "title": "Yield (%)"},
+            "color": {"field": "curve", "type": "nominal", "sort": list(COMPARE), "title": None},
+            "tooltip": [{"field": "curve"}, {"field": "tenor"}, {"field": "yield", "type": "quantitative"}],
+        },
+    }
+
+
+def render_term_structure(ctx, key):
+    """Titled panel of key spreads and inversion readings from the market context, with the full curve on request."""
+    st.markdown("#### Treasury Term Structure")
+    m = ctx.metrics
+    if math.isnan(m.get("inversion_depth", math.nan)):
+        st.caption("Treasury term structure unavailable (no FRED yields cached).")
+        return
+    cols = st.columns(len(treasury.KEY_SPREADS) + 1)
+    for col, (name, (short, long)) in zip(cols, treasury.KEY_SPREADS.items()):
+        days = m[f"days_inverted_{name}"]
+        col.metric(f"{long} – {short} Spread", f"{m[f'spread_{name}']:+.2f} pp",
+                   f"inverted {days:.0f} days" if days else None, delta_color="inverse")
+    cols[-1].metric("Inversion Depth", f"{m['inversion_depth']:.2f} pp",
+                    f"{m['inversion_depth_chg_1mo']:+.2f} pp 1M" if not math.isnan(m["inversion_depth_chg_1mo"]) else None,
+                    delta_color="inverse")
+    if m["inversion_depth"] > 0:
+        st.caption(f"{m['inverted_pairs_pct']:.0f}% of tenor pairs inverted"
+                   f"{' and deepening' if m['inversion_depth_chg_1mo'] > 0 else ''}.")
+
+    if st.toggle("🧭 Show yield curve", key=f"curve_{key}"):
+        curve = metrics.load_curve()
+        if curve.empty:
+            st.caption("No Treasury yields cached.")
+        else:
+            st.vega_lite_chart(curve_spec(curve), use_container_width=True)
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# Columns the ingest readers always emit, with the value they get when an export lacks them
+INGEST_DEFAULTS = {"Account": "Portfolio", "Account Type": "", "Quantity": np.nan, "Amount": np.nan,
+                   "Cost Basis": np.nan}
+
+
+@pytest.fixture
+def holdings_frame():
+    """Factory for ingest-shaped frames: `holdings_frame(rows, columns)` from tuples, other columns defaulted."""
+    def build(rows, columns):
+        frame = pd.DataFrame(rows, columns=columns)
+        return frame.assign(**{name: value for name, value in INGEST_DEFAULTS.items() if name not in frame})
+    return build
@@ -0,0 +1,77 @@
+import pandas as pd
+
+from signals.alert_state import AlertStateMachine
+from signals.rules import Rule
+
+VIX_HIGH = Rule("test.vix_gt_20", "VIX > 20", "vix", ">", 20, "Test Plan", "Act", exit_threshold=18, confirm_bars=2)
+DAYS = pd.bdate_range("2026-01-05", periods=10)
+
+
+def feed(machine, values, start=0):
+    """Feed one vix reading per business day; returns the events per bar."""
+    return [machine.update({"vix": value}, DAYS[start + i]) for i, value in enumerate(values)]
+
+
+def test_enter_needs_confirm_bars_consecutive_bars():
+    machine = AlertStateMachine([VIX_HIGH])
+    assert feed(machine, [22]) == [[]]
+    assert not machine.active[0]
+    assert feed(machine, [23], start=1) == [[("test.vix_gt_20", "raised")]]
+    assert machine.active_rules() == ["test.vix_gt_20"]
+    assert machine.since[0] == DAYS[1].date().isoformat()
+
+
+def test_interrupted_streak_starts_over():
+    machine = AlertStateMachine([VIX_HIGH])
+    events = feed(machine, [22, 19, 22, 23])
+    assert events == [[], [], [], [("test.vix_gt_20", "raised")]]
+
+
+def test_exit_uses_hysteresis_level():
+    machine = AlertStateMachine([VIX_HIGH])
+    feed(machine, [22, 23])
+    # Between the exit (18) and entry (20) levels the alert holds
+    assert feed(machine, [19, 19, 19], start=2) == [[], [], []]
+    assert machine.active[0]
+    assert feed(machine, [17, 16], start=5) == [[], [("test.vix_gt_20", "cleared")]]
+    assert machine.active_rules() == []
+
+
+def test_repolling_a_bar_does_not_count_twice():
+    machine = AlertStateMachine([VIX_HIGH])
+    for _ in range(3):
+        assert machine.update({"vix": 25}, DAYS[0]) == []
+    assert not machine.active[0]
+    assert machine.update({"vix": 25}, DAYS[1]) == [("test.vix_gt_20", "raised")]
+
+
+def test_repoll_replaces_the_bars_observation():
+    machine = AlertStateMachine([VIX_HIGH])
+    # An intraday poll reads above 20, then the same bar settles below it
+    machine.update({"vix": 21}, DAYS[0])
+    machine.update({"vix": 19}, DAYS[0])
+    assert machine.update({"vix": 22}, DAYS[1]) == []
+    assert machine.update({"vix": 22}, DAYS[2]) == [("test.vix_gt_20", "raised")]
+
+
+def test_missing_metric_never_triggers():
+    machine = AlertStateMachine([VIX_HIGH])
+    assert feed(machine, [float("nan")] * 3) == [[], [], []]
+    assert not machine.active[0]
+
+
+def test_state_survives_save_and_load(tmp_path):
+    path = str(tmp_path / "alerts.json")
+    machine = AlertStateMachine([VIX_HIGH])
+    feed(machine, [22])
+    machine.save(path)
+
+    restored = AlertStateMachine.load(path, [VIX_HIGH])
+    assert restored.last_bar == machine.last_bar
+    assert restored.update({"vix": 22}, DAYS[1]) == [("test.vix_gt_20", "raised")]
+
+
+def test_prime_warms_up_confirmation():
+    machine = AlertStateMachine([VIX_HIGH])
+    machine.prime(pd.DataFrame({"vix": [15, 22]}, index=DAYS[:2]))
+    assert machine.update({"vix": 22}, DAYS[2]) == [("test.vix_gt_20", "raised")]
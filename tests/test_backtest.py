@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import prices
+from signals import backtest, rules
+
+DAYS = pd.bdate_range("2020-01-01", periods=400)
+WINDOW = 20
+
+
+def steps(base, spans):
+    """Constant `base` series with {(first, last): value} days overridden, inclusive."""
+    values = np.full(len(DAYS), base, dtype=float)
+    for (first, last), value in spans.items():
+        values[first:last + 1] = value
+    return values
+
+
+def synthetic_history():
+    """S&P drops 15% on days 250-268, VIX spikes on 260-279 and 350-354, and the curve inverts on 255-284."""
+    panel = pd.DataFrame({
+        "^GSPC": steps(100.0, {(250, 268): 85.0}),
+        "^VIX": steps(15.0, {(260, 279): 30.0, (350, 354): 30.0}),
+        "^TNX": 4.0,
+        "^IRX": steps(3.0, {(255, 284): 5.0}),
+    }, index=DAYS)
+    return prices.signal_frame(panel, WINDOW)
+
+
+def trigger_days(result, rule_id):
+    hits = result.triggers[rule_id]
+    return [DAYS.get_loc(day) for day in hits.index[hits.to_numpy()]]
+
+
+@pytest.fixture(scope="module")
+def result():
+    return backtest.run_backtest(synthetic_history())
+
+
+def test_evaluation_starts_once_the_moving_average_exists(result):
+    assert result.triggers.index[0] == DAYS[WINDOW - 1]
+    assert list(result.triggers.columns) == [rule.rule_id for rule in rules.RULES]
+
+
+def test_rules_fire_on_the_known_days(result):
+    assert trigger_days(result, "dynamics.vix_gt_20") == list(range(260, 280)) + list(range(350, 355))
+    assert trigger_days(result, "dynamics.sp_below_ma") == list(range(250, 269))
+    # 85 / MA < 0.9 only while the MA is above 94.4, i.e. the first 7 days of the drop
+    assert trigger_days(result, "tax.sp_correction") == list(range(250, 257))
+    assert trigger_days(result, "dynamics.curve_inverted") == list(range(255, 285))
+    assert not result.triggers["dynamics.cpi_gt_4"].any()  # No CPI column: missing metrics never trigger
+
+
+def test_defensive_count_and_combined_days(result):
+    all_defensive = result.stagflation_count == len(rules.DEFENSIVE_RULES)
+    assert [DAYS.get_loc(day) for day in all_defensive.index[all_defensive]] == list(range(260, 269))
+    together = backtest.combined(result.triggers, rules.DEFENSIVE_RULES)
+    pd.testing.assert_series_equal(together, all_defensive, check_names=False)
+
+
+def test_summary_counts_episodes_and_forward_returns(result):
+    summary = backtest.summarize(result).loc["dynamics.vix_gt_20"]
+    assert summary["days_triggered"] == 25
+    assert summary["episodes"] == 2
+    # Only the 9 trigger days priced at 85 gain when the S&P is back at 100 a month later
+    assert summary["fwd_1m_%"] == pytest.approx(9 * (100 / 85 - 1) / 25 * 100)
+    assert np.isnan(summary["fwd_12m_%"])  # Every trigger is within a year of the end of the history
+
+
+def test_forward_returns_are_nan_past_the_end():
+    sp = pd.Series([100.0, 110.0, 121.0], index=DAYS[:3])
+    forward = backtest.forward_returns(sp, {"1d": 1, "2d": 2})
+    assert forward["1d"].tolist()[:2] == pytest.approx([0.1, 0.1])
+    assert forward["2d"].iloc[0] == pytest.approx(0.21)
+    assert forward["2d"].iloc[1:].isna().all()
+
+
+def test_released_redates_observations_to_publication():
+    cpi = pd.Series([3.1], index=pd.to_datetime(["2026-08-01"]))
+    assert backtest.released(cpi, "CPIAUCSL").index[0] == pd.Timestamp("2026-09-11")
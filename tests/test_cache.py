@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+
+from market_data import cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    store = cache.TTLCache()
+    store.set("a", 1, ttl=10)
+    clock[0] += 9.9
+    assert store.get("a") == (True, 1)
+    clock[0] += 0.1
+    assert store.get("a") == (False, None)
+    assert len(store) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    store = cache.TTLCache(max_entries=2)
+    store.set("a", 1, ttl=60)
+    store.set("b", 2, ttl=60)
+    store.get("a")
+    store.set("c", 3, ttl=60)
+    assert store.get("b") == (False, None)
+    assert store.get("a") == (True, 1)
+    assert store.get("c") == (True, 3)
+
+
+def test_clear_by_source():
+    store = cache.TTLCache()
+    store.set(("prices", "x"), 1, ttl=60)
+    store.set(("fred", "y"), 2, ttl=60)
+    store.clear("prices")
+    assert store.get(("prices", "x")) == (False, None)
+    assert store.get(("fred", "y")) == (True, 2)
+
+
+def test_concurrent_callers_share_one_fetch():
+    calls = []
+
+    @cache.cached("prices")
+    def fetch(key):
+        calls.append(key)
+        time.sleep(0.1)
+        return key * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(fetch(i % 2))) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(calls) == [0, 1]
+    assert sorted(results) == [0] * 10 + [2] * 10
+    assert cache._cache._key_locks == {}
+
+
+def test_cached_result_expires_with_the_source_ttl(clock):
+    calls = []
+
+    @cache.cached("prices")
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert fetch() == 1
+    clock[0] += cache.SOURCE_TTLS["prices"] - 1
+    assert fetch() == 1
+    clock[0] += 1
+    assert fetch() == 2
+
+
+def test_exceptions_are_not_cached():
+    calls = []
+
+    @cache.cached("fred")
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("FRED down")
+        return "fresh"
+
+    with pytest.raises(ConnectionError):
+        fetch()
+    assert fetch() == "fresh"
+    assert len(calls) == 2
+
+
+def test_uncached_fallbacks_are_returned_but_retried():
+    calls = []
+
+    @cache.cached("fred")
+    def fetch():
+        calls.append(1)
+        return cache.Uncached("stale") if len(calls) == 1 else "fresh"
+
+    assert fetch() == "stale"
+    assert fetch() == "fresh"
+    assert fetch() == "fresh"
+    assert len(calls) == 2
@@ -0,0 +1,85 @@
+import datetime
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from market_data import fred_cache
+
+
+class FakeFred:
+    def __init__(self, observations):
+        self.observations = observations
+        self.starts = []
+
+    def get_series(self, series_id, observation_start=None):
+        self.starts.append(observation_start)
+        data = self.observations
+        if observation_start is not None:
+            data = data[data.index >= pd.Timestamp(observation_start)]
+        return data
+
+
+MONTHLY = pd.Series([300.0, 301.0, 302.0], index=pd.to_datetime(["2026-06-01", "2026-07-01", "2026-08-01"]))
+
+
+@pytest.fixture
+def fred():
+    return FakeFred(MONTHLY)
+
+
+@pytest.fixture
+def cache(tmp_path, fred):
+    return fred_cache.FredCache(fred, path=str(tmp_path / "market_data.sqlite"))
+
+
+def set_checked_at(cache, series_id, checked_at):
+    with closing(cache._connect()) as conn, conn:
+        conn.execute("UPDATE fred_series SET checked_at = ? WHERE series_id = ?",
+                     (checked_at.isoformat(timespec="seconds"), series_id))
+
+
+@pytest.mark.parametrize("last_date, frequency, expected", [
+    ("2026-10-15", "d", "2026-10-17"),
+    ("2026-10-09", "w", "2026-10-19"),
+    ("2026-08-01", "m", "2026-09-11"),
+    ("2026-04-01", "q", "2026-07-26"),
+])
+def test_next_release_is_period_end_plus_lag(last_date, frequency, expected):
+    assert fred_cache.next_release(last_date, frequency) == datetime.date.fromisoformat(expected)
+
+
+def test_unknown_series_is_due(cache):
+    assert cache.is_due("CPIAUCSL")
+
+
+def test_is_due_waits_for_the_release_then_rechecks_at_intervals(cache):
+    cache.refresh("CPIAUCSL", force=True)
+    checked = datetime.datetime(2026, 9, 1, 9, 0)
+    set_checked_at(cache, "CPIAUCSL", checked)
+    # August CPI is expected on 2026-09-11: no request before then, however long ago the last check was
+    assert not cache.is_due("CPIAUCSL", now=datetime.datetime(2026, 9, 10, 23, 0))
+    assert cache.is_due("CPIAUCSL", now=datetime.datetime(2026, 9, 11, 9, 0))
+    # Overdue but checked recently: wait out RECHECK_INTERVAL
+    checked = datetime.datetime(2026, 9, 11, 9, 0)
+    set_checked_at(cache, "CPIAUCSL", checked)
+    assert not cache.is_due("CPIAUCSL", now=checked + fred_cache.RECHECK_INTERVAL / 2)
+    assert cache.is_due("CPIAUCSL", now=checked + fred_cache.RECHECK_INTERVAL)
+
+
+def test_refresh_requests_from_the_cached_tail_and_picks_up_revisions(cache, fred):
+    assert cache.refresh("CPIAUCSL", force=True)
+    assert cache.latest_value("CPIAUCSL") == 302.0
+    revised = pd.Series([302.5, 303.0], index=pd.to_datetime(["2026-08-01", "2026-09-01"]))
+    fred.observations = pd.concat([MONTHLY.iloc[:-1], revised])
+    assert cache.refresh("CPIAUCSL", force=True)
+    assert fred.starts == [None, "2026-08-01"]
+    assert cache.history("CPIAUCSL").tolist() == [300.0, 301.0, 302.5, 303.0]
+    assert cache.latest("CPIAUCSL") == (datetime.date(2026, 9, 1), 303.0)
+
+
+def test_refresh_skips_fred_when_not_due(cache, fred):
+    cache.refresh("CPIAUCSL", force=True)
+    set_checked_at(cache, "CPIAUCSL", datetime.datetime.now())
+    assert not cache.refresh("CPIAUCSL")  # Last check just now, so at most RECHECK_INTERVAL has passed
+    assert fred.starts == [None]
@@ -0,0 +1,63 @@
+import datetime
+
+import pandas as pd
+import pytest
+
+from signals.history import SignalHistory
+from signals.rules import Rule
+
+VIX_HIGH = Rule("test.vix_gt_20", "VIX > 20", "vix", ">", 20, "Test Plan", "Act")
+START = datetime.datetime(2026, 10, 1, 9, 30)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.sqlite")
+
+
+def record_days(history, values, first_day=0):
+    for day, value in enumerate(values, start=first_day):
+        history.record({"vix": value}, [VIX_HIGH], ts=START + datetime.timedelta(days=day))
+
+
+def test_streak_and_trigger_count_within_one_instance(path):
+    history = SignalHistory(path)
+    record_days(history, [22, 15, 23, 24])
+    triggered, since, runs = history.streak("test.vix_gt_20")
+    assert (triggered, since, runs) == (True, pd.Timestamp(START + datetime.timedelta(days=2)), 2)
+    assert history.trigger_count("test.vix_gt_20", now=START + datetime.timedelta(days=3)) == 2
+
+
+def test_streak_continues_across_restarts(path):
+    record_days(SignalHistory(path), [15, 22, 23])
+    restarted = SignalHistory(path)
+    record_days(restarted, [24], first_day=3)
+    assert restarted.streak("test.vix_gt_20") == (True, pd.Timestamp(START + datetime.timedelta(days=1)), 3)
+    # Still one clear -> triggered edge: the restart doesn't count as a new episode
+    assert restarted.trigger_count("test.vix_gt_20", now=START + datetime.timedelta(days=3)) == 1
+
+
+def test_trigger_count_across_restarts_and_window(path):
+    record_days(SignalHistory(path), [22, 15])
+    record_days(SignalHistory(path), [23, 15], first_day=2)
+    record_days(SignalHistory(path), [24], first_day=4)
+    history = SignalHistory(path)
+    now = START + datetime.timedelta(days=4)
+    assert history.trigger_count("test.vix_gt_20", now=now) == 3
+    assert history.trigger_count("test.vix_gt_20", window=pd.Timedelta(days=1), now=now) == 1
+    assert history.last_triggered("test.vix_gt_20") == pd.Timestamp(now)
+
+
+def test_out_of_order_and_missing_values_are_skipped(path):
+    history = SignalHistory(path)
+    record_days(history, [22], first_day=1)
+    assert history.record({"vix": 15}, [VIX_HIGH], ts=START) == 0
+    assert history.record({"vix": float("nan")}, [VIX_HIGH], ts=START + datetime.timedelta(days=2)) == 0
+    assert len(SignalHistory(path).events("test.vix_gt_20")) == 1
+
+
+def test_unknown_rule_has_no_history(path):
+    history = SignalHistory(path)
+    assert history.streak("test.missing") is None
+    assert history.trigger_count("test.missing") == 0
+    assert history.last_triggered("test.missing") is None
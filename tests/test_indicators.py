@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals import indicators
+
+VALUES = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.02, 300)))
+WINDOW = 20
+
+
+def stream(indicator, values, attr="value"):
+    out = []
+    for value in values:
+        indicator.update(value)
+        out.append(getattr(indicator, attr))
+    return np.array(out)
+
+
+def restored(indicator):
+    data = json.loads(json.dumps(indicator.to_dict()))
+    return indicators.INDICATOR_TYPES[data["type"]].from_dict(data)
+
+
+@pytest.mark.parametrize("cls", [indicators.SMA, indicators.EMA, indicators.RollingStd])
+def test_streaming_matches_batch(cls):
+    expected = cls.batch(VALUES, WINDOW).to_numpy()
+    np.testing.assert_allclose(stream(cls(WINDOW), VALUES), expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("cls", [indicators.SMA, indicators.EMA, indicators.RollingStd])
+@pytest.mark.parametrize("split", [5, WINDOW, 150])
+def test_serialized_state_resumes_like_batch(cls, split):
+    indicator = cls(WINDOW)
+    stream(indicator, VALUES[:split])
+    resumed = stream(restored(indicator), VALUES[split:])
+    np.testing.assert_allclose(resumed, cls.batch(VALUES, WINDOW).to_numpy()[split:], rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("split", [0, 5, 150])
+def test_rolling_max_and_drawdown_match_batch(split):
+    expected = indicators.RollingMax.batch(VALUES, WINDOW)
+    rolling_max = indicators.RollingMax(WINDOW)
+    stream(rolling_max, VALUES[:split])
+    rolling_max = restored(rolling_max)
+    peaks, drawdowns = [], []
+    for value in VALUES[split:]:
+        peaks.append(rolling_max.update(value))
+        drawdowns.append(rolling_max.drawdown)
+    np.testing.assert_allclose(peaks, expected["max"].to_numpy()[split:])
+    np.testing.assert_allclose(drawdowns, expected["drawdown"].to_numpy()[split:])
+
+
+def test_sma_peek_matches_batch_without_committing():
+    sma = indicators.SMA.from_history(VALUES[:100], WINDOW)
+    peeked = sma.peek(VALUES[100])
+    assert peeked == pytest.approx(indicators.SMA.batch(VALUES[:101], WINDOW).iloc[-1])
+    assert sma.value == pytest.approx(indicators.SMA.batch(VALUES[:100], WINDOW).iloc[-1])
+    assert np.isnan(indicators.SMA.from_history(VALUES[:WINDOW - 2], WINDOW).peek(1.0))
+
+
+def test_save_and_load_state(tmp_path):
+    path = str(tmp_path / "indicators.json")
+    state = {"sma": indicators.SMA(WINDOW), "max": indicators.RollingMax(WINDOW)}
+    for indicator in state.values():
+        stream(indicator, VALUES[:50])
+    indicators.save_state(path, "2026-01-05", state)
+    last_date, loaded = indicators.load_state(path)
+    assert last_date == pd.Timestamp("2026-01-05")
+    assert loaded["sma"].value == pytest.approx(state["sma"].value)
+    assert loaded["max"].value == state["max"].value
@@ -0,0 +1,80 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import ingest
+
+LOTS_CSV = b"""Account Name,Symbol,Quantity,Current Value,Cost Basis Total,Date Acquired
+Roth IRA,VTI,10,"$2,500.00",$2000.00,01/15/2021
+Roth IRA,VTI,5,"$1,250.00",$1300.00,2023-03-02
+Taxable,bnd,20,"$1,400.00",--,"Jun 5, 2022"
+Taxable,SPAXX,300,$300.00,,
+Taxable,ZZZQ,1,(50.00),$80.00,2024-11-30
+"""
+
+
+def test_lot_level_export_aggregates_by_ticker():
+    summary = ingest.stream_holdings(io.BytesIO(LOTS_CSV))
+    allocation = summary.allocation.set_index("Asset Class")["Amount"].to_dict()
+    assert allocation == {"Stocks": 3750.0, "Bonds": 1700.0, "Unclassified": -50.0}
+    assert summary.rows == 5
+    assert summary.unclassified.to_dict() == {"ZZZQ": -50.0}
+    assert summary.skipped_rows == 0
+
+
+def test_pre_aggregated_export_uses_the_asset_class_column():
+    csv = b"Asset Class,Amount\nStocks,500000\nbonds ,\"300,000\"\nPrivate,100000\nCrypto,5000\n"
+    summary = ingest.stream_holdings(csv)
+    assert summary.allocation.set_index("Asset Class")["Amount"].to_dict() == {
+        "Stocks": 500_000.0, "Bonds": 300_000.0, "Private": 100_000.0, "Unclassified": 5_000.0,
+    }
+    assert summary.unclassified.empty  # No ticker column to name them by
+
+
+def test_read_positions_collapses_lots_per_account():
+    positions = ingest.read_positions(io.BytesIO(LOTS_CSV)).set_index(["Account", "Ticker"])
+    assert positions.loc[("Roth IRA", "VTI"), ["Quantity", "Amount", "Cost Basis"]].tolist() == [15, 3750, 3300]
+    assert positions.loc[("Taxable", "BND"), "Asset Class"] == "Bonds"
+    assert positions.loc[("Taxable", "BND"), "Cost Basis"] == 0.0  # "--" placeholder
+
+
+def test_read_lots_parses_mixed_date_formats():
+    lots = ingest.read_lots(io.BytesIO(LOTS_CSV))
+    assert lots["Acquired"].tolist()[:3] == [pd.Timestamp("2021-01-15"), pd.Timestamp("2023-03-02"),
+                                             pd.Timestamp("2022-06-05")]
+    assert pd.isna(lots["Acquired"].iloc[3])
+
+
+def test_unparseable_amounts_are_skipped_and_reported():
+    csv = LOTS_CSV + b"Taxable,VOO,2,see note,$900.00,2024-01-02\nTaxable,VOO,1,$450.00,$400.00,2024-02-01\n"
+    summary = ingest.stream_holdings(io.BytesIO(csv), chunksize=3)
+    assert summary.skipped_rows == 1
+    assert summary.skipped.index.tolist() == [7]  # CSV line, counting the header as line 1
+    assert summary.skipped.loc[7, "Current Value"] == "see note"
+    assert summary.allocation.set_index("Asset Class").loc["Stocks", "Amount"] == 3750.0 + 450.0
+    assert summary.rows == 6
+
+
+def test_readers_report_skipped_rows(capsys):
+    csv = LOTS_CSV + b"Taxable,VOO,two,$900.00,$900.00,2024-01-02\n"
+    skipped = []
+    lots = ingest.read_lots(io.BytesIO(csv), on_skipped=skipped.append)
+    assert len(lots) == 5
+    assert [rows.index.tolist() for rows in skipped] == [[7]]
+    ingest.read_positions(io.BytesIO(csv))
+    assert "CSV lines 7" in capsys.readouterr().out
+
+
+def test_parse_amounts():
+    values = pd.Series(["$1,234.50", "(12.00)", "--", "", None, "12 shares"], dtype="string")
+    np.testing.assert_array_equal(ingest.parse_amounts(values), [1234.5, -12.0, 0.0, 0.0, 0.0, np.nan])
+
+
+def test_progress_tracks_parsed_rows():
+    csv = b"Symbol,Market Value\n" + b"".join(b"VTI,%d\n" % i for i in range(1000))
+    reported = []
+    summary = ingest.stream_holdings(io.BytesIO(csv), chunksize=250, progress=reported.append)
+    assert reported == pytest.approx([0.25, 0.5, 0.75, 1.0])
+    assert summary.rows == 1000
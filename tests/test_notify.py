@@ -0,0 +1,140 @@
+import json
+import smtplib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from signals import notify
+
+
+class FakeChannel:
+    """Records delivered units; during the first `failing_attempts` attempts the connection drops once
+    `fail_after` units have been delivered in total."""
+
+    name = "fake"
+
+    def __init__(self, fail_after=None, failing_attempts=1):
+        self.delivered = []
+        self.attempts = 0
+        self.fail_after = fail_after
+        self.failing_attempts = failing_attempts
+
+    def messages(self, notifications):
+        return [(n.subject, r) for n in notifications for r in n.recipients or ("default",)]
+
+    def send(self, messages):
+        self.attempts += 1
+        failing = self.fail_after is not None and self.attempts <= self.failing_attempts
+        while messages:
+            if failing and len(self.delivered) >= self.fail_after:
+                raise ConnectionError("connection dropped")
+            self.delivered.append(messages[0])
+            messages.pop(0)
+
+
+def dispatcher(*channels, **kwargs):
+    return notify.NotificationDispatcher(channels, digest_window=kwargs.pop("digest_window", 0.2), backoff=0, **kwargs)
+
+
+def test_alerts_within_window_are_batched_into_one_digest():
+    channel = FakeChannel()
+    d = dispatcher(channel, digest_window=5)
+    d.notify("Alert", ["VIX > 20"], ["a@x"])
+    d.notify("Alert", ["VIX > 20", "Curve inverted"], ["a@x"])
+    d.notify("Other", ["CPI > 4%"], ["b@x"])
+    assert d.flush(timeout=5)
+    assert channel.attempts == 1
+    assert sorted(channel.delivered) == [("Alert", "a@x"), ("Other", "b@x")]
+
+
+def test_digest_keeps_each_line_once():
+    first = notify.Notification("A", ("x", "y"), ("r",))
+    second = notify.Notification("B", ("y", "z"), ("r",))
+    (merged,) = notify.digest([first, second])
+    assert merged.lines == ("x", "y", "z")
+    assert merged.subject == "A (+1 more)"
+
+
+def test_retry_resends_only_undelivered_messages():
+    channel = FakeChannel(fail_after=2)
+    d = dispatcher(channel)
+    d.notify("Alert", ["VIX > 20"], ["a@x", "b@x", "c@x", "d@x"])
+    assert d.flush(timeout=5)
+    assert channel.attempts == 2
+    assert channel.delivered == [("Alert", r) for r in ("a@x", "b@x", "c@x", "d@x")]
+    assert d.failures == []
+
+
+def test_exhausted_retries_record_the_unsent_messages():
+    channel = FakeChannel(fail_after=1, failing_attempts=10)
+    d = dispatcher(channel, max_retries=2)
+    d.notify("Alert", ["VIX > 20"], ["a@x", "b@x", "c@x"])
+    assert d.flush(timeout=5)
+    assert channel.attempts == 3
+    assert channel.delivered == [("Alert", "a@x")]
+    ((name, unsent, error),) = d.failures
+    assert name == "fake"
+    assert unsent == [("Alert", "b@x"), ("Alert", "c@x")]
+    assert isinstance(error, ConnectionError)
+
+
+def test_smtp_channel_reconnects_and_skips_sent_recipients(monkeypatch):
+    sent, connections = [], []
+
+    class FlakySMTP:
+        def __init__(self):
+            connections.append(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def login(self, username, password):
+            pass
+
+        def send_message(self, msg):
+            if len(connections) == 1 and sent:
+                raise smtplib.SMTPServerDisconnected("dropped")
+            sent.append(msg["To"])
+
+    channel = notify.SMTPChannel("localhost", 25, "alerts@x", ["a@x", "b@x", "c@x"], "user", "pw", use_ssl=False)
+    monkeypatch.setattr(channel, "_connect", FlakySMTP)
+    d = dispatcher(channel)
+    d.notify("Alert", ["VIX > 20"])
+    assert d.flush(timeout=5)
+    assert sent == ["a@x", "b@x", "c@x"]
+    assert len(connections) == 2
+
+
+@pytest.fixture
+def webhook_server():
+    """Local HTTP stand-in that answers 500 to the second POST it receives, 200 to the rest."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            received.append(body)
+            self.send_response(500 if len(received) == 2 else 200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/hook", received
+    server.shutdown()
+
+
+def test_webhook_retry_reposts_only_the_failed_notification(webhook_server):
+    url, received = webhook_server
+    d = dispatcher(notify.WebhookChannel(url))
+    d.notify("First", ["VIX > 20"], ["a@x"])
+    d.notify("Second", ["CPI > 4%"], ["b@x"])
+    assert d.flush(timeout=5)
+    assert [body["subject"] for body in received] == ["First", "Second", "Second"]
+    assert d.failures == []
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import rebalance
+
+TARGETS = [rebalance.TARGET_ALLOC[c] for c in ("Stocks", "Bonds", "Private")]
+BAND = rebalance.TOLERANCE - rebalance.BUFFER
+
+
+POSITION_COLUMNS = ["Account", "Ticker", "Asset Class", "Quantity", "Amount"]
+
+
+def signed(trades):
+    return np.where(trades["Action"] == "Buy", trades["Amount"], -trades["Amount"])
+
+
+@pytest.mark.parametrize("amounts", [
+    [700, 200, 100],
+    [100, 600, 300],
+    [560, 300, 140],
+    [0, 0, 1000],
+    [1000, 0, 0],
+])
+def test_bucket_trades_net_to_zero_and_land_in_band(amounts):
+    delta = rebalance.bucket_trades(amounts, TARGETS)
+    after = np.asarray(amounts, dtype=float) + delta
+    assert delta.sum() == pytest.approx(0.0, abs=1e-9)
+    assert np.all(np.abs(after / after.sum() * 100 - TARGETS) <= BAND + 1e-9)
+
+
+def test_bucket_trades_random_portfolios():
+    rng = np.random.default_rng(0)
+    for amounts in rng.uniform(0, 1e6, (200, 3)):
+        delta = rebalance.bucket_trades(amounts, TARGETS)
+        after = amounts + delta
+        assert delta.sum() == pytest.approx(0.0, abs=1e-6)
+        assert np.all(np.abs(after / after.sum() * 100 - TARGETS) <= BAND + 1e-9)
+
+
+def test_bucket_trades_leave_in_band_portfolio_alone():
+    assert np.allclose(rebalance.bucket_trades([520, 290, 190], TARGETS), 0.0)
+
+
+def test_plan_trades_sum_to_zero_without_prices(holdings_frame):
+    # Quantity 0 means no known price, so trades are exact dollar amounts
+    plan = rebalance.plan_rebalance(holdings_frame([
+        ("Taxable", "VTI", "Stocks", 0, 80_000),
+        ("Taxable", "BND", "Bonds", 0, 15_000),
+        ("Taxable", "VNQ", "Private", 0, 5_000),
+    ], POSITION_COLUMNS))
+    assert signed(plan.trades).sum() == pytest.approx(0.0, abs=1e-6)
+    assert plan.turnover == pytest.approx(plan.trades.loc[plan.trades["Action"] == "Sell", "Amount"].sum())
+    assert np.all(np.abs(plan.allocation["After %"] - plan.allocation["Target %"]) <= BAND + 1e-9)
+
+
+def test_plan_lands_within_tolerance_in_whole_shares(holdings_frame):
+    plan = rebalance.plan_rebalance(holdings_frame([
+        ("Roth IRA", "VTI", "Stocks", 250, 75_000),
+        ("Roth IRA", "BND", "Bonds", 100, 7_000),
+        ("Taxable", "VTI", "Stocks", 100, 30_000),
+        ("Taxable", "VNQ", "Private", 50, 4_500),
+        ("Taxable", "SPAXX", "Stocks", 3_000, 3_000),
+    ], POSITION_COLUMNS))
+    assert np.all(np.abs(plan.allocation["After %"] - plan.allocation["Target %"]) <= rebalance.TOLERANCE)
+    # Proceeds stay in their account, and whole-share buys round down, so no account spends more than it raised
+    net = pd.Series(signed(plan.trades)).groupby(plan.trades["Account"].to_numpy()).sum()
+    assert (net <= 1e-6).all()
+    buys = plan.trades[plan.trades["Action"] == "Buy"]
+    assert -signed(plan.trades).sum() < (buys["Amount"] / buys["Shares"]).sum()  # Under one share left per buy
+
+
+def test_unclassified_positions_are_left_alone(holdings_frame):
+    plan = rebalance.plan_rebalance(holdings_frame([
+        ("Taxable", "VTI", "Stocks", 0, 80_000),
+        ("Taxable", "BND", "Bonds", 0, 15_000),
+        ("Taxable", "VNQ", "Private", 0, 5_000),
+        ("Taxable", "ZZZQ", "Unclassified", 0, 50_000),
+    ], POSITION_COLUMNS))
+    assert "ZZZQ" not in set(plan.trades["Ticker"])
+    assert "Unclassified" not in set(plan.allocation["Asset Class"])
+
+
+def test_bucket_without_a_holding_buys_the_default_fund_by_dollar_amount(holdings_frame):
+    plan = rebalance.plan_rebalance(holdings_frame([
+        ("Taxable", "VTI", "Stocks", 300, 90_000),
+        ("Taxable", "BND", "Bonds", 100, 10_000),
+    ], POSITION_COLUMNS))
+    trades = plan.trades.set_index("Ticker")
+    default = rebalance.DEFAULT_FUNDS["Private"]
+    assert trades.loc[default, "Action"] == "Buy"
+    assert trades.loc[default, "Order"] == rebalance.ORDER_DOLLARS
+    assert np.isnan(trades.loc[default, "Shares"])
+    priced = trades.drop(index=default)
+    assert (priced["Order"] == rebalance.ORDER_SHARES).all()
+    assert (priced["Shares"] == np.floor(priced["Shares"])).all()
+    assert signed(plan.trades).sum() == pytest.approx(0.0, abs=(priced["Amount"] / priced["Shares"]).sum())
@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import providers, store
+
+TODAY = datetime.date.today()
+
+
+class FakeProvider(providers.DataProvider):
+    """Serves synthetic daily bars and records each download's arguments."""
+
+    def __init__(self, missing=()):
+        super().__init__()
+        self.requests = []
+        self.missing = set(missing)
+        self.error = None
+
+    def download(self, tickers, start=None, period=None, **kwargs):
+        self._count("download")
+        self.requests.append((list(tickers), start, period))
+        if self.error:
+            raise self.error
+        first = pd.Timestamp(start or store.period_start(period) or "2000-01-01")
+        days = pd.bdate_range(first, TODAY)
+        frames = {
+            ticker: pd.DataFrame({field: np.arange(len(days), dtype=float) + 1 for field in store.FIELDS}, index=days)
+            for ticker in tickers if ticker not in self.missing
+        }
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1).swaplevel(axis=1)
+
+    def get_series(self, series_id, observation_start=None):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider()
+    monkeypatch.setattr(providers, "_provider", fake)
+    return fake
+
+
+@pytest.fixture
+def price_store(tmp_path):
+    return store.PriceStore(str(tmp_path / "market_data.sqlite"))
+
+
+def test_new_tickers_backfill_then_sync_only_the_delta(provider, price_store):
+    assert price_store.sync(["SPY", "QQQ"], period="6mo") == []
+    assert provider.requests == [(["SPY", "QQQ"], None, "6mo")]
+    last = price_store.last_bar("SPY")
+    assert last == pd.bdate_range(end=TODAY, periods=1)[0].date()
+
+    assert price_store.sync(["SPY", "QQQ"], period="6mo") == []
+    # Known tickers restart at the last stored bar so a partial intraday bar is overwritten
+    assert provider.requests[-1] == (["SPY", "QQQ"], last, None)
+    assert list(price_store.read_close(["SPY", "QQQ"]).columns) == ["SPY", "QQQ"]
+
+
+def test_longer_period_than_stored_backfills_again(provider, price_store):
+    price_store.sync(["SPY"], period="6mo")
+    price_store.sync(["SPY"], period="1y")
+    assert provider.requests[-1] == (["SPY"], None, "1y")
+    assert price_store.read_close(["SPY"]).index[0].date() >= store.period_start("1y")
+    assert price_store.coverage(["SPY"])["SPY"][1] == store.period_start("1y")
+
+
+def test_failed_download_marks_tickers_stale_and_keeps_stored_bars(provider, price_store):
+    price_store.sync(["SPY"], period="5d")
+    stored = price_store.read_bars("SPY")
+    provider.error = OSError("Yahoo unavailable")
+    assert price_store.sync(["SPY"], period="5d") == ["SPY"]
+    assert price_store.stale == {"SPY": "Yahoo unavailable"}
+    pd.testing.assert_frame_equal(price_store.read_bars("SPY"), stored)
+
+    provider.error = None
+    assert price_store.sync(["SPY"], period="5d") == []
+    assert price_store.stale == {}
+
+
+def test_ticker_with_no_bars_is_reported(provider, price_store):
+    provider.missing = {"ZZZQ"}
+    assert price_store.sync(["SPY", "ZZZQ"], period="5d") == ["ZZZQ"]
+    assert price_store.stale == {"ZZZQ": "no bars returned"}
+    assert price_store.last_bar("ZZZQ") is None
+    assert price_store.last_bar("SPY") is not None
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from signals import sweep
+
+SPEC = sweep.SweepSpec(
+    conditions=(
+        ("vix", ">", np.arange(15, 31, 5.0)),
+        ("sp_vs_ma", "<", np.array([0.95, 1.0])),
+        ("curve_spread", "<", np.array([0.0, 0.5])),
+    ),
+    windows=(20, 50),
+    current={"vix": 20, "sp_vs_ma": 1.0, "curve_spread": 0.0, "window": 50},
+)
+
+
+@pytest.fixture(scope="module")
+def history():
+    rng = np.random.default_rng(7)
+    days = pd.bdate_range("2010-01-01", periods=1500)
+    return pd.DataFrame({
+        "sp_price": 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, len(days)))),
+        "vix": rng.uniform(10, 35, len(days)),
+        "t10": 3 + np.cumsum(rng.normal(0, 0.03, len(days))),
+        "t3m": 2.5 + np.cumsum(rng.normal(0, 0.03, len(days))),
+    }, index=days)
+
+
+@pytest.fixture(scope="module")
+def serial(history):
+    return sweep.run_sweep(history, SPEC, workers=1)
+
+
+def test_process_pool_matches_serial(history, serial):
+    pd.testing.assert_frame_equal(sweep.run_sweep(history, SPEC, workers=2), serial)
+    assert len(serial) == sweep.grid_size(SPEC)
+
+
+def test_shard_splitting_does_not_change_results(history, serial, monkeypatch):
+    monkeypatch.setattr(sweep, "CELL_BUDGET", 1500 * 4)  # One vix level per shard
+    assert len(list(sweep.shards(SPEC, 1500))) == len(SPEC.windows) * len(SPEC.conditions[0][2])
+    pd.testing.assert_frame_equal(sweep.run_sweep(history, SPEC, workers=1), serial)
+
+
+def test_grid_point_matches_a_direct_count(history, serial):
+    row = serial[(serial["vix"] == 20) & (serial["sp_vs_ma"] == 1.0)
+                 & (serial["curve_spread"] == 0.5) & (serial["window"] == 50)].iloc[0]
+    ma = history["sp_price"].rolling(50).mean()
+    on = (history["vix"] > 20) & (history["sp_price"] / ma < 1.0) & (history["t10"] - history["t3m"] < 0.5)
+    assert row["pct_days"] == pytest.approx(on.sum() / ma.notna().sum() * 100)
+    assert row["episodes"] == (on & ~on.shift(fill_value=False)).sum()
+
+
+def test_drawdown_lead_counts_days_to_the_next_drawdown_start():
+    sp = np.array([100, 105, 100, 94, 90, 100, 110, 98], dtype=float)
+    lead = sweep.drawdown_lead(sp, threshold=0.10, horizon=2)
+    # Drawdowns start on day 3 (94 / 105) and day 7 (98 / 110); day 4 is still inside the first one.
+    # Days 0 and 4 are 3 days out, beyond the horizon
+    np.testing.assert_array_equal(lead, [np.nan, 2, 1, 0, np.nan, 2, 1, 0])
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from portfolio import tax_lots
+
+AS_OF = pd.Timestamp("2026-10-16")
+
+
+LOT_COLUMNS = ["Account", "Ticker", "Quantity", "Cost Basis", "Acquired"]
+
+
+def days_ago(days):
+    return AS_OF - pd.Timedelta(days=days)
+
+
+def loss_lot_and_buy(days, account="Taxable", buy_quantity=10):
+    """A 10-share taxable loss lot held 200 days, plus a purchase of the same ticker `days` before AS_OF."""
+    return [
+        ("Taxable", "VTI", 10, 2000.0, days_ago(200)),
+        (account, "VTI", buy_quantity, 1000.0, days_ago(days)),
+    ]
+
+
+@pytest.mark.parametrize("days, washed", [(0, True), (1, True), (30, True), (31, False), (-1, False)])
+def test_wash_sale_window_boundaries(holdings_frame, days, washed):
+    # Purchases on the scan date back to exactly 30 days before it count; the 31st day and later buys don't
+    scan = tax_lots.scan(holdings_frame(loss_lot_and_buy(days), LOT_COLUMNS), {"VTI": 100.0}, as_of=AS_OF)
+    lot = scan.lots.iloc[0]
+    assert lot["Wash Sale Risk"] == washed
+    assert lot["Recent Buys (30d)"] == (10 if washed else 0)
+    assert lot["Tax Benefit"] == pytest.approx(0.0 if washed else 1000 * tax_lots.SHORT_TERM_RATE)
+
+
+def test_recent_lot_does_not_wash_itself(holdings_frame):
+    lots = holdings_frame([("Taxable", "VTI", 10, 2000.0, days_ago(30))], LOT_COLUMNS)
+    lot = tax_lots.scan(lots, {"VTI": 100.0}, as_of=AS_OF).lots.iloc[0]
+    assert not lot["Wash Sale Risk"]
+    assert lot["Tax Benefit"] == pytest.approx(1000 * tax_lots.SHORT_TERM_RATE)
+
+
+def test_ira_purchase_washes_taxable_loss(holdings_frame):
+    lots = holdings_frame(loss_lot_and_buy(5, account="Roth IRA"), LOT_COLUMNS)
+    scan = tax_lots.scan(lots, {"VTI": 100.0}, as_of=AS_OF)
+    assert scan.lots.iloc[0]["Wash Sale Risk"]
+    assert list(scan.candidates.index) == [0]  # The IRA lot itself is never a harvest candidate
+
+
+def test_partial_replacement_washes_part_of_the_loss(holdings_frame):
+    lots = holdings_frame(loss_lot_and_buy(10, buy_quantity=4), LOT_COLUMNS)
+    scan = tax_lots.scan(lots, {"VTI": 100.0}, as_of=AS_OF)
+    assert scan.lots.iloc[0]["Tax Benefit"] == pytest.approx(1000 * 0.6 * tax_lots.SHORT_TERM_RATE)
+
+
+def test_long_term_boundary_is_one_year(holdings_frame):
+    lots = holdings_frame([
+        ("Taxable", "VTI", 10, 2000.0, days_ago(365)),
+        ("Taxable", "VTI", 10, 2000.0, days_ago(367)),
+    ], LOT_COLUMNS)
+    scan = tax_lots.scan(lots, {"VTI": 100.0}, as_of=AS_OF)
+    assert list(scan.lots["Term"]) == ["Short", "Long"]
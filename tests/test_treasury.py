@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import treasury
+
+DAYS = pd.bdate_range("2026-01-05", periods=6)
+
+
+def sloped_curve(level=4.0, days=DAYS):
+    """Normal curve: `level` at 1M, rising 0.1pp per tenor step."""
+    values = level + 0.1 * np.arange(len(treasury.TENORS))
+    return pd.DataFrame(np.tile(values, (len(days), 1)), index=days, columns=list(treasury.TENORS))
+
+
+def test_pair_spreads_are_long_minus_short_for_every_pair():
+    curve = pd.DataFrame({"3M": [5.0, 4.0], "2Y": [4.5, 4.2], "10Y": [4.0, 4.6]}, index=DAYS[:2])
+    spreads = treasury.pair_spreads(curve)
+    assert list(spreads.columns) == ["3M/2Y", "3M/10Y", "2Y/10Y"]
+    assert spreads.loc[DAYS[0]].tolist() == pytest.approx([-0.5, -1.0, -0.5])
+    assert spreads.loc[DAYS[1]].tolist() == pytest.approx([0.2, 0.6, 0.4])
+
+
+def test_pair_spreads_propagate_missing_yields():
+    curve = pd.DataFrame({"3M": [5.0], "2Y": [np.nan], "10Y": [4.0]}, index=DAYS[:1])
+    spreads = treasury.pair_spreads(curve).iloc[0]
+    assert np.isnan(spreads["3M/2Y"]) and np.isnan(spreads["2Y/10Y"])
+    assert spreads["3M/10Y"] == pytest.approx(-1.0)
+
+
+def test_run_lengths_count_the_current_run_per_column():
+    mask = np.array([
+        [True, False],
+        [True, True],
+        [False, True],
+        [True, True],
+        [True, False],
+    ])
+    assert treasury.run_lengths(mask).tolist() == [[1, 0], [2, 1], [0, 2], [1, 3], [2, 0]]
+
+
+def test_days_inverted_and_depth_on_a_synthetic_inversion():
+    curve = sloped_curve()
+    # 3M rises above 10Y on the third day and stays there
+    curve.loc[DAYS[2]:, "3M"] = curve["10Y"] + 0.5
+    structure = treasury.term_structure(curve)
+    assert structure.days_inverted["3m10y"].tolist() == [0, 0, 1, 2, 3, 4]
+    assert structure.days_inverted["2s10s"].tolist() == [0] * len(DAYS)
+    # Deepest pair is 3M over 6M, the next tenor out: 10Y + 0.5 - 6M = 0.6 + 0.5
+    assert structure.inversion_depth.tolist() == pytest.approx([0, 0, 1.1, 1.1, 1.1, 1.1])
+    assert structure.inverted_share.iloc[0] == 0
+    # 3M now sits above all 9 longer tenors, out of 55 pairs
+    assert structure.inverted_share.iloc[-1] == pytest.approx(9 / 55 * 100)
+
+
+def test_curve_metrics_reads_the_latest_row():
+    curve = sloped_curve()
+    curve.loc[DAYS[-2]:, "3M"] = curve["10Y"] + 0.25
+    values = treasury.curve_metrics(treasury.term_structure(curve))
+    assert values["spread_3m10y"] == pytest.approx(-0.25)
+    assert values["days_inverted_3m10y"] == 2
+    assert values["inversion_depth"] == pytest.approx(0.85)
+    assert np.isnan(values["inversion_depth_chg_1mo"])  # Fewer than DEPTH_CHANGE_DAYS observations
+
+
+def test_curve_metrics_empty_curve():
+    assert treasury.curve_metrics(treasury.term_structure(sloped_curve().iloc[:0])) == {}
@@ -1 +1,287 @@
-# Weekly signal report script placeholder
\ No newline at end of file
+import os
+import json
+import html
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from dotenv import load_dotenv
+
+import strategies
+from market_data import metrics, prices, providers, snapshot, treasury
+from market_data.store import ROOT_DIR
+from portfolio import ingest, rebalance
+from signals import backtest, history, rules
+from signals.notify import NotificationDispatcher
+
+# ----------- Settings -----------
+load_dotenv()
+REPORTS_DIR = os.path.join(ROOT_DIR, "reports")
+LOOKBACK = pd.Timedelta(days=7)
+MA_HISTORY = pd.Timedelta(days=400)  # Enough stored bars for a 200-day MA as of a week ago
+REPORT_METRICS = {
+    "vix": ("VIX", "{:.2f}"),
+    "sp_vs_ma": ("S&P 500 / 200-Day MA", "{:.3f}"),
+    "t10": ("10Y Treasury (%)", "{:.2f}"),
+    "t3m": ("3M Treasury (%)", "{:.2f}"),
+    "curve_spread": ("10Y – 3M Spread (pp)", "{:.2f}"),
+    "cpi": ("CPI YoY (%)", "{:.2f}"),
+    "oas": ("HY OAS (bps)", "{:.0f}"),
+    "gdp": ("GDP Growth, annualized (%)", "{:.2f}"),
+    "lei": ("LEI", "{:.2f}"),
+    "dxy_change_3mo": ("DXY 3-Mo Change (%)", "{:.2f}"),
+    "eem_vs_spy_3mo": ("EEM vs SPY 3-Mo (pp)", "{:.2f}"),
+    "dbc_change_3mo": ("DBC 3-Mo Change (%)", "{:.2f}"),
+    "spread_2s10s": ("10Y – 2Y Spread (pp)", "{:.2f}"),
+    "inversion_depth": ("Curve Inversion Depth (pp)", "{:.2f}"),
+}
+REPORT_SUBJECT = "📈 Weekly Market Signal Report"
+REPORT_ARTIFACT = "weekly-signal-report"  # Upload name in .github/workflows/weekly_signal_report.yml
+
+
+# ----------- Week-Ago Metrics (local history only, nothing refetched) -----------
+def local_metrics_as_of(as_of):
+    """Rebuild the metric set as it stood on `as_of` from the local price store and FRED cache.
+
+    FRED observations are re-dated to their publication date first, so only prints that had
+    been released by `as_of` count. Metrics without local history are left out (unknown).
+    """
+    as_of = pd.Timestamp(as_of)
+    panel = prices.get_store().read_close(list(metrics.PANEL_TICKERS), start=(as_of - MA_HISTORY).date())
+    panel = panel[panel.index <= as_of]
+    frame = prices.signal_frame(panel).dropna(subset=["sp_price"])
+    values = {} if frame.empty else frame.iloc[-1].to_dict()
+    values.update(prices.context_changes(panel))
+    fred_cache = metrics.get_fred_cache()
+    derivations = {"cpi": metrics.cpi_yoy, "oas": metrics.oas_bps, "gdp": metrics.gdp_growth, "lei": metrics.last_value}
+    for name, derive in derivations.items():
+        series_id = metrics.FRED_SERIES[name]
+        observations = backtest.released(fred_cache.history(series_id), series_id)
+        values[name] = derive(observations[observations.index <= as_of])
+    curve = treasury.curve_matrix(fred_cache)
+    values.update(treasury.curve_metrics(treasury.term_structure(curve[curve.index <= as_of])))
+    return {name: float(value) for name, value in values.items() if value is not None and not pd.isna(value)}
+
+
+def metric_rows(current, previous, simulated):
+    now = rules.metric_frame(current).iloc[0]
+    before = rules.metric_frame(previous).iloc[0]
+    rows = []
+    for name, (label, fmt) in REPORT_METRICS.items():
+        value, prior = now.get(name, float("nan")), before.get(name, float("nan"))
+        rows.append({
+            "metric": name,
+            "label": label,
+            "value": None if pd.isna(value) else float(value),
+            "week_ago": None if pd.isna(prior) else float(prior),
+            "delta": None if pd.isna(value) or pd.isna(prior) else float(value - prior),
+            "simulated": name in simulated,
+            "format": fmt,
+        })
+    return rows
+
+
+# ----------- Plan Sections -----------
+def rule_rows(plan_rules, values, previous, signal_history):
+    """Rule table rows; with no `signal_history` (it doesn't span the week) the history columns are unknown."""
+    now = rules.metric_frame(values).iloc[0]
+    before_values = rules.metric_frame(previous).iloc[0]
+    was = set(rules.triggered(previous, plan_rules))
+    hits = set(rules.triggered(values, plan_rules))
+    rows = []
+    for rule in plan_rules:
+        value = now.get(rule.metric, float("nan"))
+        triggered, before = rule.rule_id in hits, rule.rule_id in was
+        known_before = not pd.isna(before_values.get(rule.metric, float("nan")))
+        last = None if signal_history is None else signal_history.last_triggered(rule.rule_id)
+        rows.append({
+            "rule_id": rule.rule_id,
+            "signal": rule.describe(value) if not pd.isna(value) else rule.label.split(" (")[0],
+            "value": None if pd.isna(value) else float(value),
+            "triggered": triggered,
+            "change": ("n/a" if not known_before else "new" if triggered and not before
+                       else "cleared" if before and not triggered else ""),
+            "action": rule.action,
+            "last_triggered": None if last is None else last.isoformat(),
+            "triggers_7d": None if signal_history is None else signal_history.trigger_count(rule.rule_id, LOOKBACK),
+        })
+    return rows
+
+
+def build_section(label, latest, previous, signal_history, holdings=None):
+    """Evaluate one plan; returns its JSON section (rendered to HTML separately)."""
+    values = dict(latest.metrics)
+    plan_rules = rules.plan_rules(label)
+    section = {"label": label, "rules": [], "notes": []}
+    if plan_rules:
+        section["rules"] = rule_rows(plan_rules, values, previous, signal_history)
+        simulated = sorted({r.metric for r in plan_rules} & set(latest.simulated))
+        if simulated:
+            section["notes"].append(f"Simulated inputs: {', '.join(simulated)}")
+    elif label == "📊 Market Dashboard":
+        section["rules"] = rule_rows(rules.RULES, values, previous, signal_history)
+    elif label == "📑 Portfolio Enhancement Actions per Strategy":
+        section["notes"] = [
+            f"{rule.plan}: {rule.action} ({rule.label.split(' (')[0]})"
+            for rule in rules.RULES if rule.rule_id in set(latest.triggered)
+        ] or ["No strategy actions currently triggered."]
+    elif label == "📐 50/30/20 Plan":
+        section["notes"] = allocation_notes(holdings)
+    return section
+
+
+def allocation_notes(holdings):
+    if not holdings:
+        return ["No holdings file given (--holdings); allocation check skipped."]
+    summary = ingest.stream_holdings(holdings)
+    allocation = summary.allocation.set_index("Asset Class")["Amount"]
+    total = allocation.sum()
+    notes = []
+    for asset_class, target in rebalance.TARGET_ALLOC.items():
+        pct = allocation.get(asset_class, 0.0) / total * 100 if total else 0.0
+        status = "OK" if abs(pct - target) <= rebalance.TOLERANCE else "Off Target"
+        notes.append(f"{asset_class}: {pct:.1f}% vs {target}% target ({status})")
+    if summary.skipped_rows:
+        lines = ", ".join(str(line) for line in summary.skipped.index)
+        notes.append(f"Skipped {summary.skipped_rows:,} holdings rows with unparseable amounts (CSV lines {lines})")
+    return notes
+
+
+# ----------- Output -----------
+def format_value(value, fmt):
+    return "n/a" if value is None else fmt.format(value)
+
+
+def section_html(section):
+    parts = [f"<h2>{html.escape(section['label'])}</h2>"]
+    if section["rules"]:
+        parts.append("<table><tr><th>Status</th><th>Signal</th><th>Change</th><th>Last Triggered</th>"
+                     "<th>Triggers (7d)</th><th>Suggested Action</th></tr>")
+        for row in section["rules"]:
+            status = "🟥 ALERT" if row["triggered"] else "✅ OK"
+            unknown = row["triggers_7d"] is None
+            parts.append(
+                f"<tr class='{'alert' if row['triggered'] else ''}'><td>{status}</td><td>{html.escape(row['signal'])}</td>"
+                f"<td>{row['change']}</td><td>{'n/a' if unknown else (row['last_triggered'] or '–')[:10]}</td>"
+                f"<td>{'n/a' if unknown else row['triggers_7d']}</td>"
+                f"<td>{html.escape(row['action'])}</td></tr>"
+            )
+        parts.append("</table>")
+    if section["notes"]:
+        parts.append("<ul>" + "".join(f"<li>{html.escape(note)}</li>" for note in section["notes"]) + "</ul>")
+    return "\n".join(parts)
+
+
+def history_note(report):
+    since = report["history_since"]
+    if since is not None and since <= report["week_ago"]:
+        return ""
+    return (f"<p><em>Signal history starts {since or 'today'}; last-triggered and 7-day trigger counts "
+            "are shown as n/a until it spans a full week.</em></p>")
+
+
+def report_html(report, sections_html):
+    metric_table = "".join(
+        f"<tr><td>{html.escape(row['label'])}{' (simulated)' if row['simulated'] else ''}</td>"
+        f"<td>{format_value(row['value'], row['format'])}</td><td>{format_value(row['week_ago'], row['format'])}</td>"
+        f"<td>{format_value(row['delta'], '{:+.2f}')}</td></tr>"
+        for row in report["metrics"]
+    )
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{REPORT_SUBJECT} – {report['as_of']}</title>
+<style>
+body {{ font-family: -apple-system, Segoe UI, sans-serif; margin: 2em; color: #222; }}
+table {{ border-collapse: collapse; margin-bottom: 1em; }}
+th, td {{ border: 1px solid #ddd; padding: 4px 10px; text-align: left; }}
+tr.alert {{ background: #fdecea; }}
+</style></head><body>
+<h1>{REPORT_SUBJECT}</h1>
+<p>Week ending {report['as_of']} (compared with {report['week_ago']}). Generated {report['generated_at']}.</p>
+{history_note(report)}
+<h2>Key Metrics</h2>
+<table><tr><th>Metric</th><th>Now</th><th>Week Ago</th><th>Δ</th></tr>{metric_table}</table>
+{sections_html}
+</body></html>
+"""
+
+
+def build_report(holdings=None, max_workers=8):
+    """One data pass (the snapshot), then every plan section evaluated in parallel."""
+    latest = snapshot.build_snapshot()
+    snapshot.record_history(latest)
+    as_of = pd.Timestamp(latest.as_of.get("market") or latest.built_at).normalize()
+    previous = local_metrics_as_of(as_of - LOOKBACK)
+    # Placeholders are constants, not observations; the week-ago value is the same constant
+    previous.update({name: metrics.SIMULATED_METRICS[name] for name in latest.simulated})
+    signal_history = history.get_history()
+    history_since = signal_history.first_recorded()
+    if history_since is None or history_since.normalize() > as_of - LOOKBACK:
+        signal_history = None  # Too short to say what triggered this week (e.g. a fresh CI cache)
+
+    labels = list(strategies.PLANS)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sections = list(pool.map(lambda label: build_section(label, latest, previous, signal_history, holdings), labels))
+        sections_html = list(pool.map(section_html, sections))
+
+    report = {
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "as_of": as_of.date().isoformat(),
+        "week_ago": (as_of - LOOKBACK).date().isoformat(),
+        "triggered": list(latest.triggered),
+        "history_since": history_since and history_since.date().isoformat(),
+        "metrics": metric_rows(dict(latest.metrics), previous, latest.simulated),
+        "plans": sections,
+        "upstream_calls": dict(providers.get_provider().calls),
+    }
+    return report, report_html(report, "\n".join(sections_html))
+
+
+def write_report(report, page, out_dir=REPORTS_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    stem = os.path.join(out_dir, f"weekly-{report['as_of']}")
+    with open(f"{stem}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    with open(f"{stem}.html", "w", encoding="utf-8") as f:
+        f.write(page)
+    return f"{stem}.html", f"{stem}.json"
+
+
+def report_link(html_path):
+    """Where email readers can open the HTML: the workflow run's artifacts on CI, else the local file."""
+    run_id = os.getenv("GITHUB_RUN_ID")
+    if not run_id:
+        return html_path
+    run_url = f"{os.getenv('GITHUB_SERVER_URL', 'https://github.com')}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{run_id}"
+    return f"{run_url} (artifact {REPORT_ARTIFACT})"
+
+
+def email_summary(report, html_path):
+    lines = [f"Week ending {report['as_of']}: {len(report['triggered'])} signals active."]
+    for section in report["plans"]:
+        for row in section["rules"]:
+            if row["change"] in ("new", "cleared") and section["label"] != "📊 Market Dashboard":
+                lines.append(f"{section['label']}: {row['signal']} {row['change']} → {row['action']}")
+    lines.append(f"Full report: {report_link(html_path)}")
+    dispatcher = NotificationDispatcher.from_env(digest_window=0)
+    dispatcher.notify(REPORT_SUBJECT, lines)
+    dispatcher.flush(timeout=120)
+
+
+# ----------- Main Entry Point -----------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Weekly market signal report (HTML + JSON)")
+    parser.add_argument("--out-dir", default=REPORTS_DIR)
+    parser.add_argument("--holdings", help="Holdings CSV for the 50/30/20 allocation check")
+    parser.add_argument("--email", action="store_true", help="Send a summary through the configured notification channels")
+    args = parser.parse_args()
+
+    started = datetime.datetime.now()
+    metrics.configure_fred()
+    report, page = build_report(args.holdings)
+    html_path, json_path = write_report(report, page, args.out_dir)
+    elapsed = (datetime.datetime.now() - started).total_seconds()
+    calls = ", ".join(f"{k}={v}" for k, v in report["upstream_calls"].items()) or "none"
+    print(f"Report written to {html_path} and {json_path} in {elapsed:.1f}s (upstream calls: {calls})")
+    if args.email:
+        email_summary(report, html_path)